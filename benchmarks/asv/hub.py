@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+
+import optunahub
+from optunahub.testing import LocalRegistry
+from optunahub.testing import synthetic_package_files
+
+
+def _unload(package: str) -> None:
+    module_name = f"optunahub_registry.package.{package.replace('/', '.')}"
+    for name in [n for n in sys.modules if n == module_name or n.startswith(module_name + ".")]:
+        del sys.modules[name]
+
+
+class LoadModuleSuite:
+    """Latency of loading a synthetic package from a local Git registry."""
+
+    params = ([1, 20], [0, 100_000])
+    param_names = ["n_modules", "module_size"]
+
+    def setup(self, n_modules: int, module_size: int) -> None:
+        self.tmpdir = tempfile.mkdtemp()
+        self.environ = os.environ.copy()
+        os.environ["OPTUNAHUB_CACHE_HOME"] = os.path.join(self.tmpdir, "cache")
+        os.environ["OPTUNAHUB_NO_ANALYTICS"] = "1"
+
+        self.package = "samplers/bench"
+        self.registry = LocalRegistry(os.path.join(self.tmpdir, "registry"))
+        self.registry.add_package(self.package, synthetic_package_files(n_modules, module_size))
+        self.registry.commit()
+        # Populate the cache and compile the bytecode in advance.
+        self.registry.load_module(self.package)
+        self.cache_dir = os.path.join(
+            self.tmpdir, "cache", "localhost", "optuna", "optunahub-registry", "main", "package"
+        )
+
+    def teardown(self, n_modules: int, module_size: int) -> None:
+        _unload(self.package)
+        os.environ.clear()
+        os.environ.update(self.environ)
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def time_load_module_cold(self, n_modules: int, module_size: int) -> None:
+        _unload(self.package)
+        self.registry.load_module(self.package, force_reload=True)
+
+    def time_load_module_warm(self, n_modules: int, module_size: int) -> None:
+        _unload(self.package)
+        self.registry.load_module(self.package)
+
+    def time_load_local_module_without_bytecode(self, n_modules: int, module_size: int) -> None:
+        _unload(self.package)
+        shutil.rmtree(
+            os.path.join(self.cache_dir, self.package, "__pycache__"), ignore_errors=True
+        )
+        optunahub.load_local_module(self.package, registry_root=self.cache_dir)
+
+
+class WorkerInitializerSuite:
+    """Startup time of spawned workers that unpickle a registry sampler."""
+
+    params = [1, 4]
+    param_names = ["n_workers"]
+    number = 1
+
+    def setup(self, n_workers: int) -> None:
+        self.tmpdir = tempfile.mkdtemp()
+        self.environ = os.environ.copy()
+        os.environ["OPTUNAHUB_CACHE_HOME"] = os.path.join(self.tmpdir, "cache")
+        os.environ["OPTUNAHUB_NO_ANALYTICS"] = "1"
+
+        registry = LocalRegistry(os.path.join(self.tmpdir, "registry"))
+        registry.add_package("samplers/bench", synthetic_package_files(n_modules=20))
+        registry.commit()
+        self.module = registry.load_module("samplers/bench")
+
+    def teardown(self, n_workers: int) -> None:
+        _unload("samplers/bench")
+        os.environ.clear()
+        os.environ.update(self.environ)
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def time_spawn_workers(self, n_workers: int) -> None:
+        with ProcessPoolExecutor(
+            n_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=optunahub.worker_initializer([self.module]),
+        ) as executor:
+            list(executor.map(repr, [self.module.Sampler0() for _ in range(n_workers)]))
+
+
+def timeraw_import_optunahub() -> str:
+    return "import optunahub"
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+from typing import Any
+
+import optuna
+from optuna.distributions import BaseDistribution
+from optuna.trial import FrozenTrial
+
+import optunahub
+
+
+# The number of trials measured on top of the pre-filled history.
+_N_MEASURED_TRIALS = 50
+
+
+class _UniformSampler(optunahub.samplers.SimpleBaseSampler):
+    def sample_relative(
+        self,
+        study: optuna.Study,
+        trial: FrozenTrial,
+        search_space: dict[str, BaseDistribution],
+    ) -> dict[str, Any]:
+        rng = self.get_trial_rng(trial)
+        params = {}
+        for name, dist in search_space.items():
+            assert isinstance(dist, optuna.distributions.FloatDistribution)
+            params[name] = rng.uniform(dist.low, dist.high)
+        return params
+
+
+def _prefilled_study(
+    sampler: optuna.samplers.BaseSampler, problem: optunahub.benchmarks.Sphere, n_trials: int
+) -> optuna.Study:
+    study = optuna.create_study(sampler=sampler, directions=problem.directions)
+    params = {name: 0.0 for name in problem.search_space}
+    study.add_trials(
+        [
+            optuna.trial.create_trial(params=params, distributions=problem.search_space, value=0.0)
+            for _ in range(n_trials)
+        ]
+    )
+    return study
+
+
+class SimpleBaseSamplerSuite:
+    """Per-trial overhead of ``SimpleBaseSampler`` on top of a long history."""
+
+    params = ([1000, 10000], [2, 100])
+    param_names = ["n_trials", "n_params"]
+    number = 1
+    timeout = 600
+
+    def setup(self, n_trials: int, n_params: int) -> None:
+        optuna.logging.set_verbosity(optuna.logging.WARNING)
+        self.problem = optunahub.benchmarks.Sphere(n_params)
+        self.sampler = _UniformSampler()
+        self.study = _prefilled_study(self.sampler, self.problem, n_trials)
+
+    def time_optimize(self, n_trials: int, n_params: int) -> None:
+        self.study.optimize(self.problem, n_trials=_N_MEASURED_TRIALS)
+
+    def time_infer_relative_search_space(self, n_trials: int, n_params: int) -> None:
+        trial = self.study.trials[-1]
+        for _ in range(_N_MEASURED_TRIALS):
+            self.sampler.infer_relative_search_space(self.study, trial)
+
+    def time_get_trial_history(self, n_trials: int, n_params: int) -> None:
+        for _ in range(_N_MEASURED_TRIALS):
+            self.sampler.get_trial_history(self.study).params(self.problem.search_space)
+
+
+class BaseProblemSuite:
+    """Overhead of ``BaseProblem.__call__`` in high-dimensional search spaces."""
+
+    params = [10, 100, 1000]
+    param_names = ["n_params"]
+    number = 1
+    timeout = 600
+
+    def setup(self, n_params: int) -> None:
+        optuna.logging.set_verbosity(optuna.logging.WARNING)
+        self.problem = optunahub.benchmarks.Sphere(n_params)
+        self.study = optuna.create_study(
+            sampler=optuna.samplers.RandomSampler(seed=0), directions=self.problem.directions
+        )
+
+    def time_call(self, n_params: int) -> None:
+        self.study.optimize(self.problem, n_trials=_N_MEASURED_TRIALS)
@@ -1,8 +1,20 @@
 from optunahub import benchmarks
 from optunahub import samplers
+from optunahub.hub import create_lockfile
+from optunahub.hub import install_lockfile
 from optunahub.hub import load_local_module
 from optunahub.hub import load_module
+from optunahub.hub import worker_initializer
 from optunahub.version import __version__
 
 
-__all__ = ["__version__", "benchmarks", "load_local_module", "load_module", "samplers"]
+__all__ = [
+    "__version__",
+    "benchmarks",
+    "create_lockfile",
+    "install_lockfile",
+    "load_local_module",
+    "load_module",
+    "samplers",
+    "worker_initializer",
+]
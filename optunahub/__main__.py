@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import argparse
+from collections.abc import Sequence
+
+import optunahub
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m optunahub", description="Manage the OptunaHub package cache."
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    lock_parser = subparsers.add_parser(
+        "lock", help="Pin packages to commits and content hashes in a lockfile."
+    )
+    lock_parser.add_argument(
+        "packages",
+        nargs="+",
+        help="The packages to pin, e.g., samplers/auto_sampler or samplers/auto_sampler@<ref>.",
+    )
+    lock_parser.add_argument("-o", "--output", default="optunahub-lock.json")
+    lock_parser.add_argument("--repo-owner", default="optuna")
+    lock_parser.add_argument("--repo-name", default="optunahub-registry")
+    lock_parser.add_argument("--base-url", default=None)
+    lock_parser.add_argument("-j", "--jobs", type=int, default=None)
+
+    install_parser = subparsers.add_parser(
+        "install", help="Install the packages pinned by a lockfile into the cache."
+    )
+    install_parser.add_argument("lockfile", nargs="?", default="optunahub-lock.json")
+    install_parser.add_argument("-j", "--jobs", type=int, default=None)
+
+    args = parser.parse_args(argv)
+    if args.command == "lock":
+        packages = []
+        for package in args.packages:
+            name, _, ref = package.partition("@")
+            packages.append(
+                {
+                    "package": name,
+                    "ref": ref or "main",
+                    "repo_owner": args.repo_owner,
+                    "repo_name": args.repo_name,
+                    "base_url": args.base_url,
+                }
+            )
+        optunahub.create_lockfile(packages, args.output, max_workers=args.jobs)
+    else:
+        optunahub.install_lockfile(args.lockfile, max_workers=args.jobs)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+from contextlib import suppress
+import json
+import os
+import shutil
+import tempfile
+import time
+from typing import Any
+import uuid
+
+
+_VERSIONS_SUFFIX = ".versions"
+# The replaced versions of a package are kept for the processes that have imported them.
+_VERSION_EXPIRATION = 24 * 60 * 60
+
+
+def _metadata_path(package_cache_dir: str) -> str:
+    # The metadata of a versioned package is stored next to the version the link points to.
+    return f"{os.path.realpath(package_cache_dir)}.meta.json"
+
+
+def _read_metadata(package_cache_dir: str) -> dict[str, Any]:
+    try:
+        with open(_metadata_path(package_cache_dir)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def read_commit(package_cache_dir: str) -> str | None:
+    """Return the commit SHA the cached package was downloaded from if recorded."""
+    return _read_metadata(package_cache_dir).get("commit")
+
+
+def read_filters(package_cache_dir: str) -> dict[str, Any] | None:
+    """Return the file filters the cached package was downloaded with if recorded."""
+    return _read_metadata(package_cache_dir).get("filters")
+
+
+def find_root(cache_roots: list[str], relative_path: str) -> str | None:
+    """Return the first cache directory that contains ``relative_path``."""
+    for cache_root in cache_roots:
+        if os.path.exists(os.path.join(cache_root, relative_path)):
+            return cache_root
+    return None
+
+
+def writable_root(cache_roots: list[str]) -> str:
+    """Return the first cache directory that is writable or can be created."""
+    for cache_root in cache_roots:
+        path = os.path.abspath(cache_root)
+        while not os.path.exists(path):
+            path = os.path.dirname(path)
+        if os.path.isdir(path) and os.access(path, os.W_OK):
+            return cache_root
+    raise PermissionError(f"None of the cache directories is writable: {cache_roots}")
+
+
+def copy_package(src_package_dir: str, package_cache_dir: str) -> None:
+    """Copy a cached package into another cache directory with its metadata."""
+    parent_dir = os.path.dirname(package_cache_dir)
+    os.makedirs(parent_dir, exist_ok=True)
+    with tempfile.TemporaryDirectory(prefix=".copying-", dir=parent_dir) as tmpdir:
+        copied_dir = os.path.join(tmpdir, "package")
+        shutil.copytree(src_package_dir, copied_dir)
+        install_package(
+            copied_dir,
+            package_cache_dir,
+            read_commit(src_package_dir),
+            filters=read_filters(src_package_dir),
+        )
+
+
+def install_package(
+    src_dir: str,
+    package_cache_dir: str,
+    commit: str | None,
+    filters: dict[str, Any] | None = None,
+) -> None:
+    """Move a downloaded package into the cache, replacing the cached one.
+
+    Each installed package is moved into its own directory in ``<package_cache_dir>.versions``,
+    and ``package_cache_dir`` is a symbolic link to the current one, which is switched with
+    :func:`os.replace`. A concurrent load thus sees either the old or the new package, and the
+    directory a process has imported a package from is never modified. The replaced versions are
+    removed a day later. Where symbolic links are not available, the package directory is
+    swapped with renames instead.
+
+    Args:
+        src_dir:
+            The directory of the downloaded package.
+        package_cache_dir:
+            The cache directory of the package.
+        commit:
+            The commit SHA the package was downloaded from, if known.
+        filters:
+            The file filters the package was downloaded with, if any.
+    """
+    metadata = {"commit": commit, "filters": filters}
+    versions_dir = f"{package_cache_dir}{_VERSIONS_SUFFIX}"
+    os.makedirs(versions_dir, exist_ok=True)
+    version_dir = os.path.join(versions_dir, f"{commit or 'unknown'}-{uuid.uuid4().hex[:8]}")
+    # The downloaded package may be a link to a version in a temporary cache.
+    shutil.move(os.path.realpath(src_dir), version_dir)
+    # The metadata is written before the switch so that it is consistent with the package.
+    _write_metadata(version_dir, metadata)
+
+    parent_dir = os.path.dirname(package_cache_dir)
+    link_path = os.path.join(parent_dir, f".{os.path.basename(version_dir)}.link")
+    try:
+        os.symlink(os.path.relpath(version_dir, parent_dir), link_path, target_is_directory=True)
+    except (OSError, NotImplementedError):
+        os.remove(_metadata_path(version_dir))
+        _swap_directory(version_dir, package_cache_dir, metadata)
+        return
+
+    previous_dir = None
+    if os.path.islink(package_cache_dir):
+        previous_dir = os.path.realpath(package_cache_dir)
+    elif os.path.isdir(package_cache_dir):
+        # The package installed before the versioned layout is moved once to the versions.
+        with suppress(OSError):
+            legacy_dir = os.path.join(versions_dir, f"legacy-{uuid.uuid4().hex[:8]}")
+            os.rename(package_cache_dir, legacy_dir)
+            previous_dir = legacy_dir
+            os.rename(_metadata_path(package_cache_dir), _metadata_path(legacy_dir))
+    try:
+        os.replace(link_path, package_cache_dir)
+    except OSError:
+        os.remove(link_path)
+        raise
+    if previous_dir is not None:
+        # The modification time tells when the version was replaced.
+        with suppress(OSError):
+            os.utime(previous_dir)
+    _remove_old_versions(versions_dir, os.path.realpath(package_cache_dir))
+
+
+def _remove_old_versions(versions_dir: str, current_dir: str) -> None:
+    expired = time.time() - _VERSION_EXPIRATION
+    for entry in os.scandir(versions_dir):
+        path = entry.path
+        if not entry.is_dir(follow_symlinks=False) or os.path.realpath(path) == current_dir:
+            continue
+        with suppress(OSError):
+            if entry.stat(follow_symlinks=False).st_mtime < expired:
+                shutil.rmtree(path)
+                os.remove(_metadata_path(path))
+
+
+def _swap_directory(src_dir: str, package_cache_dir: str, metadata: dict[str, Any]) -> None:
+    parent_dir = os.path.dirname(package_cache_dir)
+    os.makedirs(parent_dir, exist_ok=True)
+    staging_dir = tempfile.mkdtemp(prefix=".staging-", dir=parent_dir)
+    try:
+        new_dir = os.path.join(staging_dir, "new")
+        old_dir = os.path.join(staging_dir, "old")
+        shutil.move(src_dir, new_dir)
+        with_old = os.path.exists(package_cache_dir)
+        if with_old:
+            os.rename(package_cache_dir, old_dir)
+        try:
+            os.rename(new_dir, package_cache_dir)
+        except OSError:
+            # Another process has installed the package in the meantime.
+            if with_old and not os.path.exists(package_cache_dir):
+                os.rename(old_dir, package_cache_dir)
+            return
+        _write_metadata(package_cache_dir, metadata)
+    finally:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+
+
+def _write_metadata(package_dir: str, metadata: dict[str, Any]) -> None:
+    metadata_path = _metadata_path(package_dir)
+    tmp_path = f"{metadata_path}.{uuid.uuid4().hex[:8]}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(metadata, f)
+    os.replace(tmp_path, metadata_path)
@@ -31,6 +31,59 @@ def cache_home() -> str:
         )
 
 
+def cache_path() -> list[str]:
+    """Return the cache directories to search for packages in order.
+
+    The directories are read from the environmental variable ``OPTUNAHUB_CACHE_PATH``, which
+    is a list of paths separated by :data:`os.pathsep`, e.g., a local directory followed by a
+    read-only shared one. Downloaded packages are written to the first writable directory.
+
+    Returns:
+        The list of the cache directories. It defaults to ``[cache_home()]``.
+    """
+
+    optunahub_cache_path_env = os.getenv("OPTUNAHUB_CACHE_PATH", "")
+    paths = [p for p in optunahub_cache_path_env.split(os.pathsep) if p != ""]
+    return paths if len(paths) > 0 else [cache_home()]
+
+
+def is_cache_promotion() -> bool:
+    """Return whether the packages found in the non-writable caches are copied to the writable one.
+
+    The promotion can be enabled by setting the environmental variable OPTUNAHUB_CACHE_PROMOTE=1.
+
+    Returns:
+        `True` if the promotion is enabled, `False` otherwise.
+    """
+
+    return os.getenv("OPTUNAHUB_CACHE_PROMOTE", "0") == "1"
+
+
+def lockfile() -> str | None:
+    """Return the path to the active lockfile.
+
+    The lockfile can be activated by setting the environmental variable OPTUNAHUB_LOCKFILE.
+
+    Returns:
+        The path to the lockfile, or `None` if no lockfile is active.
+    """
+
+    return os.getenv("OPTUNAHUB_LOCKFILE") or None
+
+
+def is_requirements_install() -> bool:
+    """Return whether the requirements of the loaded packages are installed.
+
+    The installation can be enabled by setting the environmental variable
+    OPTUNAHUB_INSTALL_REQUIREMENTS=1.
+
+    Returns:
+        `True` if the installation is enabled, `False` otherwise.
+    """
+
+    return os.getenv("OPTUNAHUB_INSTALL_REQUIREMENTS", "0") == "1"
+
+
 def is_no_analytics() -> bool:
     """Return whether the analytics is disabled.
 
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+from collections.abc import Mapping
+from collections.abc import Sequence
+import logging
+import os
+import subprocess
+import time
+
+
+_logger = logging.getLogger(__name__)
+
+
+class GitError(Exception):
+    """Raised when a ``git`` command exits with a non-zero status."""
+
+    def __init__(self, args: Sequence[str], returncode: int, stderr: str) -> None:
+        super().__init__(f"`git {' '.join(args)}` exited with {returncode}: {stderr.strip()}")
+        self.command = list(args)
+        self.returncode = returncode
+        self.stderr = stderr
+
+
+def run(*args: str, cwd: str | None = None, env: Mapping[str, str] | None = None) -> str:
+    """Run a ``git`` command and return its standard output.
+
+    The duration of each command is logged at the debug level.
+    """
+    start = time.perf_counter()
+    result = subprocess.run(
+        ["git", *args],
+        cwd=cwd,
+        env=None if env is None else {**os.environ, **env},
+        capture_output=True,
+        text=True,
+    )
+    _logger.debug("`git %s` took %.3f s.", " ".join(args), time.perf_counter() - start)
+    if result.returncode != 0:
+        raise GitError(args, result.returncode, result.stderr)
+    return result.stdout
+
+
+# The messages of the errors due to the unsupported partial clone or the refused on-demand fetch
+# of the blobs from the promisor remote.
+_PARTIAL_CLONE_ERRORS = (
+    # The client git does not know `git fetch --filter`.
+    "unknown option `filter",
+    # The client git requires `extensions.partialClone` for `git fetch --filter`.
+    "--filter can only be used",
+    "invalid filter-spec",
+    # The blobs missing in the partial clone cannot be fetched on demand.
+    "from promisor remote",
+    "lazy fetching disabled",
+)
+
+
+def is_partial_clone_error(error: GitError) -> bool:
+    """Return whether a command of :func:`sparse_checkout` failed due to the partial clone."""
+    stderr = error.stderr.lower()
+    return any(message.lower() in stderr for message in _PARTIAL_CLONE_ERRORS)
+
+
+def ls_remote(repo_url: str, ref: str) -> dict[str, str]:
+    """Return the commit SHAs of the refs matching ``ref`` in a remote repository."""
+    output = run("ls-remote", repo_url, ref)
+    return {name: sha for sha, name in (line.split("\t") for line in output.splitlines())}
+
+
+def _quote(value: str) -> str:
+    escaped = value.replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{escaped}"'
+
+
+def sparse_checkout(
+    checkout_dir: str,
+    repo_url: str,
+    patterns: Sequence[str],
+    ref: str,
+    blob_filter: str | None = None,
+) -> str:
+    """Check out the files matching ``patterns`` at ``ref`` of a remote repository.
+
+    Only three commands, ``git init``, ``git fetch``, and ``git checkout``, are run. The remote
+    and the sparse checkout are configured by writing the files in ``.git`` instead of running
+    ``git remote`` and ``git sparse-checkout``, and the commit SHA is read from ``.git/HEAD``.
+
+    Args:
+        checkout_dir:
+            The directory to create the repository in.
+        repo_url:
+            The URL of the remote repository.
+        patterns:
+            The patterns of the non-cone mode sparse checkout.
+        ref:
+            The branch, tag, or commit SHA to check out.
+        blob_filter:
+            The filter of the partial clone, e.g., ``"blob:none"``, in which case only the blobs
+            of the checked out files are fetched. If :obj:`None`, the whole commit is fetched.
+
+    Returns:
+        The SHA of the checked out commit.
+    """
+    run("init", "--quiet", checkout_dir)
+    git_dir = os.path.join(checkout_dir, ".git")
+    with open(os.path.join(git_dir, "config"), "a") as f:
+        f.write(
+            "[core]\n"
+            "\tsparseCheckout = true\n"
+            "\tsparseCheckoutCone = false\n"
+            '[remote "origin"]\n'
+            f"\turl = {_quote(repo_url)}\n"
+        )
+    os.makedirs(os.path.join(git_dir, "info"), exist_ok=True)
+    with open(os.path.join(git_dir, "info", "sparse-checkout"), "w") as f:
+        f.write("".join(f"{pattern}\n" for pattern in patterns))
+
+    # `git fetch` configures the remote as the promisor of the partial clone by itself.
+    filter_args = [] if blob_filter is None else [f"--filter={blob_filter}"]
+    run("fetch", "--quiet", "--depth=1", *filter_args, "origin", ref, cwd=checkout_dir)
+    # The checkout fetches the missing blobs of the selected files from the promisor remote.
+    run("checkout", "--quiet", "FETCH_HEAD", cwd=checkout_dir)
+    with open(os.path.join(git_dir, "HEAD")) as f:
+        return f.read().strip()
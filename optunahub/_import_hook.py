@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from contextlib import suppress
+import importlib.abc
+import importlib.machinery
+import importlib.util
+import os
+import sys
+import threading
+import types
+
+from optunahub import _cache
+from optunahub import _conf
+
+
+_ROOT = "optunahub_registry"
+_DEFAULT_PREFIX = f"{_ROOT}.package."
+_ORIGINS_DIR = "_origins"
+
+
+class _EmptyPackageLoader(importlib.abc.Loader):
+    """Loader of the parent packages of registry packages, which have no code."""
+
+    def exec_module(self, module: types.ModuleType) -> None:
+        pass
+
+
+class _RegistryFinder(importlib.abc.MetaPathFinder):
+    """Meta path finder of the ``optunahub_registry`` namespace.
+
+    The packages loaded by :func:`optunahub.load_local_module` are registered with their
+    directories, and their submodules are imported from there. The parents of the registered
+    packages, e.g., ``optunahub_registry.package.samplers``, are created as empty packages.
+    The other packages under ``optunahub_registry.package`` are looked up in the caches of the
+    official registry if they were last loaded from there according to :func:`record_origin`,
+    so that registry packages can be imported without calling :func:`optunahub.load_module`
+    first, e.g., when a sampler is unpickled in a worker process importing optunahub.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._packages: dict[str, str] = {}
+
+    def register(self, module_name: str, module_path: str) -> None:
+        with self._lock:
+            self._packages[module_name] = module_path
+
+    def find_spec(
+        self,
+        fullname: str,
+        path: Sequence[str] | None,
+        target: types.ModuleType | None = None,
+    ) -> importlib.machinery.ModuleSpec | None:
+        if not fullname.startswith(_ROOT):
+            return None
+        if fullname == _ROOT:
+            return _package_spec(fullname, [])
+        if not fullname.startswith(f"{_ROOT}."):
+            return None
+
+        with self._lock:
+            packages = sorted(self._packages.items(), key=lambda x: len(x[0]), reverse=True)
+        for module_name, module_path in packages:
+            if fullname == module_name or fullname.startswith(f"{module_name}."):
+                rest = fullname[len(module_name) :].split(".")[1:]
+                return _spec_from_path(fullname, os.path.join(module_path, *rest))
+        if fullname == _DEFAULT_PREFIX[:-1] or any(
+            module_name.startswith(f"{fullname}.") for module_name, _ in packages
+        ):
+            return _package_spec(fullname, [])
+        if fullname.startswith(_DEFAULT_PREFIX):
+            return _recorded_spec(fullname)
+        return None
+
+
+def _recorded_spec(fullname: str) -> importlib.machinery.ModuleSpec | None:
+    origins = _read_origins()
+    for module_name in sorted(origins, key=len, reverse=True):
+        if fullname == module_name or fullname.startswith(f"{module_name}."):
+            rest = fullname[len(module_name) :].split(".")[1:]
+            return _spec_from_path(fullname, os.path.join(origins[module_name], *rest))
+    if any(module_name.startswith(f"{fullname}.") for module_name in origins):
+        return _package_spec(fullname, [])
+    raise ImportError(
+        f"{fullname} is not known to be loaded from the official registry. "
+        "Preload it with `optunahub.worker_initializer` in this process.",
+        name=fullname,
+    )
+
+
+def _package_spec(fullname: str, paths: list[str]) -> importlib.machinery.ModuleSpec:
+    spec = importlib.machinery.ModuleSpec(fullname, _EmptyPackageLoader(), is_package=True)
+    spec.submodule_search_locations = paths
+    return spec
+
+
+def _spec_from_path(fullname: str, path: str) -> importlib.machinery.ModuleSpec | None:
+    init_path = os.path.join(path, "__init__.py")
+    if os.path.isfile(init_path):
+        return importlib.util.spec_from_file_location(
+            fullname, init_path, submodule_search_locations=[path]
+        )
+    if os.path.isfile(f"{path}.py"):
+        return importlib.util.spec_from_file_location(fullname, f"{path}.py")
+    if os.path.isdir(path):
+        return _package_spec(fullname, [path])
+    return None
+
+
+def _default_registry_roots() -> list[str]:
+    return [
+        os.path.join(cache_root, "github.com", "optuna", "optunahub-registry", "main", "package")
+        for cache_root in _conf.cache_path()
+    ]
+
+
+def _is_official_path(module_name: str, module_path: str) -> bool:
+    rest = module_name[len(_DEFAULT_PREFIX) :].split(".")
+    return any(
+        os.path.realpath(module_path) == os.path.realpath(os.path.join(registry_root, *rest))
+        for registry_root in _default_registry_roots()
+    )
+
+
+def _origins_dir() -> str:
+    return os.path.join(_cache.writable_root(_conf.cache_path()), _ORIGINS_DIR)
+
+
+def _read_origins() -> dict[str, str]:
+    try:
+        origins_dir = _origins_dir()
+        names = os.listdir(origins_dir)
+    except OSError:
+        return {}
+    origins = {}
+    for name in names:
+        if name.startswith("."):
+            # A record being written.
+            continue
+        try:
+            with open(os.path.join(origins_dir, name)) as f:
+                origins[name] = f.read()
+        except OSError:
+            continue
+    return origins
+
+
+def record_origin(module_name: str, module_path: str) -> None:
+    """Record whether a package was loaded by :func:`optunahub.load_module` from the caches of
+    the official registry.
+
+    The records are shared by the processes using the same caches, and the finder falls back to
+    the caches of the official registry only for the packages last loaded from there, e.g., when
+    a worker process unpickles a sampler. The record is written only if it changes.
+    """
+    if not module_name.startswith(_DEFAULT_PREFIX):
+        return
+    try:
+        origins_dir = _origins_dir()
+        origin_path = os.path.join(origins_dir, module_name)
+        if not _is_official_path(module_name, module_path):
+            if os.path.exists(origin_path):
+                os.remove(origin_path)
+            return
+        with suppress(OSError), open(origin_path) as f:
+            if f.read() == module_path:
+                return
+        os.makedirs(origins_dir, exist_ok=True)
+        tmp_path = os.path.join(origins_dir, f".{module_name}.{os.getpid()}")
+        with open(tmp_path, "w") as f:
+            f.write(module_path)
+        os.replace(tmp_path, origin_path)
+    except OSError:
+        # The records are only used by the fallback of the finder.
+        pass
+
+
+_finder = _RegistryFinder()
+
+
+def install() -> None:
+    """Install the finder of the ``optunahub_registry`` namespace if not installed yet.
+
+    The namespace is created at runtime as an empty package, so it is importable only after
+    optunahub is imported.
+    """
+    if _finder not in sys.meta_path:
+        # The finder precedes the path based finder, which would otherwise look up the registered
+        # packages in the directories of their parents.
+        sys.meta_path.insert(0, _finder)
+
+
+def register(module_name: str, module_path: str) -> None:
+    """Import ``module_name`` and its submodules from ``module_path`` from now on."""
+    _finder.register(module_name, module_path)
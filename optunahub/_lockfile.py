@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from typing import Any
+
+from optunahub import _conf
+
+
+_LOCKFILE_VERSION = 1
+
+_lock = threading.Lock()
+_active: tuple[str, int, list[dict[str, Any]]] | None = None
+
+
+def hash_package(package_dir: str) -> dict[str, str]:
+    """Return the SHA-256 digests of the files in a package keyed by their relative paths."""
+    hashes = {}
+    for root, dirs, files in os.walk(package_dir):
+        dirs[:] = sorted(d for d in dirs if d != "__pycache__")
+        for name in sorted(files):
+            path = os.path.join(root, name)
+            with open(path, "rb") as f:
+                digest = hashlib.sha256(f.read()).hexdigest()
+            relative_path = os.path.relpath(path, package_dir).replace(os.sep, "/")
+            hashes[relative_path] = f"sha256:{digest}"
+    return hashes
+
+
+def read(path: str) -> list[dict[str, Any]]:
+    """Read the entries of a lockfile."""
+    with open(path) as f:
+        lockfile = json.load(f)
+    if lockfile.get("version") != _LOCKFILE_VERSION:
+        raise ValueError(f"Unsupported lockfile version: {lockfile.get('version')}.")
+    return lockfile["packages"]
+
+
+def write(path: str, entries: list[dict[str, Any]]) -> None:
+    """Write the entries to a lockfile atomically."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump({"version": _LOCKFILE_VERSION, "packages": entries}, f, indent=2)
+        f.write("\n")
+    os.replace(tmp_path, path)
+
+
+def active_entries() -> list[dict[str, Any]]:
+    """Return the entries of the lockfile set by ``OPTUNAHUB_LOCKFILE``.
+
+    The parsed lockfile is cached until the file is modified.
+    """
+    global _active
+
+    path = _conf.lockfile()
+    if path is None:
+        return []
+    mtime = os.stat(path).st_mtime_ns
+    with _lock:
+        if _active is None or _active[:2] != (path, mtime):
+            _active = (path, mtime, read(path))
+        return _active[2]
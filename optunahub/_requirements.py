@@ -0,0 +1,257 @@
+from __future__ import annotations
+
+import hashlib
+import importlib
+import importlib.metadata
+import json
+import os
+import shutil
+import subprocess
+import sys
+import sysconfig
+import tempfile
+
+from optunahub import _cache
+from optunahub import _conf
+
+
+REQUIREMENTS_FILE = "requirements.txt"
+_ENVS_DIR = "_envs"
+
+
+def _read_requirements(requirements_path: str) -> list[str]:
+    with open(requirements_path) as f:
+        lines = [line.split("#", 1)[0].strip() for line in f]
+    return [line for line in lines if line != ""]
+
+
+def _host_distributions() -> dict[str, str]:
+    from packaging.utils import canonicalize_name
+
+    # The environments installed by this module are not a part of the host environment.
+    paths = [p for p in sys.path if os.path.basename(os.path.dirname(p)) != _ENVS_DIR]
+    versions: dict[str, str] = {}
+    for dist in importlib.metadata.distributions(path=paths):
+        name = dist.metadata["Name"]
+        if name is not None:
+            # The first distribution on the path is the one imported.
+            versions.setdefault(canonicalize_name(name), dist.version)
+    return versions
+
+
+def _environment_key(requirements: list[str]) -> str:
+    # The environments are specific to the interpreter and the platform since `pip --target`
+    # installs compiled extensions for them. The host distributions are not a part of the key,
+    # so that upgrading an unrelated package does not orphan the environments.
+    text = "\n".join(
+        [sys.implementation.cache_tag, sysconfig.get_platform(), *sorted(requirements)]
+    )
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def _unsatisfied_names(requirements: list[str]) -> set[str] | None:
+    from packaging.requirements import InvalidRequirement
+    from packaging.requirements import Requirement
+    from packaging.utils import canonicalize_name
+
+    names: set[str] = set()
+    for line in requirements:
+        try:
+            requirement = Requirement(line)
+        except InvalidRequirement:
+            # The pip options and the local paths are left to pip.
+            return None
+        if requirement.marker is not None and not requirement.marker.evaluate():
+            continue
+        try:
+            version = importlib.metadata.version(requirement.name)
+        except importlib.metadata.PackageNotFoundError:
+            names.add(canonicalize_name(requirement.name))
+            continue
+        if (
+            requirement.extras
+            or requirement.url
+            or not requirement.specifier.contains(version, prereleases=True)
+        ):
+            names.add(canonicalize_name(requirement.name))
+    return names
+
+
+def _constraints(requirements: list[str], resolved_names: set[str]) -> list[str]:
+    from packaging.version import InvalidVersion
+    from packaging.version import Version
+
+    # The requirements not satisfied by the host are resolved freely, and their dependencies
+    # are pinned to the host versions so that the host packages are not shadowed.
+    unsatisfied_names = _unsatisfied_names(requirements) or set()
+    constraints = []
+    for name, version in sorted(_host_distributions().items()):
+        if name not in resolved_names or name in unsatisfied_names:
+            continue
+        try:
+            Version(version)
+        except InvalidVersion:
+            continue
+        constraints.append(f"{name}=={version}")
+    return constraints
+
+
+def _is_satisfied(requirements: list[str]) -> bool:
+    return _unsatisfied_names(requirements) == set()
+
+
+def _pip_resolve(requirements_path: str, report_path: str) -> None:
+    subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "pip",
+            "install",
+            "--quiet",
+            "--disable-pip-version-check",
+            "--dry-run",
+            "--ignore-installed",
+            "--report",
+            report_path,
+            "--requirement",
+            requirements_path,
+        ],
+        cwd=os.path.dirname(requirements_path),
+        check=True,
+    )
+
+
+def _resolved_names(requirements_path: str, report_path: str) -> set[str]:
+    from packaging.utils import canonicalize_name
+
+    try:
+        _pip_resolve(requirements_path, report_path)
+        with open(report_path) as f:
+            report = json.load(f)
+    except (subprocess.CalledProcessError, OSError, ValueError):
+        # The installation reports the errors, and nothing is pinned without the resolution,
+        # e.g., with pip older than 22.2.
+        return set()
+    return {canonicalize_name(item["metadata"]["name"]) for item in report.get("install", [])}
+
+
+def _pip_install(requirements_path: str, constraints_path: str, target_dir: str) -> None:
+    subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "pip",
+            "install",
+            "--quiet",
+            "--disable-pip-version-check",
+            "--target",
+            target_dir,
+            "--requirement",
+            requirements_path,
+            "--constraint",
+            constraints_path,
+        ],
+        cwd=os.path.dirname(requirements_path),
+        check=True,
+    )
+
+
+def _remove_host_distributions(target_dir: str) -> None:
+    from packaging.utils import canonicalize_name
+
+    # `pip --target` ignores the installed packages, so the ones the host already has are
+    # removed instead of shadowing the host packages.
+    host_versions = _host_distributions()
+    for dist in importlib.metadata.distributions(path=[target_dir]):
+        name = dist.metadata["Name"]
+        if name is None or host_versions.get(canonicalize_name(name)) != dist.version:
+            continue
+        for file in dist.files or []:
+            path = os.path.normpath(os.path.join(target_dir, file))
+            if os.path.commonpath([path, target_dir]) == target_dir and os.path.isfile(path):
+                os.remove(path)
+    for dir_path, _, _ in sorted(os.walk(target_dir), reverse=True):
+        if dir_path != target_dir and len(os.listdir(dir_path)) == 0:
+            os.rmdir(dir_path)
+
+
+def _install(requirements_path: str, requirements: list[str], env_dir: str) -> None:
+    envs_dir = os.path.dirname(env_dir)
+    os.makedirs(envs_dir, exist_ok=True)
+    staging_dir = tempfile.mkdtemp(prefix=".staging-", dir=envs_dir)
+    try:
+        target_dir = os.path.join(staging_dir, "env")
+        constraints_path = os.path.join(staging_dir, "constraints.txt")
+        resolved_names = _resolved_names(
+            requirements_path, os.path.join(staging_dir, "report.json")
+        )
+        constraints = _constraints(requirements, resolved_names)
+        with open(constraints_path, "w") as f:
+            f.write("".join(f"{constraint}\n" for constraint in constraints))
+        try:
+            _pip_install(requirements_path, constraints_path, target_dir)
+        except subprocess.CalledProcessError:
+            if len(constraints) == 0:
+                raise
+            # The requirements need other versions of the host packages, which are installed
+            # into the environment and shadow the host ones.
+            shutil.rmtree(target_dir, ignore_errors=True)
+            with open(constraints_path, "w") as f:
+                f.write("")
+            _pip_install(requirements_path, constraints_path, target_dir)
+        _remove_host_distributions(target_dir)
+        try:
+            # The environment appears only when complete, so its existence means it is usable.
+            os.rename(target_dir, env_dir)
+        except OSError:
+            # Another process has installed the same environment in the meantime.
+            if not os.path.isdir(env_dir):
+                raise
+    finally:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+
+
+def activate(package_dir: str) -> str | None:
+    """Make the requirements of a package importable.
+
+    The requirements in ``requirements.txt`` are installed into a cache directory keyed by their
+    hash, which is prepended to :data:`sys.path`. If the directory for the same requirements
+    already exists in one of the caches, it is used without resolving the requirements again.
+    Nothing is installed if the current environment satisfies the requirements.
+
+    The dependencies resolved by pip are pinned to the versions installed in the current
+    environment if any and not copied into the directory, so the directory only adds the missing
+    packages and the requirements the current environment does not satisfy, rather than
+    shadowing, e.g., the installed NumPy. If the requirements need other versions of the
+    installed packages, they are installed into the directory instead. The directory is keyed by
+    the requirements, the interpreter, and the platform, and the current environment is not
+    inspected when the directory exists.
+
+    Args:
+        package_dir:
+            The directory of the package.
+
+    Returns:
+        The directory of the environment, or :obj:`None` if no environment is used.
+    """
+    requirements_path = os.path.join(package_dir, REQUIREMENTS_FILE)
+    if not os.path.isfile(requirements_path):
+        return None
+    requirements = _read_requirements(requirements_path)
+    if len(requirements) == 0:
+        return None
+
+    relative_path = os.path.join(_ENVS_DIR, _environment_key(requirements))
+    cache_roots = _conf.cache_path()
+    cached_root = _cache.find_root(cache_roots, relative_path)
+    if cached_root is None:
+        if _is_satisfied(requirements):
+            return None
+        cached_root = _cache.writable_root(cache_roots)
+        _install(requirements_path, requirements, os.path.join(cached_root, relative_path))
+
+    env_dir = os.path.join(cached_root, relative_path)
+    if env_dir not in sys.path:
+        sys.path.insert(0, env_dir)
+        importlib.invalidate_caches()
+    return env_dir
@@ -1,8 +1,22 @@
 from ._base_problem import BaseProblem
 from ._constrained_mixin import ConstrainedMixin
+from ._problems import Ackley
+from ._problems import C2DTLZ2
+from ._problems import DTLZ2
+from ._problems import Rastrigin
+from ._problems import Rosenbrock
+from ._problems import Sphere
+from ._problems import ZDT1
 
 
 __all__ = [
+    "Ackley",
     "BaseProblem",
+    "C2DTLZ2",
     "ConstrainedMixin",
+    "DTLZ2",
+    "Rastrigin",
+    "Rosenbrock",
+    "Sphere",
+    "ZDT1",
 ]
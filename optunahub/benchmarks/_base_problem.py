@@ -7,6 +7,9 @@ from typing import Sequence
 
 import optuna
 
+from optunahub.benchmarks._constrained_mixin import _CONSTRAINTS_ATTR_KEY
+from optunahub.benchmarks._constrained_mixin import ConstrainedMixin
+
 
 class BaseProblem(metaclass=ABCMeta):
     """Base class for optimization problems."""
@@ -14,6 +17,11 @@ class BaseProblem(metaclass=ABCMeta):
     def __call__(self, trial: optuna.Trial) -> float | Sequence[float]:
         """Objective function for Optuna. By default, this method calls :meth:`evaluate` with the parameters defined in :attr:`search_space`.
 
+        For problems with :class:`~optunahub.benchmarks.ConstrainedMixin` overriding
+        :meth:`~optunahub.benchmarks.ConstrainedMixin.evaluate_with_constraints`, this method calls
+        it instead and stores the constraint values in the trial, so that
+        :meth:`~optunahub.benchmarks.ConstrainedMixin.constraints_func` does not evaluate them again.
+
         Args:
             trial: Optuna trial object.
         Returns:
@@ -23,6 +31,17 @@ class BaseProblem(metaclass=ABCMeta):
         for name, dist in self.search_space.items():
             params[name] = trial._suggest(name, dist)
             trial._check_distribution(name, dist)
+        if (
+            isinstance(self, ConstrainedMixin)
+            and type(self).evaluate_with_constraints
+            is not ConstrainedMixin.evaluate_with_constraints
+        ):
+            values, constraints = self.evaluate_with_constraints(params)
+            if isinstance(trial, optuna.Trial):
+                trial.storage.set_trial_system_attr(
+                    trial._trial_id, _CONSTRAINTS_ATTR_KEY, [float(c) for c in constraints]
+                )
+            return values
         return self.evaluate(params)
 
     def evaluate(self, params: dict[str, Any]) -> float | Sequence[float]:
@@ -2,10 +2,19 @@ from __future__ import annotations
 
 from collections.abc import Sequence
 from typing import Any
+from typing import Union
 
+import numpy as np
 import optuna
 
 
+# The system attribute key of the constraint values stored by ``BaseProblem.__call__``.
+_CONSTRAINTS_ATTR_KEY = "optunahub:constraints"
+
+# A 2-D array whose columns follow the order of ``search_space``, or a sequence of parameters.
+_BatchParams = Union[np.ndarray, Sequence[dict[str, Any]]]
+
+
 class ConstrainedMixin:
     """Mixin class for constrained optimization problems.
 
@@ -55,16 +64,31 @@ class ConstrainedMixin:
             sampler = optuna.samplers.TPESampler(constraints_func=problem.constraints_func)
             study = optuna.create_study(sampler=sampler, directions=problem.directions)
             study.optimize(problem, n_trials=20)
+
+        If the objectives and the constraints are computed by the same expensive run, e.g., of a
+        simulator, override :meth:`evaluate_with_constraints` to compute both at once. The
+        constraint values are then stored in the trial by
+        :meth:`~optunahub.benchmarks.BaseProblem.__call__` and reused by
+        :meth:`constraints_func`, so the run is executed only once per trial. Otherwise, the
+        constraints are evaluated only by :meth:`constraints_func`, and nothing is stored.
     """
 
     def constraints_func(self, trial: optuna.trial.FrozenTrial) -> Sequence[float]:
         """Evaluate the constraint functions.
 
+        If the constraint values are stored in the trial by
+        :meth:`~optunahub.benchmarks.BaseProblem.__call__`, i.e., if
+        :meth:`evaluate_with_constraints` is overridden, they are returned as is instead of being
+        computed again by :meth:`evaluate_constraints`.
+
         Args:
             trial: Optuna trial object.
         Returns:
             List of the constraint values.
         """
+        constraints = trial.system_attrs.get(_CONSTRAINTS_ATTR_KEY)
+        if constraints is not None:
+            return constraints
         return self.evaluate_constraints(trial.params.copy())
 
     def evaluate_constraints(self, params: dict[str, Any]) -> Sequence[float]:
@@ -76,3 +100,87 @@ class ConstrainedMixin:
             List of the constraint values.
         """
         raise NotImplementedError
+
+    def evaluate_with_constraints(
+        self, params: dict[str, Any]
+    ) -> tuple[float | Sequence[float], Sequence[float]]:
+        """Evaluate the objective functions and the constraint functions at once.
+
+        By default, this method calls ``evaluate`` and :meth:`evaluate_constraints`.
+
+        Args:
+            params: Dictionary of input parameters.
+        Returns:
+            A tuple of the objective value(s) and the list of the constraint values.
+
+        Example:
+            ::
+
+                def evaluate_with_constraints(
+                    self, params: dict[str, Any]
+                ) -> tuple[float, list[float]]:
+                    result = run_simulation(params)
+                    return result.cost, [result.stress - 1.0]
+        """
+        values = self.evaluate(params)  # type: ignore[attr-defined]
+        return values, self.evaluate_constraints(params)
+
+    def evaluate_constraints_batch(self, params: _BatchParams) -> np.ndarray:
+        """Evaluate the constraint functions for many parameters at once.
+
+        By default, this method calls :meth:`evaluate_constraints` for each parameter.
+        Override this method with a NumPy implementation to screen many candidates quickly.
+
+        Args:
+            params:
+                A 2-D array of shape ``(n, len(search_space))`` whose columns follow the order of
+                ``search_space``, or a sequence of ``n`` dictionaries of input parameters.
+        Returns:
+            An array of shape ``(n, n_constraints)``.
+
+        Example:
+            ::
+
+                def evaluate_constraints_batch(self, params):
+                    X = self.params_to_array(params)
+                    return np.stack([X[:, 0] + X[:, 1] - 1.0], axis=1)
+        """
+        if isinstance(params, np.ndarray):
+            names = list(self.search_space)  # type: ignore[attr-defined]
+            params = [dict(zip(names, row)) for row in params.tolist()]
+        constraints = [self.evaluate_constraints(p) for p in params]
+        if len(constraints) == 0:
+            return np.empty((0, 0), dtype=float)
+        return np.asarray(constraints, dtype=float).reshape(len(constraints), -1)
+
+    def feasibility_mask(self, params: _BatchParams) -> np.ndarray:
+        """Return which parameters satisfy all the constraints.
+
+        Args:
+            params:
+                Parameters in the same format as :meth:`evaluate_constraints_batch`.
+        Returns:
+            A boolean array of shape ``(n,)``. A parameter is feasible if all the constraint
+            values are less than or equal to zero. NaN constraint values are infeasible.
+        """
+        constraints = self.evaluate_constraints_batch(params)
+        return np.all(constraints <= 0.0, axis=1)
+
+    def params_to_array(self, params: _BatchParams) -> np.ndarray:
+        """Convert parameters into a 2-D array.
+
+        This is a helper to implement :meth:`evaluate_constraints_batch` with NumPy.
+
+        Args:
+            params:
+                Parameters in the same format as :meth:`evaluate_constraints_batch`.
+        Returns:
+            A float array of shape ``(n, len(search_space))`` whose columns follow the order of
+            ``search_space``.
+        """
+        if isinstance(params, np.ndarray):
+            return np.asarray(params, dtype=float)
+        names = list(self.search_space)  # type: ignore[attr-defined]
+        return np.asarray([[p[n] for n in names] for p in params], dtype=float).reshape(
+            len(params), len(names)
+        )
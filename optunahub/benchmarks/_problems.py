@@ -0,0 +1,325 @@
+from __future__ import annotations
+
+from abc import abstractmethod
+from collections.abc import Sequence
+import math
+from typing import Any
+
+import numpy as np
+import optuna
+
+from optunahub.benchmarks._base_problem import BaseProblem
+from optunahub.benchmarks._constrained_mixin import _BatchParams
+from optunahub.benchmarks._constrained_mixin import ConstrainedMixin
+
+
+class _ArrayProblem(BaseProblem):
+    """Base class of the problems defined on a box of continuous variables.
+
+    The parameters are named ``x0``, ``x1``, ..., and :meth:`evaluate` is implemented with
+    :meth:`evaluate_batch`, which evaluates many points at once with NumPy.
+    """
+
+    _low: float
+    _high: float
+
+    def __init__(self, dim: int) -> None:
+        if dim < self._min_dim:
+            raise ValueError(f"`dim` must be at least {self._min_dim}, but got {dim}.")
+        self._dim = dim
+        self._search_space: dict[str, optuna.distributions.BaseDistribution] = {
+            f"x{i}": optuna.distributions.FloatDistribution(self._low, self._high)
+            for i in range(dim)
+        }
+
+    @property
+    def _min_dim(self) -> int:
+        return 1
+
+    @property
+    def dim(self) -> int:
+        """Return the number of variables."""
+        return self._dim
+
+    @property
+    def search_space(self) -> dict[str, optuna.distributions.BaseDistribution]:
+        return self._search_space
+
+    def evaluate(self, params: dict[str, Any]) -> float | Sequence[float]:
+        x = np.fromiter((params[name] for name in self._search_space), float, self._dim)
+        values = self.evaluate_batch(x[None, :])[0]
+        return float(values) if values.ndim == 0 else values.tolist()
+
+    @abstractmethod
+    def evaluate_batch(self, X: np.ndarray) -> np.ndarray:
+        """Evaluate the objective function at many points at once.
+
+        Args:
+            X: An array of shape ``(n, dim)``.
+        Returns:
+            An array of shape ``(n,)`` for single-objective problems or
+            ``(n, n_objectives)`` for multi-objective problems.
+        """
+        ...
+
+
+class _SingleObjectiveProblem(_ArrayProblem):
+    @property
+    def directions(self) -> list[optuna.study.StudyDirection]:
+        return [optuna.study.StudyDirection.MINIMIZE]
+
+    @property
+    def optimal_value(self) -> float:
+        """Return the global minimum value."""
+        return 0.0
+
+    @property
+    @abstractmethod
+    def optimal_params(self) -> dict[str, float]:
+        """Return the parameters achieving the global minimum."""
+        ...
+
+
+class Sphere(_SingleObjectiveProblem):
+    """Sphere function :math:`f(x) = \\sum_i x_i^2` on :math:`[-5.12, 5.12]^d`.
+
+    The global minimum is :math:`0` at :math:`x = 0`.
+
+    Args:
+        dim: The number of variables.
+    """
+
+    _low = -5.12
+    _high = 5.12
+
+    def __init__(self, dim: int = 2) -> None:
+        super().__init__(dim)
+
+    def evaluate_batch(self, X: np.ndarray) -> np.ndarray:
+        return np.sum(X**2, axis=1)
+
+    @property
+    def optimal_params(self) -> dict[str, float]:
+        return {name: 0.0 for name in self.search_space}
+
+
+class Rosenbrock(_SingleObjectiveProblem):
+    """Rosenbrock function on :math:`[-5, 10]^d`.
+
+    :math:`f(x) = \\sum_{i=1}^{d-1} 100 (x_{i+1} - x_i^2)^2 + (1 - x_i)^2`.
+    The global minimum is :math:`0` at :math:`x = 1`.
+
+    Args:
+        dim: The number of variables. It must be at least 2.
+    """
+
+    _low = -5.0
+    _high = 10.0
+
+    def __init__(self, dim: int = 2) -> None:
+        super().__init__(dim)
+
+    @property
+    def _min_dim(self) -> int:
+        return 2
+
+    def evaluate_batch(self, X: np.ndarray) -> np.ndarray:
+        return np.sum(100.0 * (X[:, 1:] - X[:, :-1] ** 2) ** 2 + (1.0 - X[:, :-1]) ** 2, axis=1)
+
+    @property
+    def optimal_params(self) -> dict[str, float]:
+        return {name: 1.0 for name in self.search_space}
+
+
+class Rastrigin(_SingleObjectiveProblem):
+    """Rastrigin function on :math:`[-5.12, 5.12]^d`.
+
+    :math:`f(x) = 10 d + \\sum_i x_i^2 - 10 \\cos(2 \\pi x_i)`.
+    The global minimum is :math:`0` at :math:`x = 0`.
+
+    Args:
+        dim: The number of variables.
+    """
+
+    _low = -5.12
+    _high = 5.12
+
+    def __init__(self, dim: int = 2) -> None:
+        super().__init__(dim)
+
+    def evaluate_batch(self, X: np.ndarray) -> np.ndarray:
+        return 10.0 * X.shape[1] + np.sum(X**2 - 10.0 * np.cos(2.0 * np.pi * X), axis=1)
+
+    @property
+    def optimal_params(self) -> dict[str, float]:
+        return {name: 0.0 for name in self.search_space}
+
+
+class Ackley(_SingleObjectiveProblem):
+    """Ackley function on :math:`[-32.768, 32.768]^d`.
+
+    :math:`f(x) = -20 \\exp(-0.2 \\sqrt{\\sum_i x_i^2 / d}) - \\exp(\\sum_i \\cos(2 \\pi x_i) / d)
+    + 20 + e`.
+    The global minimum is :math:`0` at :math:`x = 0`.
+
+    Args:
+        dim: The number of variables.
+    """
+
+    _low = -32.768
+    _high = 32.768
+
+    def __init__(self, dim: int = 2) -> None:
+        super().__init__(dim)
+
+    def evaluate_batch(self, X: np.ndarray) -> np.ndarray:
+        d = X.shape[1]
+        a = -20.0 * np.exp(-0.2 * np.sqrt(np.sum(X**2, axis=1) / d))
+        b = -np.exp(np.sum(np.cos(2.0 * np.pi * X), axis=1) / d)
+        # Clip the rounding error around the optimum.
+        return np.maximum(a + b + 20.0 + math.e, 0.0)
+
+    @property
+    def optimal_params(self) -> dict[str, float]:
+        return {name: 0.0 for name in self.search_space}
+
+
+class _MultiObjectiveProblem(_ArrayProblem):
+    _low = 0.0
+    _high = 1.0
+
+    @property
+    @abstractmethod
+    def n_objectives(self) -> int:
+        """Return the number of objectives."""
+        ...
+
+    @property
+    def directions(self) -> list[optuna.study.StudyDirection]:
+        return [optuna.study.StudyDirection.MINIMIZE] * self.n_objectives
+
+    @abstractmethod
+    def pareto_front(self, n_points: int) -> np.ndarray:
+        """Return points on the true Pareto front.
+
+        Args:
+            n_points: The number of points.
+        Returns:
+            An array of shape ``(n_points, n_objectives)``.
+        """
+        ...
+
+
+class ZDT1(_MultiObjectiveProblem):
+    """ZDT1 function on :math:`[0, 1]^d` with two objectives.
+
+    :math:`f_1(x) = x_1` and :math:`f_2(x) = g(x) (1 - \\sqrt{f_1(x) / g(x)})`, where
+    :math:`g(x) = 1 + 9 \\sum_{i=2}^d x_i / (d - 1)`.
+    The Pareto front is :math:`f_2 = 1 - \\sqrt{f_1}`, achieved by :math:`x_2 = ... = x_d = 0`.
+
+    Args:
+        dim: The number of variables. It must be at least 2.
+    """
+
+    def __init__(self, dim: int = 30) -> None:
+        super().__init__(dim)
+
+    @property
+    def _min_dim(self) -> int:
+        return 2
+
+    @property
+    def n_objectives(self) -> int:
+        return 2
+
+    def evaluate_batch(self, X: np.ndarray) -> np.ndarray:
+        f1 = X[:, 0]
+        g = 1.0 + 9.0 * np.sum(X[:, 1:], axis=1) / (X.shape[1] - 1)
+        f2 = g * (1.0 - np.sqrt(f1 / g))
+        return np.stack([f1, f2], axis=1)
+
+    def pareto_front(self, n_points: int) -> np.ndarray:
+        f1 = np.linspace(0.0, 1.0, n_points)
+        return np.stack([f1, 1.0 - np.sqrt(f1)], axis=1)
+
+
+class DTLZ2(_MultiObjectiveProblem):
+    """DTLZ2 function on :math:`[0, 1]^d`.
+
+    The Pareto front is the part of the unit sphere :math:`\\sum_i f_i^2 = 1` in the positive
+    orthant, achieved by :math:`x_M = ... = x_d = 0.5`.
+
+    Args:
+        dim: The number of variables. It must be at least ``n_objectives``.
+        n_objectives: The number of objectives.
+    """
+
+    def __init__(self, dim: int = 12, n_objectives: int = 3) -> None:
+        if n_objectives < 2:
+            raise ValueError(f"`n_objectives` must be at least 2, but got {n_objectives}.")
+        self._n_objectives = n_objectives
+        super().__init__(dim)
+
+    @property
+    def _min_dim(self) -> int:
+        return self._n_objectives
+
+    @property
+    def n_objectives(self) -> int:
+        return self._n_objectives
+
+    def evaluate_batch(self, X: np.ndarray) -> np.ndarray:
+        m = self._n_objectives
+        g = np.sum((X[:, m - 1 :] - 0.5) ** 2, axis=1)
+        theta = X[:, : m - 1] * (np.pi / 2.0)
+        cos = np.cos(theta)
+        sin = np.sin(theta)
+        F = np.empty((len(X), m))
+        for i in range(m):
+            # f_i = (1 + g) * cos(theta_0) ... cos(theta_{m-2-i}) * sin(theta_{m-1-i}).
+            f = np.prod(cos[:, : m - 1 - i], axis=1)
+            if i > 0:
+                f = f * sin[:, m - 1 - i]
+            F[:, i] = (1.0 + g) * f
+        return F
+
+    def pareto_front(self, n_points: int) -> np.ndarray:
+        rng = np.random.default_rng(0)
+        F = np.abs(rng.normal(size=(n_points, self._n_objectives)))
+        return F / np.linalg.norm(F, axis=1, keepdims=True)
+
+
+class C2DTLZ2(ConstrainedMixin, DTLZ2):
+    """C2-DTLZ2 function, a constrained variant of :class:`DTLZ2`.
+
+    Only the regions of the objective space close to the corners and the center of the Pareto
+    front of :class:`DTLZ2` are feasible. The constraint is considered feasible if less than or
+    equal to zero.
+
+    Args:
+        dim: The number of variables. It must be at least ``n_objectives``.
+        n_objectives: The number of objectives.
+    """
+
+    def __init__(self, dim: int = 12, n_objectives: int = 3) -> None:
+        super().__init__(dim, n_objectives)
+        self._r = 0.4 if n_objectives == 3 else 0.5
+
+    def evaluate_constraints(self, params: dict[str, Any]) -> Sequence[float]:
+        return self.evaluate_constraints_batch([params])[0].tolist()
+
+    def evaluate_with_constraints(
+        self, params: dict[str, Any]
+    ) -> tuple[float | Sequence[float], Sequence[float]]:
+        F = self.evaluate_batch(self.params_to_array([params]))
+        return F[0].tolist(), self._constraints(F)[0].tolist()
+
+    def evaluate_constraints_batch(self, params: _BatchParams) -> np.ndarray:
+        return self._constraints(self.evaluate_batch(self.params_to_array(params)))
+
+    def _constraints(self, F: np.ndarray) -> np.ndarray:
+        r2 = self._r**2
+        sq = F**2
+        corners = (F - 1.0) ** 2 + (np.sum(sq, axis=1, keepdims=True) - sq) - r2
+        center = np.sum((F - 1.0 / math.sqrt(self._n_objectives)) ** 2, axis=1) - r2
+        return np.minimum(np.min(corners, axis=1), center)[:, None]
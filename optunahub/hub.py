@@ -1,30 +1,51 @@
 from __future__ import annotations
 
+from collections.abc import Callable
+from collections.abc import Sequence
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
 from contextlib import suppress
-import importlib.util
+import fnmatch
+import hashlib
+import importlib
 import json
 import os
 import re
 import shutil
 import sys
 import tempfile
+import threading
 import types
+from typing import Any
+from typing import Literal
 from urllib.parse import urlparse
 from urllib.request import Request
 from urllib.request import urlopen
+import warnings
 
-from git import Repo
 from github import Auth
 from github import Github
 from github.ContentFile import ContentFile
 import optuna.version
 
 import optunahub
+from optunahub import _cache
 from optunahub import _conf
+from optunahub import _git
+from optunahub import _import_hook
+from optunahub import _lockfile
+from optunahub import _requirements
 
 
-# Dummy optunahub_registry module is required to avoid ModuleNotFoundError.
-sys.modules["optunahub_registry"] = types.ModuleType("optunahub_registry")
+_import_hook.install()
+
+# The metadata file of registry packages, which declares the registry packages they depend on.
+_METADATA_FILE = "optunahub.json"
+
+# Heavy assets that are not needed to import registry packages, e.g., figures in README.
+_DEFAULT_EXCLUDE = ("*.png", "*.jpg", "*.jpeg", "*.gif", "*.svg", "*.webp", "*.pdf", "*.ipynb")
 
 
 def _report_stats(
@@ -94,6 +115,11 @@ def load_module(
     base_url: str | None = None,
     force_reload: bool = False,
     auth: Auth.Auth | None = None,
+    isolate: bool = False,
+    include: Sequence[str] | None = None,
+    exclude: Sequence[str] | None = None,
+    refresh: Literal["never", "background"] = "never",
+    install_requirements: bool | None = None,
 ) -> types.ModuleType:
     """Import a package from the OptunaHub registry.
     The imported package name is set to ``optunahub_registry.package.<package>``.
@@ -121,57 +147,361 @@ def load_module(
         auth:
             `The authentication object <https://pygithub.readthedocs.io/en/latest/examples/Authentication.html>`__ for the GitHub API.
             It also allows access to access private/internal repositories via the GitHub API.
+        isolate:
+            If :obj:`True`, the package is imported under a namespace specific to the repository
+            and ``ref``, i.e., ``optunahub_registry.<namespace>.package.<package>``, so that
+            multiple refs of the same package can be used side by side in one process.
+            If :obj:`False`, loading another ref of the package replaces the previous one in
+            :data:`sys.modules`.
+        include:
+            The patterns of the files to download in the package directory. If :obj:`None`, all
+            the files are downloaded except for the ones matching ``exclude``. The patterns
+            follow ``.gitignore``: a pattern without ``/`` matches a file or directory name at any
+            depth, a pattern with ``/`` matches the path relative to the package directory, and a
+            pattern ending with ``/`` matches only directories.
+        exclude:
+            The patterns of the files not to download in the package directory. If :obj:`None`,
+            images, PDFs, and notebooks are excluded. Pass an empty list to download everything.
+            The filters are recorded with the cached package, which is downloaded again when
+            loaded with other filters.
+        refresh:
+            The refresh policy of a cached package. If ``"never"``, the cached package is used
+            as is. If ``"background"``, the cached package is returned immediately while a
+            background thread checks whether ``ref`` has moved and, if so, downloads the new
+            commit into the cache for the next load. Commit SHAs are never refreshed.
+        install_requirements:
+            If :obj:`True`, the requirements listed in ``requirements.txt`` in the package
+            directory are installed into a cache directory keyed by their hash, which is
+            prepended to :data:`sys.path`. The installation happens once per set of requirements
+            and is skipped if the current environment satisfies them. If :obj:`None`, it is
+            enabled by setting the environmental variable ``OPTUNAHUB_INSTALL_REQUIREMENTS`` to
+            ``1``.
+
+    If a lockfile is activated by the environmental variable ``OPTUNAHUB_LOCKFILE`` and pins the
+    package at ``ref``, the pinned commit installed by :func:`install_lockfile` is loaded from the
+    cache without network access, and ``force_reload`` and ``refresh`` have no effect.
+
+    A package can declare the registry packages it loads in ``optunahub.json`` in its directory,
+    e.g., ``{"dependencies": ["samplers/foo", "samplers/bar@v1"]}``. The dependencies are looked
+    up in the same repository and at the same ``ref`` unless specified otherwise, and the missing
+    ones are downloaded concurrently before the package is imported, so that the
+    :func:`load_module` calls in the package hit the cache.
 
     Returns:
         The module object of the package.
     """
+    # The arguments are validated before the lockfile overrides some of them.
+    if refresh not in ("never", "background"):
+        raise ValueError(f"`refresh` must be 'never' or 'background', but got {refresh}.")
+    if not isinstance(isolate, bool):
+        raise ValueError(f"`isolate` must be a bool, but got {isolate!r}.")
+    for name, patterns in (("include", include), ("exclude", exclude)):
+        if isinstance(patterns, str) or not all(isinstance(p, str) for p in patterns or []):
+            raise ValueError(f"`{name}` must be a sequence of patterns, but got {patterns!r}.")
+
     registry_root = "package"
     dir_path = f"{registry_root}/{package}"
-    hostname = _extract_hostname(base_url) if base_url else "github.com"
-    if hostname is None:
-        raise ValueError(f"Invalid base URI: {base_url}")
-    cache_dir_prefix = os.path.join(_conf.cache_home(), hostname, repo_owner, repo_name, ref)
+    hostname = _registry_hostname(base_url)
+    locked_commit = _locked_commit(hostname, repo_owner, repo_name, package, ref)
+    # The dependencies are resolved at the requested ref so that the lockfile applies to them.
+    spec = {"repo_owner": repo_owner, "repo_name": repo_name, "ref": ref, "base_url": base_url}
+    if locked_commit is not None:
+        # The package pinned by the active lockfile is loaded from the cache without network use.
+        ref = locked_commit
+        force_reload = False
+        refresh = "never"
+    relative_prefix = os.path.join(hostname, repo_owner, repo_name, ref)
+    cache_roots = _conf.cache_path()
+    cached_root = (
+        None
+        if force_reload
+        else _cache.find_root(cache_roots, os.path.join(relative_prefix, dir_path))
+    )
+    exclude = _DEFAULT_EXCLUDE if exclude is None else exclude
+    if cached_root is not None and locked_commit is None:
+        # The package cached with other filters is downloaded again with the requested ones.
+        filters = _cache.read_filters(os.path.join(cached_root, relative_prefix, dir_path))
+        if filters is not None and filters != _filters(include, exclude):
+            cached_root = None
+    use_cache = cached_root is not None
+
+    if cached_root is not None and _conf.is_cache_promotion():
+        with suppress(OSError):
+            writable_root = _cache.writable_root(cache_roots)
+            if writable_root != cached_root:
+                _cache.copy_package(
+                    os.path.join(cached_root, relative_prefix, dir_path),
+                    os.path.join(writable_root, relative_prefix, dir_path),
+                )
+                cached_root = writable_root
+    if cached_root is not None:
+        cache_dir_prefix = os.path.join(cached_root, relative_prefix)
+    elif locked_commit is not None:
+        raise FileNotFoundError(
+            f"{package} is pinned to {locked_commit} by {_conf.lockfile()} but not in the cache. "
+            "Install the lockfile with `optunahub.install_lockfile` first."
+        )
+    else:
+        cache_dir_prefix = os.path.join(_cache.writable_root(cache_roots), relative_prefix)
     package_cache_dir = os.path.join(cache_dir_prefix, dir_path)
-    use_cache = not force_reload and os.path.exists(package_cache_dir)
 
+    download_kwargs: dict[str, Any] = dict(
+        auth=auth,
+        base_url=base_url,
+        repo_owner=repo_owner,
+        repo_name=repo_name,
+        dir_path=dir_path,
+        ref=ref,
+        cache_dir_prefix=cache_dir_prefix,
+        include=include,
+        exclude=exclude,
+    )
     if not use_cache:
-        if auth is None and shutil.which("git") is not None:
-            _download_via_git(
-                base_url=base_url or "https://github.com",
-                repo_owner=repo_owner,
-                repo_name=repo_name,
-                dir_path=dir_path,
-                ref=ref,
-                cache_dir_prefix=cache_dir_prefix,
-            )
-        else:
-            _download_via_github_api(
-                auth=auth,
-                base_url=base_url or "https://api.github.com",
-                repo_owner=repo_owner,
-                repo_name=repo_name,
-                dir_path=dir_path,
-                ref=ref,
-                cache_dir_prefix=cache_dir_prefix,
-            )
+        _download(**download_kwargs)
+    elif refresh == "background" and not _is_commit_sha(ref):
+        # The new commit is downloaded to the writable cache, which should precede the read-only
+        # ones in `OPTUNAHUB_CACHE_PATH` to take effect.
+        download_kwargs["cache_dir_prefix"] = os.path.join(
+            _cache.writable_root(cache_roots), relative_prefix
+        )
+        _refresh_in_background(package_cache_dir, download_kwargs)
+
+    _prefetch_dependencies(package_cache_dir, spec, auth)
+    if install_requirements is None:
+        install_requirements = _conf.is_requirements_install()
+    if install_requirements:
+        _requirements.activate(package_cache_dir)
 
     local_registry_root = os.path.join(cache_dir_prefix, registry_root)
+    if not isolate:
+        # Let the other processes import the package from the cache, e.g., to unpickle samplers.
+        _import_hook.record_origin(
+            f"optunahub_registry.package.{package.replace('/', '.')}",
+            os.path.realpath(package_cache_dir),
+        )
     module = load_local_module(
         package=package,
         registry_root=local_registry_root,
+        namespace=_ref_namespace(ref, relative_prefix) if isolate else None,
     )
 
     # Statistics are collected only for the official registry.
-    is_official_registry = repo_owner == "optuna" and repo_name == "optunahub-registry"
+    is_official_registry = (
+        hostname in ("github.com", "api.github.com")
+        and repo_owner == "optuna"
+        and repo_name == "optunahub-registry"
+    )
     if not _conf.is_no_analytics() and not use_cache and is_official_registry:
         _report_stats(package, ref)
 
     return module
 
 
+def _download(
+    auth: Auth.Auth | None,
+    base_url: str | None,
+    repo_owner: str,
+    repo_name: str,
+    dir_path: str,
+    ref: str,
+    cache_dir_prefix: str,
+    include: Sequence[str] | None,
+    exclude: Sequence[str],
+) -> None:
+    if auth is None and shutil.which("git") is not None:
+        _download_via_git(
+            base_url=base_url or "https://github.com",
+            repo_owner=repo_owner,
+            repo_name=repo_name,
+            dir_path=dir_path,
+            ref=ref,
+            cache_dir_prefix=cache_dir_prefix,
+            include=include,
+            exclude=exclude,
+        )
+    else:
+        _download_via_github_api(
+            auth=auth,
+            base_url=base_url or "https://api.github.com",
+            repo_owner=repo_owner,
+            repo_name=repo_name,
+            dir_path=dir_path,
+            ref=ref,
+            cache_dir_prefix=cache_dir_prefix,
+            include=include,
+            exclude=exclude,
+        )
+
+
+def _locked_commit(
+    hostname: str, repo_owner: str, repo_name: str, package: str, ref: str
+) -> str | None:
+    for entry in _lockfile.active_entries():
+        if (
+            _registry_hostname(entry["base_url"]),
+            entry["repo_owner"],
+            entry["repo_name"],
+            entry["package"],
+        ) == (
+            hostname,
+            repo_owner,
+            repo_name,
+            package,
+        ) and ref in (entry["ref"], entry["commit"]):
+            return entry["commit"]
+    return None
+
+
+def _read_dependencies(package_cache_dir: str, parent: dict[str, Any]) -> list[dict[str, Any]]:
+    metadata_path = os.path.join(package_cache_dir, _METADATA_FILE)
+    if not os.path.isfile(metadata_path):
+        return []
+    with open(metadata_path) as f:
+        dependencies = json.load(f).get("dependencies", [])
+
+    specs = []
+    for dependency in dependencies:
+        if isinstance(dependency, str):
+            name, _, ref = dependency.partition("@")
+            dependency = {"package": name, **({"ref": ref} if ref else {})}
+        # The dependencies are looked up in the registry and at the ref of the dependent.
+        inherited = {k: parent[k] for k in ("repo_owner", "repo_name", "ref", "base_url")}
+        specs.append(_package_spec({**inherited, **dependency}))
+    return specs
+
+
+def _fetch_dependency(spec: dict[str, Any], auth: Auth.Auth | None) -> str | None:
+    hostname = _registry_hostname(spec["base_url"])
+    args = (spec["repo_owner"], spec["repo_name"], spec["package"], spec["ref"])
+    if _locked_commit(hostname, *args) is not None:
+        # The pinned packages are installed by `install_lockfile`.
+        return None
+
+    relative_prefix = os.path.join(hostname, spec["repo_owner"], spec["repo_name"], spec["ref"])
+    dir_path = f"package/{spec['package']}"
+    cache_roots = _conf.cache_path()
+    cached_root = _cache.find_root(cache_roots, os.path.join(relative_prefix, dir_path))
+    if cached_root is None:
+        cached_root = _cache.writable_root(cache_roots)
+        _download(
+            auth=auth,
+            base_url=spec["base_url"],
+            repo_owner=spec["repo_owner"],
+            repo_name=spec["repo_name"],
+            dir_path=dir_path,
+            ref=spec["ref"],
+            cache_dir_prefix=os.path.join(cached_root, relative_prefix),
+            include=None,
+            exclude=_DEFAULT_EXCLUDE,
+        )
+    return os.path.join(cached_root, relative_prefix, dir_path)
+
+
+def _prefetch_dependencies(
+    package_cache_dir: str, spec: dict[str, Any], auth: Auth.Auth | None
+) -> None:
+    # The dependencies declared in the metadata file are downloaded concurrently, and the
+    # dependencies of each one are submitted as soon as it is available, so that the nested
+    # `load_module` calls in the packages hit the cache.
+    dependencies = _read_dependencies(package_cache_dir, spec)
+    if len(dependencies) == 0:
+        return
+
+    seen: set[tuple[Any, ...]] = set()
+    pending: set[Future[str | None]] = set()
+    specs: dict[Future[str | None], dict[str, Any]] = {}
+    with ThreadPoolExecutor() as executor:
+
+        def submit(dependencies: list[dict[str, Any]]) -> None:
+            for dependency in dependencies:
+                key = tuple(dependency[k] for k in _SPEC_KEYS)
+                if key not in seen:
+                    seen.add(key)
+                    future = executor.submit(_fetch_dependency, dependency, auth)
+                    specs[future] = dependency
+                    pending.add(future)
+
+        submit(dependencies)
+        while len(pending) > 0:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                pending.remove(future)
+                dependency_cache_dir = future.result()
+                if dependency_cache_dir is not None:
+                    submit(_read_dependencies(dependency_cache_dir, specs[future]))
+
+
+def _is_commit_sha(ref: str) -> bool:
+    return re.fullmatch(r"[0-9a-f]{40}", ref) is not None
+
+
+def _latest_commit(
+    auth: Auth.Auth | None, base_url: str | None, repo_owner: str, repo_name: str, ref: str
+) -> str | None:
+    if auth is None and shutil.which("git") is not None:
+        repo_url = _repo_url(base_url or "https://github.com", repo_owner, repo_name)
+        commits = _git.ls_remote(repo_url, ref)
+        # Follow the order in which `git fetch` resolves a ref. Annotated tags are peeled.
+        for name in (ref, f"refs/tags/{ref}^{{}}", f"refs/tags/{ref}", f"refs/heads/{ref}"):
+            if name in commits:
+                return commits[name]
+        return None
+    g = Github(auth=auth, base_url=base_url or "https://api.github.com")  # pragma: no cover
+    return g.get_repo(f"{repo_owner}/{repo_name}").get_commit(ref).sha  # pragma: no cover
+
+
+_refresh_lock = threading.Lock()
+_refresh_threads: dict[str, threading.Thread] = {}
+
+
+def _refresh_in_background(package_cache_dir: str, download_kwargs: dict[str, Any]) -> None:
+    with _refresh_lock:
+        thread = _refresh_threads.get(package_cache_dir)
+        if thread is not None and thread.is_alive():
+            return
+        thread = threading.Thread(
+            target=_refresh, args=(package_cache_dir, download_kwargs), daemon=True
+        )
+        _refresh_threads[package_cache_dir] = thread
+        thread.start()
+
+
+def _refresh(package_cache_dir: str, download_kwargs: dict[str, Any]) -> None:
+    try:
+        latest_commit = _latest_commit(
+            download_kwargs["auth"],
+            download_kwargs["base_url"],
+            download_kwargs["repo_owner"],
+            download_kwargs["repo_name"],
+            download_kwargs["ref"],
+        )
+        if latest_commit is not None and latest_commit != _cache.read_commit(package_cache_dir):
+            _download(**download_kwargs)
+    except Exception as e:
+        warnings.warn(f"Failed to refresh the cached package in {package_cache_dir}: {e}")
+
+
+def _ref_namespace(ref: str, relative_prefix: str) -> str:
+    # The digest tells apart the repositories and the refs sanitized into the same name.
+    digest = hashlib.sha256(relative_prefix.encode()).hexdigest()[:8]
+    sanitized_ref = re.sub(r"\W", "_", ref)
+    return f"ref_{sanitized_ref}_{digest}"
+
+
+def _registry_hostname(base_url: str | None) -> str:
+    hostname = _extract_hostname(base_url) if base_url else "github.com"
+    if hostname is None:
+        raise ValueError(f"Invalid base URI: {base_url}")
+    return hostname
+
+
 def _extract_hostname(url: str) -> str | None:
     if "://" in url:
-        return urlparse(url).hostname
+        parsed = urlparse(url)
+        # A file URI without a host, e.g., "file:///path/to/registry", refers to the local host.
+        if parsed.scheme == "file" and not parsed.hostname:
+            return "localhost"
+        return parsed.hostname
     else:
         # NOTE(kAIto47802) Extract hostname: skip optional user@, capture up to `:`, ignore the rest.
         match = re.match(r"(?:.+@)?([^:]+)(?::.*)?", url)
@@ -185,29 +515,78 @@ def _download_via_git(
     dir_path: str,
     ref: str,
     cache_dir_prefix: str,
+    include: Sequence[str] | None = None,
+    exclude: Sequence[str] = (),
 ) -> None:
-    repo_url_separator = "/" if "://" in base_url else ":"
-    repo_url = f"{base_url.rstrip('/')}{repo_url_separator}{repo_owner}/{repo_name}"
+    repo_url = _repo_url(base_url, repo_owner, repo_name)
+    patterns = _sparse_checkout_patterns(dir_path, include, exclude)
     with tempfile.TemporaryDirectory() as tmpdir:
-        # Initialize a temporary Git repository to perform sparse checkout.
-        repo = Repo.init(tmpdir)
-        origin = (
-            repo.remotes.origin
-            if "origin" in repo.remotes
-            else repo.create_remote("origin", repo_url)
-        )
-        if repo.remotes.origin.url != repo_url:
-            repo.remotes.origin.set_url(repo_url)
-        repo.git.sparse_checkout("init", "--cone")
-        repo.git.sparse_checkout("set", dir_path)
-        origin.fetch(refspec=ref, depth=1)
-        repo.git.checkout("FETCH_HEAD")
+        checkout_dir = os.path.join(tmpdir, "partial")
+        try:
+            # Only the trees of the commit are fetched here, and the blobs under `dir_path` are
+            # fetched on demand by the checkout. Servers that do not support partial clone ignore
+            # the filter and send the whole commit.
+            commit = _git.sparse_checkout(
+                checkout_dir, repo_url, patterns, ref, blob_filter="blob:none"
+            )
+        except _git.GitError as e:
+            # The client git does not support partial clone or the server refused the on-demand
+            # fetch of the blobs. The other errors, e.g., a missing ref, are not retried.
+            if not _git.is_partial_clone_error(e):
+                raise
+            checkout_dir = os.path.join(tmpdir, "full")
+            commit = _git.sparse_checkout(checkout_dir, repo_url, patterns, ref, blob_filter=None)
 
         # Move the downloaded package to the cache directory.
-        package_cache_dir = os.path.join(cache_dir_prefix, dir_path)
-        shutil.rmtree(package_cache_dir, ignore_errors=True)
-        os.makedirs(os.path.dirname(package_cache_dir), exist_ok=True)
-        shutil.move(os.path.join(tmpdir, dir_path), package_cache_dir)
+        _cache.install_package(
+            os.path.join(checkout_dir, dir_path),
+            os.path.join(cache_dir_prefix, dir_path),
+            commit,
+            filters=_filters(include, exclude),
+        )
+
+
+def _repo_url(base_url: str, repo_owner: str, repo_name: str) -> str:
+    repo_url_separator = "/" if "://" in base_url else ":"
+    return f"{base_url.rstrip('/')}{repo_url_separator}{repo_owner}/{repo_name}"
+
+
+def _sparse_checkout_patterns(
+    dir_path: str, include: Sequence[str] | None, exclude: Sequence[str]
+) -> list[str]:
+    def to_git_patterns(pattern: str) -> list[str]:
+        name = pattern.rstrip("/")
+        base = f"/{dir_path}/{name.lstrip('/')}" if "/" in name else f"/{dir_path}/**/{name}"
+        # A later pattern on a directory does not override the earlier patterns on its files,
+        # so the files under the matched directories are listed explicitly.
+        return [f"{base}/**"] if pattern.endswith("/") else [base, f"{base}/**"]
+
+    if include is None:
+        patterns = [f"/{dir_path}/"]
+    else:
+        patterns = [p for pattern in include for p in to_git_patterns(pattern)]
+    return patterns + [f"!{p}" for pattern in exclude for p in to_git_patterns(pattern)]
+
+
+def _match_pattern(path: str, pattern: str) -> bool:
+    # Match a path relative to the package directory as `git sparse-checkout` does.
+    parts = path.split("/")
+    n_parts = len(parts) - 1 if pattern.endswith("/") else len(parts)
+    pattern = pattern.rstrip("/")
+    if "/" in pattern:
+        pattern = pattern.lstrip("/")
+        return any(fnmatch.fnmatchcase("/".join(parts[: i + 1]), pattern) for i in range(n_parts))
+    return any(fnmatch.fnmatchcase(part, pattern) for part in parts[:n_parts])
+
+
+def _filters(include: Sequence[str] | None, exclude: Sequence[str]) -> dict[str, Any]:
+    return {"include": None if include is None else list(include), "exclude": list(exclude)}
+
+
+def _is_selected(path: str, include: Sequence[str] | None, exclude: Sequence[str]) -> bool:
+    if include is not None and not any(_match_pattern(path, p) for p in include):
+        return False
+    return not any(_match_pattern(path, p) for p in exclude)
 
 
 def _download_via_github_api(  # pragma: no cover
@@ -218,11 +597,16 @@ def _download_via_github_api(  # pragma: no cover
     dir_path: str,
     ref: str,
     cache_dir_prefix: str,
+    include: Sequence[str] | None = None,
+    exclude: Sequence[str] = (),
 ) -> None:
     g = Github(auth=auth, base_url=base_url)
     repo = g.get_repo(f"{repo_owner}/{repo_name}")
+    # The contents are read from the resolved commit so that they are consistent with each other
+    # even if the ref moves during the download.
+    commit = repo.get_commit(ref).sha
 
-    package_contents = repo.get_contents(dir_path, ref)
+    package_contents = repo.get_contents(dir_path, commit)
 
     if isinstance(package_contents, ContentFile):
         package_contents = [package_contents]
@@ -232,11 +616,11 @@ def _download_via_github_api(  # pragma: no cover
             file_path = os.path.join(tmpdir, m.path)
             os.makedirs(os.path.dirname(file_path), exist_ok=True)
             if m.type == "dir":
-                dir_contents = repo.get_contents(m.path, ref)
+                dir_contents = repo.get_contents(m.path, commit)
                 if isinstance(dir_contents, ContentFile):
                     dir_contents = [dir_contents]
                 package_contents.extend(dir_contents)
-            else:
+            elif _is_selected(m.path[len(dir_path) + 1 :], include, exclude):
                 with open(file_path, "wb") as f:
                     try:
                         decoded_content = m.decoded_content
@@ -245,16 +629,19 @@ def _download_via_github_api(  # pragma: no cover
                     f.write(decoded_content)
 
         # Move the downloaded package to the cache directory.
-        package_cache_dir = os.path.join(cache_dir_prefix, dir_path)
-        shutil.rmtree(package_cache_dir, ignore_errors=True)
-        os.makedirs(os.path.dirname(package_cache_dir), exist_ok=True)
-        shutil.move(os.path.join(tmpdir, dir_path), package_cache_dir)
+        _cache.install_package(
+            os.path.join(tmpdir, dir_path),
+            os.path.join(cache_dir_prefix, dir_path),
+            commit,
+            filters=_filters(include, exclude),
+        )
 
 
 def load_local_module(
     package: str,
     *,
     registry_root: str = os.sep,
+    namespace: str | None = None,
 ) -> types.ModuleType:
     """Import a package from the local registry.
        The imported package name is set to ``optunahub_registry.package.<package>``.
@@ -266,22 +653,211 @@ def load_local_module(
             The root directory of the registry.
             The default is the root directory of the file system,
             e.g., "/" for UNIX-like systems.
+        namespace:
+            If given, the imported package name is set to
+            ``optunahub_registry.<namespace>.package.<package>`` instead. It must be a valid
+            Python identifier.
 
     Returns:
         The module object of the package.
     """
 
-    module_path = os.path.join(registry_root, package)
-    module_name = f"optunahub_registry.package.{package.replace('/', '.')}"
-    spec = importlib.util.spec_from_file_location(
-        module_name, os.path.join(module_path, "__init__.py")
+    if namespace is not None and not namespace.isidentifier():
+        raise ValueError(f"`namespace` must be a valid Python identifier, but got {namespace}.")
+    # The cached packages are links to their current versions, which are imported from the
+    # resolved directories so that the installation of a new version does not affect them.
+    module_path = os.path.realpath(os.path.join(registry_root, package))
+    module_prefix = (
+        "optunahub_registry" if namespace is None else f"optunahub_registry.{namespace}"
     )
-    if spec is None or spec.loader is None:
-        raise ImportError(f"Module {module_name} not found in {module_path}")
-    module = importlib.util.module_from_spec(spec)
-    if module is None:
+    module_name = f"{module_prefix}.package.{package.replace('/', '.')}"
+    if not os.path.isfile(os.path.join(module_path, "__init__.py")):
         raise ImportError(f"Module {module_name} not found in {module_path}")
-    sys.modules[module_name] = module
-    spec.loader.exec_module(module)
 
-    return module
+    # Drop the modules imported by the previous load so that the package and its submodules
+    # are imported from ``module_path``.
+    for name in [n for n in sys.modules if n == module_name or n.startswith(f"{module_name}.")]:
+        del sys.modules[name]
+    _import_hook.register(module_name, module_path)
+    return importlib.import_module(module_name)
+
+
+class _WorkerInitializer:
+    def __init__(self, packages: list[tuple[str, str]]) -> None:
+        self._packages = packages
+
+    def __call__(self) -> None:
+        for module_name, module_path in self._packages:
+            _import_hook.register(module_name, module_path)
+            importlib.import_module(module_name)
+
+
+def worker_initializer(packages: Sequence[str | types.ModuleType]) -> Callable[[], None]:
+    """Return an initializer that preloads registry packages in worker processes.
+
+    The returned callable is meant to be passed as the ``initializer`` of
+    :class:`concurrent.futures.ProcessPoolExecutor` or :class:`multiprocessing.pool.Pool`.
+    The packages are resolved in the calling process, and each worker imports them from the
+    same cache directories without checking or updating the cache. The samplers defined in the
+    packages can then be pickled by reference and sent to the workers. Without the initializer,
+    only the packages last loaded by :func:`load_module` from the official registry are imported
+    from the cache, and only in processes that import optunahub.
+
+    .. code-block:: python
+
+        module = optunahub.load_module("samplers/simulated_annealing")
+        with ProcessPoolExecutor(initializer=optunahub.worker_initializer([module])) as executor:
+            ...
+
+    Args:
+        packages:
+            The packages to preload. Each element is a module returned by :func:`load_module` or
+            :func:`load_local_module`, or a package name of the official registry, which is
+            loaded with :func:`load_module` in the calling process.
+
+    Returns:
+        A picklable callable without arguments.
+    """
+    resolved = []
+    for package in packages:
+        module = load_module(package) if isinstance(package, str) else package
+        path = getattr(module, "__path__", None)
+        if not module.__name__.startswith("optunahub_registry.") or path is None:
+            raise ValueError(f"{module.__name__} is not a package loaded from a registry.")
+        resolved.append((module.__name__, path[0]))
+    return _WorkerInitializer(resolved)
+
+
+_SPEC_KEYS = ("package", "repo_owner", "repo_name", "ref", "base_url")
+
+
+def _package_spec(package: str | dict[str, Any]) -> dict[str, Any]:
+    if isinstance(package, str):
+        name, _, ref = package.partition("@")
+        package = {"package": name, "ref": ref or "main"}
+    unknown_keys = set(package) - set(_SPEC_KEYS)
+    if len(unknown_keys) > 0:
+        raise ValueError(f"Unknown keys in the package specification: {sorted(unknown_keys)}.")
+    return {
+        "package": package["package"],
+        "repo_owner": package.get("repo_owner", "optuna"),
+        "repo_name": package.get("repo_name", "optunahub-registry"),
+        "ref": package.get("ref", "main"),
+        "base_url": package.get("base_url"),
+    }
+
+
+def _download_locked_package(entry: dict[str, Any], ref: str, tmpdir: str) -> str:
+    dir_path = f"package/{entry['package']}"
+    _download(
+        auth=None,
+        base_url=entry["base_url"],
+        repo_owner=entry["repo_owner"],
+        repo_name=entry["repo_name"],
+        dir_path=dir_path,
+        ref=ref,
+        cache_dir_prefix=tmpdir,
+        include=None,
+        exclude=_DEFAULT_EXCLUDE,
+    )
+    return os.path.join(tmpdir, dir_path)
+
+
+def _locked_package_cache_dir(entry: dict[str, Any], cache_root: str) -> str:
+    return os.path.join(
+        cache_root,
+        _registry_hostname(entry["base_url"]),
+        entry["repo_owner"],
+        entry["repo_name"],
+        entry["commit"],
+        "package",
+        entry["package"],
+    )
+
+
+def _lock_package(spec: dict[str, Any]) -> dict[str, Any]:
+    with tempfile.TemporaryDirectory() as tmpdir:
+        package_dir = _download_locked_package(spec, spec["ref"], tmpdir)
+        commit = _cache.read_commit(package_dir)
+        if commit is None:
+            raise RuntimeError(f"Failed to resolve the commit of {spec['package']}.")
+        entry = {**spec, "commit": commit, "files": _lockfile.hash_package(package_dir)}
+        # Keep the downloaded package so that the locking node does not download it again.
+        cache_root = _cache.writable_root(_conf.cache_path())
+        _cache.install_package(
+            package_dir,
+            _locked_package_cache_dir(entry, cache_root),
+            commit,
+            filters=_cache.read_filters(package_dir),
+        )
+    return entry
+
+
+def _install_locked_package(entry: dict[str, Any]) -> None:
+    cache_roots = _conf.cache_path()
+    for cache_root in cache_roots:
+        package_cache_dir = _locked_package_cache_dir(entry, cache_root)
+        if os.path.isdir(package_cache_dir):
+            if _lockfile.hash_package(package_cache_dir) == entry["files"]:
+                return
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        package_dir = _download_locked_package(entry, entry["commit"], tmpdir)
+        if _lockfile.hash_package(package_dir) != entry["files"]:
+            raise ValueError(
+                f"The files of {entry['package']} at {entry['commit']} do not match the lockfile."
+            )
+        cache_root = _cache.writable_root(cache_roots)
+        _cache.install_package(
+            package_dir,
+            _locked_package_cache_dir(entry, cache_root),
+            entry["commit"],
+            filters=_cache.read_filters(package_dir),
+        )
+
+
+def create_lockfile(
+    packages: Sequence[str | dict[str, Any]],
+    path: str,
+    *,
+    max_workers: int | None = None,
+) -> None:
+    """Pin registry packages to commits and content hashes in a lockfile.
+
+    The packages are downloaded in parallel, and the lockfile records the commit SHA each ``ref``
+    resolves to and the SHA-256 digest of each file. The downloaded packages are kept in the
+    cache, so the lockfile is already installed on the calling node.
+
+    Args:
+        packages:
+            The packages to pin. Each element is a package name optionally followed by ``@`` and
+            a ref, e.g., ``"samplers/auto_sampler@main"``, or a dictionary with the key
+            ``"package"`` and optionally ``"repo_owner"``, ``"repo_name"``, ``"ref"``, and
+            ``"base_url"``, which are interpreted as the arguments of :func:`load_module`.
+        path:
+            The path to write the lockfile to.
+        max_workers:
+            The maximum number of concurrent downloads.
+    """
+    specs = [_package_spec(p) for p in packages]
+    with ThreadPoolExecutor(max_workers) as executor:
+        entries = list(executor.map(_lock_package, specs))
+    _lockfile.write(path, entries)
+
+
+def install_lockfile(path: str, *, max_workers: int | None = None) -> None:
+    """Install the packages pinned by a lockfile into the cache.
+
+    The packages missing from the caches are downloaded in parallel and verified against the
+    content hashes in the lockfile. Set the environmental variable ``OPTUNAHUB_LOCKFILE`` to the
+    lockfile to let :func:`load_module` load the pinned commits without network access.
+
+    Args:
+        path:
+            The path to the lockfile created by :func:`create_lockfile`.
+        max_workers:
+            The maximum number of concurrent downloads.
+    """
+    entries = _lockfile.read(path)
+    with ThreadPoolExecutor(max_workers) as executor:
+        list(executor.map(_install_locked_package, entries))
@@ -1,4 +1,18 @@
+from optunahub.samplers._history import TrialHistory
+from optunahub.samplers._profiler import SamplerCallStats
+from optunahub.samplers._profiler import SamplerProfiler
+from optunahub.samplers._server import RemoteSampler
+from optunahub.samplers._server import SamplerServer
 from optunahub.samplers._simple_base import SimpleBaseSampler
+from optunahub.samplers._transform import SearchSpaceEncoder
 
 
-__all__ = ["SimpleBaseSampler"]
+__all__ = [
+    "RemoteSampler",
+    "SamplerCallStats",
+    "SamplerProfiler",
+    "SamplerServer",
+    "SearchSpaceEncoder",
+    "SimpleBaseSampler",
+    "TrialHistory",
+]
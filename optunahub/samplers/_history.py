@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import threading
+
+import numpy as np
+from optuna import Study
+from optuna.distributions import BaseDistribution
+from optuna.trial import FrozenTrial
+from optuna.trial import TrialState
+
+from optunahub.samplers._search_space import _NewTrialTracker
+from optunahub.samplers._transform import _capacity
+from optunahub.samplers._transform import SearchSpaceEncoder
+
+
+class TrialHistory:
+    """Append-only snapshot of the completed trials of a study.
+
+    Each call of :meth:`update` reads only the trials finished since the previous call from the
+    storage and appends the completed ones to the snapshot. The objective values and the encoded
+    parameters are kept in arrays that grow geometrically, so the cost of keeping the snapshot up
+    to date is proportional to the number of new trials rather than to the size of the study.
+
+    Instances are created and updated by :meth:`SimpleBaseSampler.get_trial_history`.
+    The methods of this class can be called from multiple threads. Rows are only appended, so
+    the rows of the arrays returned to a thread are not modified by the updates of other threads.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._tracker = _NewTrialTracker()
+        self._trials: list[FrozenTrial] = []
+        self._values = np.empty((0, 0), dtype=np.float64)
+        self._encoder: SearchSpaceEncoder | None = None
+        self._params = np.empty((0, 0), dtype=np.float64)
+        self._n_encoded = 0
+
+    def update(self, study: Study) -> None:
+        """Append the trials completed since the previous call.
+
+        Args:
+            study: The study. The same study must be passed through the lifetime of the instance.
+        """
+        with self._lock:
+            self._update(study)
+
+    def _update(self, study: Study) -> None:
+        new_trials = [t for t in self._tracker.fetch(study) if t.state == TrialState.COMPLETE]
+        if len(new_trials) == 0:
+            return
+
+        n_old = len(self._trials)
+        n = n_old + len(new_trials)
+        if len(self._values) < n:
+            values = np.empty((_capacity(n), len(study.directions)), dtype=np.float64)
+            if n_old > 0:
+                values[:n_old] = self._values[:n_old]
+            self._values = values
+        self._values[n_old:n] = [t.values for t in new_trials]
+        self._trials.extend(new_trials)
+
+    @property
+    def trials(self) -> list[FrozenTrial]:
+        """Return the completed trials in the order they were observed.
+
+        The returned list is a copy taken under the lock, so it is not extended by the updates
+        of other threads while the caller iterates it.
+        """
+        with self._lock:
+            return self._trials[:]
+
+    @property
+    def values(self) -> np.ndarray:
+        """Return the objective values as an array of shape ``(n_trials, n_objectives)``.
+
+        The returned array is a view of the snapshot and must not be modified.
+        """
+        with self._lock:
+            return self._values[: len(self._trials)]
+
+    def snapshot(
+        self, search_space: dict[str, BaseDistribution] | None = None
+    ) -> tuple[list[FrozenTrial], np.ndarray, np.ndarray | None]:
+        """Return the trials, the objective values, and the parameters taken at the same time.
+
+        :attr:`trials`, :attr:`values`, and :meth:`params` may observe different numbers of
+        trials if another thread updates the history between the calls, while the rows returned
+        by this method always correspond to each other.
+
+        Args:
+            search_space:
+                The search space to encode the parameters with. If :obj:`None`, the parameters
+                are not encoded.
+        Returns:
+            A tuple of a copy of :attr:`trials`, :attr:`values`, and the result of :meth:`params`
+            or :obj:`None`.
+        """
+        with self._lock:
+            params = None if search_space is None else self._params_locked(search_space)
+            return self._trials[:], self._values[: len(self._trials)], params
+
+    def params(self, search_space: dict[str, BaseDistribution]) -> np.ndarray:
+        """Return the parameters encoded by :class:`SearchSpaceEncoder`.
+
+        Only the trials appended since the previous call are encoded unless the search space
+        has changed.
+
+        Args:
+            search_space: The search space to encode.
+        Returns:
+            An array of shape ``(n_trials, d)``, which is a view of the snapshot and must not be
+            modified.
+        """
+        with self._lock:
+            return self._params_locked(search_space)
+
+    def _params_locked(self, search_space: dict[str, BaseDistribution]) -> np.ndarray:
+        if self._encoder is None or self._encoder.search_space != search_space:
+            self._encoder = SearchSpaceEncoder(search_space)
+            self._params = np.empty((0, len(self._encoder.bounds)), dtype=np.float64)
+            self._n_encoded = 0
+
+        n = len(self._trials)
+        if len(self._params) < n:
+            params = np.empty((_capacity(n), self._params.shape[1]), dtype=np.float64)
+            params[: self._n_encoded] = self._params[: self._n_encoded]
+            self._params = params
+        self._encoder._encode_into(
+            self._params[self._n_encoded : n], [t.params for t in self._trials[self._n_encoded :]]
+        )
+        self._n_encoded = n
+        return self._params[:n]
+
+    @property
+    def encoder(self) -> SearchSpaceEncoder | None:
+        """Return the encoder used by the last :meth:`params` call."""
+        return self._encoder
+
+    def __len__(self) -> int:
+        return len(self._trials)
@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+import math
+import threading
+import time
+from typing import Any
+from typing import NamedTuple
+
+import numpy as np
+from optuna import Study
+from optuna.distributions import BaseDistribution
+from optuna.samplers import BaseSampler
+from optuna.trial import FrozenTrial
+from optuna.trial import TrialState
+
+
+_PROFILE_ATTR_KEY = "optunahub:sampler_profile"
+_PROFILED_METHODS = ("infer_relative_search_space", "sample_relative", "sample_independent")
+
+
+class SamplerCallStats(NamedTuple):
+    """Latency statistics of a single sampler method.
+
+    Attributes:
+        n_calls:
+            The number of calls.
+        total:
+            The total elapsed time in seconds.
+        mean:
+            The mean elapsed time per call in seconds.
+        p50:
+            The median elapsed time per call in seconds.
+        p95:
+            The 95th percentile of the elapsed time per call in seconds.
+        max:
+            The maximum elapsed time per call in seconds.
+        growth:
+            The exponent ``k`` of the fitted model ``latency ~ n_trials ** k``.
+            ``k`` close to ``1`` means that the per-trial cost grows linearly with the number of
+            trials, i.e., the cost of the whole study grows quadratically.
+            :obj:`math.nan` if there are not enough calls to fit the model.
+    """
+
+    n_calls: int
+    total: float
+    mean: float
+    p50: float
+    p95: float
+    max: float
+    growth: float
+
+
+class SamplerProfiler(BaseSampler):
+    """Sampler wrapper to measure the overhead of another sampler.
+
+    This class delegates all the calls to the wrapped sampler and records the elapsed time of
+    :meth:`~optuna.samplers.BaseSampler.infer_relative_search_space`,
+    :meth:`~optuna.samplers.BaseSampler.sample_relative`, and
+    :meth:`~optuna.samplers.BaseSampler.sample_independent` together with the trial number.
+    The recorded latencies are kept in memory and can be inspected via :meth:`get_stats` and
+    :meth:`summary`. Optionally, the per-trial total of each method is also stored in the trial
+    system attributes under the ``"optunahub:sampler_profile"`` key.
+
+    Example:
+        ::
+
+            import optuna
+            import optunahub
+
+            sampler = optunahub.samplers.SamplerProfiler(optuna.samplers.TPESampler())
+            study = optuna.create_study(sampler=sampler)
+            study.optimize(lambda t: t.suggest_float("x", -1, 1) ** 2, n_trials=100)
+            print(sampler.summary())
+
+    Args:
+        sampler:
+            The sampler to be profiled.
+        store_in_trial:
+            If :obj:`True`, the per-trial elapsed time of each method is stored in the trial
+            system attributes.
+    """
+
+    def __init__(self, sampler: BaseSampler, *, store_in_trial: bool = False) -> None:
+        self._sampler = sampler
+        self._store_in_trial = store_in_trial
+        self._lock = threading.Lock()
+        self._records: dict[str, list[tuple[int, float]]] = {m: [] for m in _PROFILED_METHODS}
+        self._per_trial: dict[int, dict[str, float]] = {}
+
+    @property
+    def sampler(self) -> BaseSampler:
+        """Return the wrapped sampler."""
+        return self._sampler
+
+    def infer_relative_search_space(
+        self, study: Study, trial: FrozenTrial
+    ) -> dict[str, BaseDistribution]:
+        start = time.perf_counter()
+        search_space = self._sampler.infer_relative_search_space(study, trial)
+        self._record("infer_relative_search_space", trial, time.perf_counter() - start)
+        return search_space
+
+    def sample_relative(
+        self, study: Study, trial: FrozenTrial, search_space: dict[str, BaseDistribution]
+    ) -> dict[str, Any]:
+        start = time.perf_counter()
+        params = self._sampler.sample_relative(study, trial, search_space)
+        self._record("sample_relative", trial, time.perf_counter() - start)
+        return params
+
+    def sample_independent(
+        self,
+        study: Study,
+        trial: FrozenTrial,
+        param_name: str,
+        param_distribution: BaseDistribution,
+    ) -> Any:
+        start = time.perf_counter()
+        value = self._sampler.sample_independent(study, trial, param_name, param_distribution)
+        self._record("sample_independent", trial, time.perf_counter() - start)
+        return value
+
+    def before_trial(self, study: Study, trial: FrozenTrial) -> None:
+        self._sampler.before_trial(study, trial)
+
+    def after_trial(
+        self,
+        study: Study,
+        trial: FrozenTrial,
+        state: TrialState,
+        values: Sequence[float] | None,
+    ) -> None:
+        self._sampler.after_trial(study, trial, state, values)
+        with self._lock:
+            per_trial = self._per_trial.pop(trial.number, None)
+        if self._store_in_trial and per_trial is not None:
+            study._storage.set_trial_system_attr(trial._trial_id, _PROFILE_ATTR_KEY, per_trial)
+
+    def reseed_rng(self) -> None:
+        self._sampler.reseed_rng()
+
+    def reset(self) -> None:
+        """Discard all the recorded latencies."""
+        with self._lock:
+            for records in self._records.values():
+                records.clear()
+            self._per_trial.clear()
+
+    def get_stats(self) -> dict[str, SamplerCallStats]:
+        """Return the latency statistics of each profiled method.
+
+        Returns:
+            A dictionary mapping a method name to its :class:`SamplerCallStats`.
+            Methods that have never been called are omitted.
+        """
+        with self._lock:
+            records = {name: list(r) for name, r in self._records.items() if len(r) > 0}
+
+        stats = {}
+        for name, r in records.items():
+            numbers = np.asarray([number for number, _ in r], dtype=float)
+            elapsed = np.asarray([e for _, e in r], dtype=float)
+            stats[name] = SamplerCallStats(
+                n_calls=len(elapsed),
+                total=float(elapsed.sum()),
+                mean=float(elapsed.mean()),
+                p50=float(np.percentile(elapsed, 50)),
+                p95=float(np.percentile(elapsed, 95)),
+                max=float(elapsed.max()),
+                growth=_fit_growth(numbers, elapsed),
+            )
+        return stats
+
+    def summary(self) -> str:
+        """Return a human-readable report of the latency statistics.
+
+        Returns:
+            A table of the statistics returned by :meth:`get_stats`, one line per method.
+            The times are shown in milliseconds.
+        """
+        header = (
+            f"{'method':<28} {'calls':>8} {'total[ms]':>11} {'mean[ms]':>10} "
+            f"{'p50[ms]':>10} {'p95[ms]':>10} {'max[ms]':>10} {'growth':>7}"
+        )
+        lines = [header]
+        for name, s in self.get_stats().items():
+            lines.append(
+                f"{name:<28} {s.n_calls:>8d} {s.total * 1e3:>11.3f} {s.mean * 1e3:>10.3f} "
+                f"{s.p50 * 1e3:>10.3f} {s.p95 * 1e3:>10.3f} {s.max * 1e3:>10.3f} "
+                f"{s.growth:>7.2f}"
+            )
+        return "\n".join(lines)
+
+    def _record(self, method: str, trial: FrozenTrial, elapsed: float) -> None:
+        with self._lock:
+            self._records[method].append((trial.number, elapsed))
+            per_trial = self._per_trial.setdefault(trial.number, {})
+            per_trial[method] = per_trial.get(method, 0.0) + elapsed
+
+
+def _fit_growth(numbers: np.ndarray, elapsed: np.ndarray) -> float:
+    # Fit ``log(latency) = k * log(n_trials) + c`` by least squares.
+    # The trial number plus one is used as the number of trials seen so far.
+    x = np.log(numbers + 1.0)
+    y = np.log(np.maximum(elapsed, 1e-9))
+    if len(x) < 2 or np.ptp(x) == 0.0:
+        return math.nan
+    k, _ = np.polyfit(x, y, 1)
+    return float(k)
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import threading
+
+from optuna import Study
+from optuna.distributions import BaseDistribution
+from optuna.trial import FrozenTrial
+from optuna.trial import TrialState
+
+
+class _NewTrialTracker:
+    """Return the trials of a study that have finished since the previous call.
+
+    The trials are read in bulk with ``get_all_trials``, which :class:`optuna.storages.RDBStorage`
+    serves incrementally from the cache of :class:`optuna.storages._CachedStorage`, so each call
+    costs one storage round trip. Only the trials after the oldest unfinished one are inspected,
+    so the per-call work is proportional to the number of new or running trials rather than to
+    the number of all trials in the study.
+    """
+
+    def __init__(self) -> None:
+        self._study_id: int | None = None
+        # All the trials before this number are finished and have been returned.
+        self._cursor = 0
+        # The trials after the cursor that have been returned.
+        self._returned: set[int] = set()
+
+    def fetch(self, study: Study) -> list[FrozenTrial]:
+        if self._study_id is None:
+            self._study_id = study._study_id
+        elif self._study_id != study._study_id:
+            raise ValueError(f"{self.__class__.__name__} cannot handle multiple studies.")
+
+        trials = study._storage.get_all_trials(study._study_id, deepcopy=False)
+        finished = []
+        for trial in trials[self._cursor :]:
+            if trial.state.is_finished() and trial.number not in self._returned:
+                finished.append(trial)
+                self._returned.add(trial.number)
+        while self._cursor < len(trials) and trials[self._cursor].state.is_finished():
+            self._returned.discard(trials[self._cursor].number)
+            self._cursor += 1
+        return finished
+
+
+class _IncrementalIntersectionSearchSpace:
+    """Incremental version of :class:`optuna.search_space.IntersectionSearchSpace`.
+
+    Only newly finished trials are read from the storage and intersected with the cached search
+    space, and the cached result is returned as is when no trial has finished since the previous
+    call. The same study must be passed for one instance of this class through its lifetime.
+
+    This class is safe to use from multiple threads. The cached search space is an immutable
+    snapshot replaced atomically after each update, and the update is performed by one thread at
+    a time. A thread that finds another thread updating the snapshot waits for it, and returns
+    the new snapshot without reading the storage again if the update started after the call.
+    Concurrent calls thus share the storage reads, while every call reflects all the trials
+    finished before it.
+
+    Args:
+        include_pruned:
+            Whether pruned trials should be included in the search space.
+    """
+
+    def __init__(self, include_pruned: bool = False) -> None:
+        self._tracker = _NewTrialTracker()
+        self._states = (
+            (TrialState.COMPLETE, TrialState.PRUNED) if include_pruned else (TrialState.COMPLETE,)
+        )
+        self._update_condition = threading.Condition()
+        self._is_updating = False
+        # The numbers of the updates started and finished so far.
+        self._n_started = 0
+        self._n_finished = 0
+        # A pair of the intersection search space and the one without single value
+        # distributions. The dictionaries are never modified after they are published.
+        self._snapshot: tuple[dict[str, BaseDistribution] | None, dict[str, BaseDistribution]] = (
+            None,
+            {},
+        )
+
+    def calculate(self, study: Study, use_cache: bool = False) -> dict[str, BaseDistribution]:
+        """Return the intersection search space sorted by parameter names.
+
+        ``use_cache`` is accepted for compatibility with
+        :meth:`optuna.search_space.IntersectionSearchSpace.calculate` and is ignored.
+        """
+        search_space, _ = self._update(study)
+        return dict(search_space or {})
+
+    def relative_search_space(self, study: Study) -> dict[str, BaseDistribution]:
+        """Return the intersection search space without single value distributions."""
+        _, relative_search_space = self._update(study)
+        return dict(relative_search_space)
+
+    def _update(
+        self, study: Study
+    ) -> tuple[dict[str, BaseDistribution] | None, dict[str, BaseDistribution]]:
+        with self._update_condition:
+            n_started = self._n_started
+            while self._is_updating:
+                self._update_condition.wait()
+            if self._n_finished > n_started:
+                # An update started after this call has read the storage.
+                return self._snapshot
+            self._is_updating = True
+            self._n_started += 1
+            update = self._n_started
+
+        try:
+            search_space = old_search_space = self._snapshot[0]
+            for trial in self._tracker.fetch(study):
+                if trial.state not in self._states:
+                    continue
+                if search_space is None:
+                    search_space = dict(trial.distributions)
+                    continue
+                search_space = {
+                    name: distribution
+                    for name, distribution in search_space.items()
+                    if trial.distributions.get(name) == distribution
+                }
+
+            if search_space is old_search_space or search_space is None:
+                return self._snapshot
+
+            search_space = dict(sorted(search_space.items(), key=lambda x: x[0]))
+            # Single value objects are not sampled with the `sample_relative` method,
+            # but with the `sample_independent` method.
+            relative_search_space = {
+                name: distribution
+                for name, distribution in search_space.items()
+                if not distribution.single()
+            }
+            self._snapshot = (search_space, relative_search_space)
+            return self._snapshot
+        finally:
+            with self._update_condition:
+                self._is_updating = False
+                self._n_finished = update
+                self._update_condition.notify_all()
@@ -0,0 +1,380 @@
+from __future__ import annotations
+
+import copy
+import multiprocessing
+from multiprocessing.connection import Client
+from multiprocessing.connection import Connection
+from multiprocessing.connection import Listener
+import os
+import queue
+import threading
+import traceback
+from typing import Any
+
+import optuna
+from optuna import Study
+from optuna.distributions import BaseDistribution
+from optuna.storages import BaseStorage
+from optuna.trial import FrozenTrial
+
+from optunahub.samplers._simple_base import SimpleBaseSampler
+
+
+# A request is a tuple of the kind and the arguments, and is answered with ``(True, result)`` or
+# ``(False, (exception, traceback))``, where ``traceback`` is the formatted traceback in the server.
+_Request = tuple[Any, ...]
+
+
+class _RemoteTraceback(Exception):
+    """The cause of the exceptions raised by the server, which shows the traceback there."""
+
+    def __init__(self, tb: str) -> None:
+        self.tb = tb
+
+    def __str__(self) -> str:
+        return self.tb
+
+
+class SamplerServer:
+    """Server to share one :class:`SimpleBaseSampler` among the workers of a node.
+
+    The sampler runs in a separate process, and the workers use :class:`RemoteSampler`
+    returned by :meth:`client`, which forwards
+    :meth:`~SimpleBaseSampler.infer_relative_search_space` and
+    :meth:`~SimpleBaseSampler.sample_relative` to the server. Heavy samplers are thus imported and
+    fitted once per node instead of once per worker. The requests arriving while the sampler is
+    busy are answered together, with one :meth:`~SimpleBaseSampler.sample_relative_batch` call if
+    the sampler implements it.
+
+    The server reads the trials from ``storage``, so the workers must optimize studies in the same
+    storage, e.g., an RDB or journal storage, rather than in-memory ones. A copy of the sampler is
+    created for each study.
+
+    Example:
+        ::
+
+            storage = "sqlite:///example.db"
+            with optunahub.samplers.SamplerServer(HeavySampler(), storage) as server:
+                study = optuna.create_study(storage=storage, sampler=server.client())
+                study.optimize(objective, n_trials=100, n_jobs=8)
+
+    Args:
+        sampler:
+            The sampler to serve. It must be picklable.
+        storage:
+            The storage of the studies or its URL.
+        address:
+            The address to listen on, e.g., a path of a Unix domain socket or a ``(host, port)``
+            tuple. If :obj:`None`, a free address is chosen.
+        authkey:
+            The key to authenticate the clients. If :obj:`None`, a random key is generated.
+    """
+
+    def __init__(
+        self,
+        sampler: SimpleBaseSampler,
+        storage: str | BaseStorage,
+        *,
+        address: Any = None,
+        authkey: bytes | None = None,
+    ) -> None:
+        self._sampler = sampler
+        self._storage = storage
+        self._address = address
+        self._authkey = os.urandom(32) if authkey is None else authkey
+        self._process: multiprocessing.process.BaseProcess | None = None
+
+    @property
+    def address(self) -> Any:
+        """Return the address the server listens on."""
+        if self._process is None:
+            raise RuntimeError("The server is not started.")
+        return self._address
+
+    def start(self) -> None:
+        """Start the server process and wait until it accepts connections."""
+        if self._process is not None:
+            raise RuntimeError("The server is already started.")
+        ctx = multiprocessing.get_context("spawn")
+        receiver, sender = ctx.Pipe(duplex=False)
+        process = ctx.Process(
+            target=_serve,
+            args=(self._sampler, self._storage, self._address, self._authkey, sender),
+            daemon=True,
+        )
+        process.start()
+        sender.close()
+        try:
+            self._address = receiver.recv()
+        except EOFError:
+            process.join()
+            raise RuntimeError(f"The server exited with {process.exitcode}.") from None
+        finally:
+            receiver.close()
+        self._process = process
+
+    def shutdown(self) -> None:
+        """Stop the server process."""
+        process = self._process
+        if process is None:
+            return
+        try:
+            with Client(self._address, authkey=self._authkey) as conn:
+                conn.send(("shutdown",))
+        except OSError:
+            pass
+        process.join(timeout=10)
+        if process.is_alive():
+            process.terminate()
+            process.join()
+        self._process = None
+
+    def client(self, seed: int | None = None) -> RemoteSampler:
+        """Return a sampler that forwards the calls to this server.
+
+        Args:
+            seed:
+                The seed of :meth:`~SimpleBaseSampler.sample_independent`, which runs in the
+                worker.
+
+        Returns:
+            A :class:`RemoteSampler`.
+        """
+        return RemoteSampler(self.address, self._authkey, seed=seed)
+
+    def __enter__(self) -> SamplerServer:
+        self.start()
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.shutdown()
+
+
+class RemoteSampler(SimpleBaseSampler):
+    """Sampler that forwards the calls to a :class:`SamplerServer`.
+
+    :meth:`infer_relative_search_space` and :meth:`sample_relative` are computed by the server,
+    and :meth:`~SimpleBaseSampler.sample_independent` is computed in the worker. Each thread
+    opens its own connection so that the concurrent requests are batched by the server. The
+    connections are closed by :meth:`close` or when the sampler is garbage collected. The errors
+    raised in the server are raised again in the worker with the traceback in the server as their
+    cause. Instances can be pickled and sent to the worker processes of the node.
+
+    Args:
+        address:
+            The address of the server.
+        authkey:
+            The key to authenticate with the server.
+        seed:
+            The seed of :meth:`~SimpleBaseSampler.sample_independent`.
+    """
+
+    def __init__(self, address: Any, authkey: bytes, *, seed: int | None = None) -> None:
+        super().__init__(seed=seed)
+        self._address = address
+        self._authkey = authkey
+        self._connections_lock = threading.Lock()
+        self._init_connections()
+
+    def infer_relative_search_space(
+        self, study: Study, trial: FrozenTrial
+    ) -> dict[str, BaseDistribution]:
+        return self._request("infer", study.study_name, trial.number)
+
+    def sample_relative(
+        self,
+        study: Study,
+        trial: FrozenTrial,
+        search_space: dict[str, BaseDistribution],
+    ) -> dict[str, Any]:
+        if search_space == {}:
+            return {}
+        return self._request("sample", study.study_name, trial.number, search_space)
+
+    def close(self) -> None:
+        """Close the connections to the server opened by all the threads.
+
+        The sampler opens new connections if it is used again.
+        """
+        with self._connections_lock:
+            connections = self._connections
+            self._init_connections()
+        for conn in connections:
+            conn.close()
+
+    def _init_connections(self) -> None:
+        # The connections of all the threads are also kept in a list to close them.
+        self._local = threading.local()
+        self._connections: list[Connection] = []
+
+    def _request(self, *request: Any) -> Any:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = Client(self._address, authkey=self._authkey)
+            with self._connections_lock:
+                self._local.conn = conn
+                self._connections.append(conn)
+        conn.send(request)
+        is_ok, result = conn.recv()
+        if not is_ok:
+            error, tb = result
+            raise error from _RemoteTraceback(tb)
+        return result
+
+    def __del__(self) -> None:
+        # The attributes are missing if `__init__` has failed.
+        if hasattr(self, "_connections"):
+            self.close()
+
+    def __getstate__(self) -> dict[str, Any]:
+        state = super().__getstate__()
+        for key in ("_local", "_connections", "_connections_lock"):
+            state.pop(key)
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        super().__setstate__(state)
+        self._connections_lock = threading.Lock()
+        self._init_connections()
+
+
+class _Server:
+    def __init__(self, sampler: SimpleBaseSampler, storage: str | BaseStorage) -> None:
+        self._sampler = sampler
+        self._storage = optuna.storages.get_storage(storage)
+        self._studies: dict[str, Study] = {}
+
+    def _study(self, study_name: str) -> Study:
+        if study_name not in self._studies:
+            # The samplers keep caches of the study, so each study has its own copy.
+            self._studies[study_name] = optuna.load_study(
+                study_name=study_name, storage=self._storage, sampler=copy.deepcopy(self._sampler)
+            )
+        return self._studies[study_name]
+
+    def _trial(self, study: Study, number: int) -> FrozenTrial:
+        study_id = self._storage.get_study_id_from_name(study.study_name)
+        trial_id = self._storage.get_trial_id_from_study_id_trial_number(study_id, number)
+        return self._storage.get_trial(trial_id)
+
+    def handle(self, requests: list[tuple[Connection, _Request]]) -> None:
+        groups: list[tuple[Study, dict[str, BaseDistribution], list[Any]]] = []
+        for conn, request in requests:
+            try:
+                kind, study_name, number, *args = request
+                study = self._study(study_name)
+                trial = self._trial(study, number)
+                if kind == "infer":
+                    sampler = study.sampler
+                    _reply(conn, True, sampler.infer_relative_search_space(study, trial))
+                    continue
+                (search_space,) = args
+                for group_study, group_search_space, members in groups:
+                    if group_study is study and group_search_space == search_space:
+                        members.append((conn, trial))
+                        break
+                else:
+                    groups.append((study, search_space, [(conn, trial)]))
+            except Exception as e:
+                _reply(conn, False, e)
+
+        for study, search_space, members in groups:
+            self._sample(study, search_space, members)
+
+    def _sample(
+        self,
+        study: Study,
+        search_space: dict[str, BaseDistribution],
+        members: list[tuple[Connection, FrozenTrial]],
+    ) -> None:
+        sampler = study.sampler
+        batch: list[dict[str, Any]] = []
+        try:
+            assert isinstance(sampler, SimpleBaseSampler)
+            if len(members) > 1 and sampler._implements_batch():
+                trials = sampler.get_trial_history(study).trials
+                batch = sampler.sample_relative_batch(study, trials, search_space, len(members))
+        except Exception as e:
+            for conn, _ in members:
+                _reply(conn, False, e)
+            return
+
+        for i, (conn, trial) in enumerate(members):
+            try:
+                if i < len(batch):
+                    _reply(conn, True, batch[i])
+                else:
+                    _reply(conn, True, sampler.sample_relative(study, trial, search_space))
+            except Exception as e:
+                _reply(conn, False, e)
+
+
+def _format_exception(e: BaseException) -> str:
+    return "".join(traceback.format_exception(type(e), e, e.__traceback__))
+
+
+def _reply(conn: Connection, is_ok: bool, result: Any, tb: str | None = None) -> None:
+    if not is_ok and tb is None:
+        tb = _format_exception(result)
+    try:
+        # The traceback objects cannot be pickled, so the traceback is sent as text.
+        conn.send((is_ok, result) if is_ok else (is_ok, (result, tb)))
+    except OSError:
+        # The worker has exited.
+        pass
+    except Exception as e:
+        # The result or the exception cannot be pickled, e.g., it holds a lock. Nothing has been
+        # sent yet since the message is pickled before it is written.
+        message = f"{result!r}" if not is_ok else f"Failed to send the result: {e!r}"
+        _reply(conn, False, RuntimeError(message), tb or _format_exception(e))
+
+
+def _receive(conn: Connection, requests: queue.Queue[tuple[Connection, _Request]]) -> None:
+    with conn:
+        while True:
+            try:
+                requests.put((conn, conn.recv()))
+            except (EOFError, OSError):
+                return
+
+
+def _accept(listener: Listener, requests: queue.Queue[tuple[Connection, _Request]]) -> None:
+    while True:
+        try:
+            conn = listener.accept()
+        except multiprocessing.AuthenticationError:
+            continue
+        except OSError:
+            return
+        threading.Thread(target=_receive, args=(conn, requests), daemon=True).start()
+
+
+def _serve(
+    sampler: SimpleBaseSampler,
+    storage: str | BaseStorage,
+    address: Any,
+    authkey: bytes,
+    ready: Connection,
+) -> None:
+    server = _Server(sampler, storage)
+    listener = Listener(address, authkey=authkey)
+    ready.send(listener.address)
+    ready.close()
+
+    requests: queue.Queue[tuple[Connection, _Request]] = queue.Queue()
+    threading.Thread(target=_accept, args=(listener, requests), daemon=True).start()
+    while True:
+        # The requests arriving while the previous ones are processed are handled together.
+        pending = [requests.get()]
+        while True:
+            try:
+                pending.append(requests.get_nowait())
+            except queue.Empty:
+                break
+        others = [(conn, request) for conn, request in pending if request[0] != "shutdown"]
+        # The requests received together with a shutdown are still answered.
+        if len(others) > 0:
+            server.handle(others)
+        if len(others) < len(pending):
+            break
+    listener.close()
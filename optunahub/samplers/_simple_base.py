@@ -1,24 +1,122 @@
 from __future__ import annotations
 
 import abc
+from collections import deque
+from collections.abc import Sequence
+import copy
+import threading
 from typing import Any
+import warnings
+import zlib
 
+import numpy as np
 from optuna import Study
+from optuna._transform import _SearchSpaceTransform
 from optuna.distributions import BaseDistribution
 from optuna.samplers import BaseSampler
 from optuna.samplers import RandomSampler
-from optuna.search_space import IntersectionSearchSpace
 from optuna.trial import FrozenTrial
+from optuna.trial import TrialState
+
+from optunahub.samplers._history import TrialHistory
+from optunahub.samplers._search_space import _IncrementalIntersectionSearchSpace
+
+
+_CACHE_ATTRS = (
+    "_intersection_search_space",
+    "_trial_history",
+    "_batch_lock",
+    "_batch_queue",
+    "_batch_search_space",
+    "_speculation_lock",
+    "_speculation",
+    "_speculation_thread",
+    "_speculation_n_trials",
+)
+
+# The number of the completed trials, the search space, and the proposals of a speculation.
+_Speculation = tuple[int, dict[str, BaseDistribution], list[dict[str, Any]]]
 
 
 class SimpleBaseSampler(BaseSampler, abc.ABC):
-    """A simple base class to implement user-defined samplers."""
+    """A simple base class to implement user-defined samplers.
+
+    Subclasses implement :meth:`sample_relative`, which proposes the parameters of one trial.
+    Samplers proposing the parameters of ``batch_size`` trials at once implement
+    :meth:`sample_relative_batch` instead, and delegate :meth:`sample_relative` to
+    :meth:`sample_relative_from_batch`:
+
+    .. code-block:: python
+
+        def sample_relative(self, study, trial, search_space):
+            return self.sample_relative_from_batch(study, trial, search_space)
+
+    The proposals are then queued and handed out to the following trials, including trials
+    running concurrently in other threads, so that one model fit serves ``batch_size`` trials.
+
+    The default implementations are safe to use from multiple threads, e.g., with
+    ``study.optimize(n_jobs>1)``. The inferred search space is shared as an immutable snapshot
+    that is replaced atomically, and each trial samples from its own random number generator
+    returned by :meth:`get_trial_rng`.
+
+    Args:
+        search_space:
+            The search space. If :obj:`None`, it is inferred from the completed trials.
+        seed:
+            The seed for the random number generators. The random number generator of each trial
+            returned by :meth:`get_trial_rng` is derived from this seed and the trial number, so
+            studies with the same seed are reproducible even with ``n_jobs>1`` or distributed
+            workers. The generators are not changed by :meth:`reseed_rng`, which Optuna calls in
+            every worker thread of ``study.optimize(n_jobs>1)``, since that would make the
+            results depend on the number of threads. Unseeded samplers still sample differently
+            in each trial.
+        batch_size:
+            The number of proposals requested from :meth:`sample_relative_batch` at once. The
+            calls of :meth:`sample_relative_batch` are serialized: while one trial refills the
+            queue, the trials asked concurrently wait for its proposals instead of fitting the
+            model by themselves.
+        speculative:
+            If :obj:`True`, :meth:`sample_relative_batch` is called in a background thread as
+            soon as a trial is told to the study, with the told trial appended to ``trials``.
+            The speculative proposals are used by the next trial only if no other trial has
+            completed in the meantime and the search space is unchanged, and are discarded
+            otherwise. Since Optuna samples the relative parameters at the first suggestion of a
+            trial, the model fit only overlaps with the storage update, the next ask, and the
+            work the objective does before its first suggestion. It pays off with ``n_jobs=1``,
+            notably for objectives loading data or building a model before suggesting
+            parameters. With ``n_jobs>1``, the trials of the other threads usually outdate the
+            speculation while they wait for it, so it is slower than the default. This requires
+            :meth:`sample_relative_batch` to be implemented and to read the completed trials from
+            ``trials``. Subclasses overriding :meth:`after_trial` must call
+            ``super().after_trial``.
+
+    .. versionchanged:: 0.5.0
+        The default :meth:`sample_independent` samples from :meth:`get_trial_rng` instead of
+        :class:`optuna.samplers.RandomSampler`, so the parameters sampled with the same seed
+        differ from the previous versions. ``self._random_sampler`` is deprecated, and
+        subclasses should use :meth:`get_trial_rng` instead.
+    """
+
+    _deprecated_random_sampler: RandomSampler | None
 
     def __init__(
-        self, search_space: dict[str, BaseDistribution] | None = None, seed: int | None = None
+        self,
+        search_space: dict[str, BaseDistribution] | None = None,
+        seed: int | None = None,
+        *,
+        batch_size: int = 1,
+        speculative: bool = False,
     ) -> None:
+        if batch_size < 1:
+            raise ValueError(f"`batch_size` must be positive, but got {batch_size}.")
+        if speculative and not self._implements_batch():
+            raise ValueError(
+                "`speculative=True` requires `sample_relative_batch` to be implemented."
+            )
         self.search_space = search_space
         self._seed = seed
+        self._batch_size = batch_size
+        self._speculative = speculative
         self._init_defaults()
 
     def infer_relative_search_space(
@@ -42,8 +140,44 @@ class SimpleBaseSampler(BaseSampler, abc.ABC):
     ) -> dict[str, Any]:
         # This method is required.
         # This method is called at the beginning of each trial in Optuna to sample parameters.
+        # If you implement `sample_relative_batch`, please return
+        # `self.sample_relative_from_batch(study, trial, search_space)` here.
+        raise NotImplementedError
+
+    def sample_relative_batch(
+        self,
+        study: Study,
+        trials: list[FrozenTrial],
+        search_space: dict[str, BaseDistribution],
+        n: int,
+    ) -> list[dict[str, Any]]:
+        # This method is optional.
+        # If you implement this method, it is called by `sample_relative_from_batch` with the
+        # completed trials and must return `n` parameter sets, which are used by the next
+        # `n` trials.
         raise NotImplementedError
 
+    def sample_relative_from_batch(
+        self,
+        study: Study,
+        trial: FrozenTrial,
+        search_space: dict[str, BaseDistribution],
+    ) -> dict[str, Any]:
+        """Return the next proposal of :meth:`sample_relative_batch`.
+
+        The proposals are queued, and :meth:`sample_relative_batch` is called again with the
+        completed trials when the queue is empty or the search space has changed. The refills
+        are serialized by a lock, so the trials asked during a refill wait for it.
+
+        Args:
+            study: The study being optimized.
+            trial: The trial being sampled.
+            search_space: The search space passed to :meth:`sample_relative`.
+        Returns:
+            The parameters of the trial.
+        """
+        return self._default_sample_relative_from_batch(study, trial, search_space)
+
     def sample_independent(
         self,
         study: Study,
@@ -52,27 +186,221 @@ class SimpleBaseSampler(BaseSampler, abc.ABC):
         param_distribution: BaseDistribution,
     ) -> Any:
         # This method is optional.
-        # By default, parameter values are sampled by ``optuna.samplers.RandomSampler``.
+        # By default, parameter values are sampled uniformly in the same way as
+        # ``optuna.samplers.RandomSampler`` from the random number generator of the trial and the
+        # parameter.
         return self._default_sample_independent(study, trial, param_name, param_distribution)
 
+    def after_trial(
+        self,
+        study: Study,
+        trial: FrozenTrial,
+        state: TrialState,
+        values: Sequence[float] | None,
+    ) -> None:
+        # This method is optional.
+        # If you override this method with `speculative=True`, please call `super().after_trial`.
+        self._default_after_trial(study, trial, state, values)
+
     def reseed_rng(self) -> None:
+        # The streams of `get_trial_rng` are fixed for the lifetime of the sampler. Only the
+        # deprecated `self._random_sampler` is reseeded if used.
         self._default_reseed_rng()
 
+    @property
+    def _random_sampler(self) -> RandomSampler:
+        warnings.warn(
+            "`SimpleBaseSampler._random_sampler` is deprecated and will be removed in the future. "
+            "Use `SimpleBaseSampler.get_trial_rng` instead.",
+            FutureWarning,
+            stacklevel=2,
+        )
+        if self._deprecated_random_sampler is None:
+            self._deprecated_random_sampler = RandomSampler(seed=self._seed)
+        return self._deprecated_random_sampler
+
+    @_random_sampler.setter
+    def _random_sampler(self, random_sampler: RandomSampler) -> None:
+        self._deprecated_random_sampler = random_sampler
+
+    def get_trial_history(self, study: Study) -> TrialHistory:
+        """Return the snapshot of the completed trials of the study.
+
+        The snapshot is updated only with the trials finished since the previous call, so this
+        method is cheaper than ``study.get_trials`` when called in every trial on large studies
+        with remote storages.
+
+        Args:
+            study: The study being optimized.
+        Returns:
+            A :class:`TrialHistory` of the completed trials.
+        """
+        self._trial_history.update(study)
+        return self._trial_history
+
+    def get_trial_rng(self, trial: FrozenTrial, *keys: str) -> np.random.Generator:
+        """Return the random number generator dedicated to a trial.
+
+        The generator is derived from the seed of the sampler and the trial number via
+        :class:`numpy.random.SeedSequence`, so its stream does not depend on the order in which
+        trials are sampled by threads or processes. Each call returns a new generator starting
+        from the beginning of the stream.
+
+        Args:
+            trial: The trial being sampled.
+            keys: Optional names to derive independent streams within the trial.
+        Returns:
+            A :class:`numpy.random.Generator`.
+        """
+        spawn_key = (trial.number, *(zlib.crc32(k.encode()) for k in keys))
+        return np.random.default_rng(np.random.SeedSequence(self._entropy, spawn_key=spawn_key))
+
+    def __getstate__(self) -> dict[str, Any]:
+        # The caches hold locks, which cannot be pickled, and are rebuilt from the study after
+        # unpickling, e.g., in a worker process.
+        state = self.__dict__.copy()
+        for key in _CACHE_ATTRS:
+            state.pop(key, None)
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        # The samplers pickled by the previous versions hold the random sampler directly.
+        state.setdefault("_deprecated_random_sampler", state.pop("_random_sampler", None))
+        self.__dict__.update(state)
+        self._init_caches()
+
     def _init_defaults(self) -> None:
-        self._intersection_search_space = IntersectionSearchSpace()
-        self._random_sampler = RandomSampler(seed=self._seed)
+        # Created on the first use of the deprecated `self._random_sampler`.
+        self._deprecated_random_sampler = None
+        # The entropy is fixed for the lifetime of the sampler and not changed by `reseed_rng`,
+        # which is called by every thread of `study.optimize(n_jobs>1)`. Unseeded samplers still
+        # draw different streams per trial since the trial number is a part of the spawn key.
+        self._entropy = np.random.SeedSequence(self._seed).entropy
+        self._init_caches()
+
+    def _init_caches(self) -> None:
+        self._intersection_search_space = _IncrementalIntersectionSearchSpace()
+        self._trial_history = TrialHistory()
+        self._batch_lock = threading.Lock()
+        self._batch_queue: deque[dict[str, Any]] = deque()
+        self._batch_search_space: dict[str, BaseDistribution] | None = None
+        self._speculation_lock = threading.Lock()
+        self._speculation: _Speculation | None = None
+        self._speculation_thread: threading.Thread | None = None
+        self._speculation_n_trials = -1
+
+    def _implements_batch(self) -> bool:
+        return type(self).sample_relative_batch is not SimpleBaseSampler.sample_relative_batch
 
     def _default_infer_relative_search_space(
         self, study: Study, trial: FrozenTrial
     ) -> dict[str, BaseDistribution]:
-        search_space: dict[str, BaseDistribution] = {}
-        for name, distribution in self._intersection_search_space.calculate(study).items():
-            if distribution.single():
-                # Single value objects are not sampled with the `sample_relative` method,
-                # but with the `sample_independent` method.
-                continue
-            search_space[name] = distribution
-        return search_space
+        # The intersection search space is updated only with the trials finished since the
+        # previous call, so the per-trial overhead does not grow with the number of trials.
+        return self._intersection_search_space.relative_search_space(study)
+
+    def _default_sample_relative_from_batch(
+        self,
+        study: Study,
+        trial: FrozenTrial,
+        search_space: dict[str, BaseDistribution],
+    ) -> dict[str, Any]:
+        if search_space == {}:
+            return {}
+
+        if self._speculative:
+            n_trials = len(self.get_trial_history(study))
+            self._wait_for_speculation(n_trials)
+
+        # The lock is held while `sample_relative_batch` runs so that the trials asked
+        # concurrently wait for the proposals instead of fitting the model by themselves.
+        with self._batch_lock:
+            is_speculated = False
+            if self._speculative:
+                is_speculated = self._take_speculation(n_trials, search_space)
+            if not is_speculated and (
+                len(self._batch_queue) == 0 or self._batch_search_space != search_space
+            ):
+                trials = self.get_trial_history(study).trials
+                batch = self.sample_relative_batch(study, trials, search_space, self._batch_size)
+                if len(batch) == 0:
+                    raise ValueError("`sample_relative_batch` must return at least one proposal.")
+                self._batch_queue = deque(batch)
+                self._batch_search_space = search_space
+            return self._batch_queue.popleft()
+
+    def _wait_for_speculation(self, n_trials: int) -> None:
+        with self._speculation_lock:
+            thread = self._speculation_thread
+            is_latest = self._speculation_n_trials == n_trials
+        # Waiting for the speculation on the latest trials is never slower than starting over.
+        if thread is not None and is_latest:
+            thread.join()
+
+    def _take_speculation(self, n_trials: int, search_space: dict[str, BaseDistribution]) -> bool:
+        # The speculation is compared with the trials completed when the sampling started, so
+        # that it is not discarded because of the trials completed while waiting for it.
+        with self._speculation_lock:
+            speculation = self._speculation
+            self._speculation = None
+        if speculation is None:
+            return False
+        speculative_n_trials, speculative_search_space, batch = speculation
+        if speculative_n_trials != n_trials or speculative_search_space != search_space:
+            return False
+        self._batch_queue = deque(batch)
+        self._batch_search_space = search_space
+        return True
+
+    def _default_after_trial(
+        self,
+        study: Study,
+        trial: FrozenTrial,
+        state: TrialState,
+        values: Sequence[float] | None,
+    ) -> None:
+        search_space = self._batch_search_space
+        if not self._speculative or state != TrialState.COMPLETE or search_space is None:
+            return
+
+        # The trial is not in the storage yet, so it is appended to the history by hand.
+        told_trial = copy.copy(trial)
+        told_trial.state = state
+        told_trial.values = values
+        n_before = len(self.get_trial_history(study))
+        with self._speculation_lock:
+            if self._speculation_thread is not None and self._speculation_thread.is_alive():
+                return
+            self._speculation_n_trials = n_before + 1
+            self._speculation_thread = threading.Thread(
+                target=self._speculate,
+                args=(study, told_trial, n_before, search_space),
+                daemon=True,
+            )
+            self._speculation_thread.start()
+
+    def _speculate(
+        self,
+        study: Study,
+        told_trial: FrozenTrial,
+        n_before: int,
+        search_space: dict[str, BaseDistribution],
+    ) -> None:
+        # The batch lock keeps `sample_relative_batch` from running concurrently with the fit of
+        # another trial. The sampling waits for the speculation outside of this lock.
+        with self._batch_lock:
+            # `trials` is a copy, so appending the told trial does not change the history.
+            trials = self.get_trial_history(study).trials
+            if all(t.number != told_trial.number for t in trials[n_before:]):
+                trials.append(told_trial)
+            try:
+                batch = self.sample_relative_batch(study, trials, search_space, self._batch_size)
+            except Exception:
+                # The error is raised again when the next trial calls `sample_relative_batch`.
+                return
+        if len(batch) > 0:
+            with self._speculation_lock:
+                self._speculation = (len(trials), search_space, batch)
 
     def _default_sample_independent(
         self,
@@ -86,9 +414,11 @@ class SimpleBaseSampler(BaseSampler, abc.ABC):
         # 2. A parameter to mutate.
         # 3. A parameter excluded from the intersection search space.
 
-        return self._random_sampler.sample_independent(
-            study, trial, param_name, param_distribution
-        )
+        trans = _SearchSpaceTransform({param_name: param_distribution})
+        rng = self.get_trial_rng(trial, param_name)
+        trans_params = rng.uniform(trans.bounds[:, 0], trans.bounds[:, 1])
+        return trans.untransform(trans_params)[param_name]
 
     def _default_reseed_rng(self) -> None:
-        self._random_sampler.reseed_rng()
+        if self._deprecated_random_sampler is not None:
+            self._deprecated_random_sampler.reseed_rng()
@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+import math
+from typing import Any
+
+import numpy as np
+from optuna.distributions import BaseDistribution
+from optuna.distributions import CategoricalDistribution
+from optuna.distributions import FloatDistribution
+from optuna.distributions import IntDistribution
+from optuna.study import StudyDirection
+from optuna.trial import FrozenTrial
+
+
+# Placeholder for the parameters not suggested in a trial.
+_MISSING = object()
+
+
+class SearchSpaceEncoder:
+    """Conversion between parameter dictionaries and numerical arrays.
+
+    Each parameter is encoded into one or more columns of a float64 matrix as follows:
+
+    - :class:`~optuna.distributions.FloatDistribution` and
+      :class:`~optuna.distributions.IntDistribution` are encoded into one column.
+      The value is log-transformed if ``log=True``.
+    - :class:`~optuna.distributions.CategoricalDistribution` is one-hot encoded into
+      ``len(choices)`` columns.
+
+    Parameters missing in a trial are encoded as :obj:`numpy.nan`.
+    The buffers of :meth:`encode_trials` are reused between calls, so encoding the history
+    every trial does not allocate a new matrix every time.
+
+    Example:
+        ::
+
+            def sample_relative(self, study, trial, search_space):
+                encoder = optunahub.samplers.SearchSpaceEncoder(search_space)
+                trials = study.get_trials(deepcopy=False, states=(TrialState.COMPLETE,))
+                X, Y = encoder.encode_trials(trials, study.directions)
+                x_next = ...  # Compute the next point in the encoded space.
+                return encoder.decode(x_next)
+
+    Args:
+        search_space:
+            The search space to encode.
+    """
+
+    def __init__(self, search_space: dict[str, BaseDistribution]) -> None:
+        self._search_space = dict(search_space)
+        self._columns: dict[str, slice] = {}
+        self._choice_indices: dict[str, dict[Any, int]] = {}
+        lows: list[float] = []
+        highs: list[float] = []
+        for name, dist in self._search_space.items():
+            start = len(lows)
+            if isinstance(dist, CategoricalDistribution):
+                lows.extend([0.0] * len(dist.choices))
+                highs.extend([1.0] * len(dist.choices))
+                self._choice_indices[name] = _choice_indices(dist.choices)
+            elif isinstance(dist, (FloatDistribution, IntDistribution)):
+                if dist.log:
+                    lows.append(math.log(dist.low))
+                    highs.append(math.log(dist.high))
+                else:
+                    lows.append(float(dist.low))
+                    highs.append(float(dist.high))
+            else:
+                raise NotImplementedError(f"{dist} is not supported.")
+            self._columns[name] = slice(start, len(lows))
+
+        self._bounds = np.column_stack([lows, highs]).astype(np.float64).reshape(-1, 2)
+        self._params_buffer = np.empty((0, len(lows)), dtype=np.float64)
+        self._values_buffer = np.empty((0, 0), dtype=np.float64)
+
+    @property
+    def search_space(self) -> dict[str, BaseDistribution]:
+        """Return the encoded search space."""
+        return self._search_space
+
+    @property
+    def bounds(self) -> np.ndarray:
+        """Return the lower and upper bounds of each column as an array of shape ``(d, 2)``."""
+        return self._bounds
+
+    @property
+    def columns(self) -> dict[str, slice]:
+        """Return the columns of each parameter."""
+        return self._columns
+
+    def encode(self, params: dict[str, Any]) -> np.ndarray:
+        """Encode a parameter dictionary.
+
+        Args:
+            params: Dictionary of parameters.
+        Returns:
+            An array of shape ``(d,)``.
+        """
+        x = np.empty(len(self._bounds), dtype=np.float64)
+        self._encode_into(x[None, :], [params])
+        return x
+
+    def encode_trials(
+        self,
+        trials: Sequence[FrozenTrial],
+        directions: Sequence[StudyDirection] | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Encode the parameters and the objective values of trials.
+
+        .. note::
+            The returned arrays are views of buffers reused by the next call.
+            Copy them if they need to outlive the next call.
+
+        Args:
+            trials:
+                Trials to encode.
+            directions:
+                The optimization directions. If specified, the objective values of the
+                maximization directions are negated so that lower is always better.
+        Returns:
+            A tuple of the parameter matrix of shape ``(n, d)`` and the objective value matrix of
+            shape ``(n, n_objectives)``. The objective values of trials without values are
+            :obj:`numpy.nan`.
+        """
+        n = len(trials)
+        n_objectives = len(directions) if directions is not None else _n_objectives(trials)
+        if len(self._params_buffer) < n:
+            self._params_buffer = np.empty((_capacity(n), len(self._bounds)), dtype=np.float64)
+        if len(self._values_buffer) < n or self._values_buffer.shape[1] != n_objectives:
+            self._values_buffer = np.empty((_capacity(n), n_objectives), dtype=np.float64)
+
+        X = self._params_buffer[:n]
+        self._encode_into(X, [t.params for t in trials])
+
+        Y = self._values_buffer[:n]
+        Y[:] = [t.values if t.values is not None else [np.nan] * n_objectives for t in trials]
+        if directions is not None:
+            signs = [-1.0 if d == StudyDirection.MAXIMIZE else 1.0 for d in directions]
+            Y *= np.asarray(signs)
+        return X, Y
+
+    def decode(self, x: np.ndarray) -> dict[str, Any]:
+        """Decode an array into a parameter dictionary.
+
+        Args:
+            x: An array of shape ``(d,)``.
+        Returns:
+            Dictionary of parameters. The values are clipped into the bounds and rounded to the
+            steps of the distributions.
+        """
+        return self.decode_batch(np.asarray(x, dtype=np.float64)[None, :])[0]
+
+    def decode_batch(self, X: np.ndarray) -> list[dict[str, Any]]:
+        """Decode a matrix into parameter dictionaries.
+
+        Args:
+            X: An array of shape ``(n, d)``.
+        Returns:
+            A list of ``n`` parameter dictionaries.
+        """
+        X = np.asarray(X, dtype=np.float64)
+        columns: dict[str, list[Any]] = {}
+        for name, dist in self._search_space.items():
+            cols = X[:, self._columns[name]]
+            if isinstance(dist, CategoricalDistribution):
+                indices = np.argmax(cols, axis=1)
+                columns[name] = [dist.choices[i] for i in indices.tolist()]
+                continue
+
+            assert isinstance(dist, (FloatDistribution, IntDistribution))
+            bounds = self._bounds[self._columns[name]][0]
+            v = np.clip(cols[:, 0], bounds[0], bounds[1])
+            if dist.log:
+                v = np.exp(v)
+            if dist.step is not None:
+                v = dist.low + np.round((v - dist.low) / dist.step) * dist.step
+            v = np.clip(v, dist.low, dist.high)
+            if isinstance(dist, IntDistribution):
+                columns[name] = np.round(v).astype(np.int64).tolist()
+            else:
+                columns[name] = v.tolist()
+
+        if len(columns) == 0:
+            return [{} for _ in range(len(X))]
+        names = list(columns)
+        return [dict(zip(names, row)) for row in zip(*columns.values())]
+
+    def _encode_into(self, out: np.ndarray, params_list: list[dict[str, Any]]) -> None:
+        for name, dist in self._search_space.items():
+            cols = out[:, self._columns[name]]
+            values = [params.get(name, _MISSING) for params in params_list]
+            if isinstance(dist, CategoricalDistribution):
+                choice_indices = self._choice_indices[name]
+                indices = np.asarray(
+                    [_choice_index(dist, choice_indices, v) for v in values], dtype=np.int64
+                )
+                cols[:] = 0.0
+                cols[indices < 0] = np.nan
+                valid = np.flatnonzero(indices >= 0)
+                cols[valid, indices[valid]] = 1.0
+            else:
+                assert isinstance(dist, (FloatDistribution, IntDistribution))
+                v = np.asarray([np.nan if v is _MISSING else v for v in values], dtype=np.float64)
+                cols[:, 0] = np.log(v) if dist.log else v
+
+
+def _choice_indices(choices: Sequence[Any]) -> dict[Any, int]:
+    indices: dict[Any, int] = {}
+    for i, c in enumerate(choices):
+        try:
+            indices.setdefault(c, i)
+        except TypeError:
+            continue
+    return indices
+
+
+def _choice_index(dist: CategoricalDistribution, indices: dict[Any, int], value: Any) -> int:
+    if value is _MISSING:
+        return -1
+    try:
+        return indices[value]
+    except (KeyError, TypeError):
+        return int(dist.to_internal_repr(value))
+
+
+def _n_objectives(trials: Sequence[FrozenTrial]) -> int:
+    for t in trials:
+        if t.values is not None:
+            return len(t.values)
+    return 1
+
+
+def _capacity(n: int) -> int:
+    # Grow the buffers geometrically to amortize the allocation cost.
+    return max(16, 1 << (n - 1).bit_length())
@@ -0,0 +1,5 @@
+from optunahub.testing._registry import LocalRegistry
+from optunahub.testing._registry import synthetic_package_files
+
+
+__all__ = ["LocalRegistry", "synthetic_package_files"]
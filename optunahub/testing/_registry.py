@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+from collections.abc import Mapping
+import os
+import pathlib
+import shutil
+import types
+from typing import Any
+
+import optunahub
+from optunahub import _git
+
+
+_IDENTITY = ("-c", "user.name=optunahub", "-c", "user.email=optunahub@example.com")
+# Commits are dated from a fixed timestamp so that their SHAs are deterministic.
+_EPOCH = 1704067200
+
+_MODULE_TEMPLATE = """from __future__ import annotations
+
+from typing import Any
+
+import optuna
+
+import optunahub
+
+
+class Sampler{index}(optunahub.samplers.SimpleBaseSampler):
+    def sample_relative(
+        self,
+        study: optuna.Study,
+        trial: optuna.trial.FrozenTrial,
+        search_space: dict[str, optuna.distributions.BaseDistribution],
+    ) -> dict[str, Any]:
+        return {{}}
+"""
+
+
+def synthetic_package_files(n_modules: int = 1, module_size: int = 0) -> dict[str, str]:
+    """Return the files of a synthetic registry package.
+
+    The package consists of ``n_modules`` submodules, each of which defines a sampler class
+    ``Sampler<i>``, and an ``__init__.py`` that imports all of them with relative imports.
+
+    Args:
+        n_modules:
+            The number of submodules.
+        module_size:
+            The number of bytes of padding comments appended to each submodule, which controls
+            the download size of the package.
+
+    Returns:
+        A dictionary from the paths relative to the package directory to the file contents.
+    """
+    # Each line of the padding is 80 bytes.
+    padding = f"# {'x' * 77}\n" * (module_size // 80)
+    files = {
+        f"sampler{i}.py": _MODULE_TEMPLATE.format(index=i) + padding for i in range(n_modules)
+    }
+    files["__init__.py"] = "".join(
+        f"from .sampler{i} import Sampler{i}\n" for i in range(n_modules)
+    )
+    return files
+
+
+class LocalRegistry:
+    """A local Git registry for hermetic tests and benchmarks of :func:`optunahub.load_module`.
+
+    A bare repository is created at ``<root>/<repo_owner>/<repo_name>`` and can be fetched
+    with ``base_url="file://<root>"``. Packages are written to a working tree with
+    :meth:`add_package` and published to the bare repository with :meth:`commit`.
+
+    .. code-block:: python
+
+        registry = LocalRegistry(tmp_path / "registry")
+        registry.add_package("samplers/foo", synthetic_package_files(n_modules=3))
+        registry.commit()
+        module = registry.load_module("samplers/foo")
+
+    The repositories are managed with the ``git`` command. The commits are authored by a fixed
+    identity, ``optunahub <optunahub@example.com>``, regardless of the Git configuration of the
+    user, and are dated from a fixed timestamp, so the same sequence of packages always results in
+    the same commit SHAs.
+
+    Args:
+        root:
+            The directory to create the registry in.
+        repo_owner:
+            The owner of the repository.
+        repo_name:
+            The name of the repository.
+        branch:
+            The branch to publish the commits to.
+        allow_filter:
+            Whether the repository serves partial clones. If :obj:`False`, the clients receive all
+            the blobs of the fetched commits as with servers without partial clone support.
+    """
+
+    def __init__(
+        self,
+        root: str | os.PathLike[str],
+        *,
+        repo_owner: str = "optuna",
+        repo_name: str = "optunahub-registry",
+        branch: str = "main",
+        allow_filter: bool = True,
+    ) -> None:
+        self._root = os.path.abspath(root)
+        self.repo_owner = repo_owner
+        self.repo_name = repo_name
+        self.branch = branch
+
+        self._bare_path = os.path.join(self._root, repo_owner, repo_name)
+        _git.run("init", "--quiet", "--bare", self._bare_path)
+        # Allow the clients to fetch arbitrary commits and optionally to use partial clones.
+        _git.run("config", "uploadpack.allowAnySHA1InWant", "true", cwd=self._bare_path)
+        _git.run(
+            "config", "uploadpack.allowFilter", str(allow_filter).lower(), cwd=self._bare_path
+        )
+        self._work_dir = os.path.join(self._root, ".worktree")
+        _git.run("init", "--quiet", self._work_dir)
+        self._n_commits = 0
+
+    @property
+    def base_url(self) -> str:
+        """Return the ``base_url`` to pass to :func:`optunahub.load_module`."""
+        return pathlib.Path(self._root).as_uri()
+
+    @property
+    def head(self) -> str:
+        """Return the SHA of the latest commit."""
+        return _git.run("rev-parse", "HEAD", cwd=self._work_dir).strip()
+
+    def add_package(self, package: str, files: Mapping[str, str | bytes]) -> None:
+        """Write a package to the working tree, replacing the existing one.
+
+        Args:
+            package:
+                The package name, e.g., ``"samplers/foo"``.
+            files:
+                A dictionary from the paths relative to the package directory to the contents.
+        """
+        package_dir = os.path.join(self._work_dir, "package", package)
+        shutil.rmtree(package_dir, ignore_errors=True)
+        for path, content in files.items():
+            file_path = os.path.join(package_dir, path)
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            with open(file_path, "wb") as f:
+                f.write(content.encode() if isinstance(content, str) else content)
+
+    def remove_package(self, package: str) -> None:
+        """Remove a package from the working tree."""
+        shutil.rmtree(os.path.join(self._work_dir, "package", package))
+
+    def commit(self, message: str = "Update packages", tag: str | None = None) -> str:
+        """Commit the working tree and publish it to the bare repository.
+
+        Args:
+            message:
+                The commit message.
+            tag:
+                If given, the commit is also published as this tag.
+
+        Returns:
+            The SHA of the commit.
+        """
+        _git.run("add", "--all", cwd=self._work_dir)
+        date = f"@{_EPOCH + self._n_commits} +0000"
+        self._n_commits += 1
+        _git.run(
+            *_IDENTITY,
+            "commit",
+            "--quiet",
+            "--allow-empty",
+            "--message",
+            message,
+            cwd=self._work_dir,
+            env={"GIT_AUTHOR_DATE": date, "GIT_COMMITTER_DATE": date},
+        )
+        refspecs = [f"HEAD:refs/heads/{self.branch}"]
+        if tag is not None:
+            _git.run("tag", "--force", tag, cwd=self._work_dir)
+            refspecs.append(f"+refs/tags/{tag}:refs/tags/{tag}")
+        _git.run("push", "--quiet", "--force", self._bare_path, *refspecs, cwd=self._work_dir)
+        return self.head
+
+    def load_module(self, package: str, **kwargs: Any) -> types.ModuleType:
+        """Call :func:`optunahub.load_module` with the location of this registry.
+
+        Args:
+            package:
+                The package name to load.
+            kwargs:
+                The other arguments passed to :func:`optunahub.load_module`.
+
+        Returns:
+            The module object of the package.
+        """
+        return optunahub.load_module(
+            package,
+            repo_owner=self.repo_owner,
+            repo_name=self.repo_name,
+            base_url=self.base_url,
+            **kwargs,
+        )
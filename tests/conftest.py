@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+import pathlib
+import shutil
+
+import pytest
+from pytest import MonkeyPatch
+
+from optunahub.testing import LocalRegistry
+from optunahub.testing import synthetic_package_files
+
+
+@pytest.fixture
+def cache_home(tmp_path: pathlib.Path, monkeypatch: MonkeyPatch) -> pathlib.Path:
+    cache_home = tmp_path / "cache"
+    monkeypatch.setenv("OPTUNAHUB_CACHE_HOME", str(cache_home))
+    monkeypatch.setenv("OPTUNAHUB_NO_ANALYTICS", "1")
+    return cache_home
+
+
+@pytest.fixture
+def local_registry(tmp_path: pathlib.Path, cache_home: pathlib.Path) -> LocalRegistry:
+    if shutil.which("git") is None:
+        pytest.skip("git is not available.")
+    registry = LocalRegistry(tmp_path / "registry")
+    registry.add_package("samplers/synthetic", synthetic_package_files(n_modules=2))
+    registry.commit()
+    return registry
@@ -1,9 +1,15 @@
 from __future__ import annotations
 
+from collections.abc import Sequence
+from typing import Any
+
+import numpy as np
 import optuna
 from optuna.samplers._base import _CONSTRAINTS_KEY
+import pytest
 
 import optunahub
+from optunahub.benchmarks._constrained_mixin import _CONSTRAINTS_ATTR_KEY
 
 
 class TestProblem(optunahub.benchmarks.BaseProblem):
@@ -39,3 +45,128 @@ def test_constrained_mixin() -> None:
     # Check if constraints are stored in trials
     for t in study.trials:
         assert _CONSTRAINTS_KEY in study._storage.get_trial_system_attrs(t._trial_id)
+        # The objective stores nothing unless `evaluate_with_constraints` is overridden.
+        assert _CONSTRAINTS_ATTR_KEY not in t.system_attrs
+
+
+def test_constrained_mixin_evaluate_with_constraints() -> None:
+    class SimulatedProblem(optunahub.benchmarks.ConstrainedMixin, TestProblem):
+        def __init__(self) -> None:
+            self.n_runs = 0
+
+        def evaluate_with_constraints(self, params: dict[str, float]) -> tuple[float, list[float]]:
+            self.n_runs += 1
+            return params["x"] ** 2, [params["x"]]
+
+    problem = SimulatedProblem()
+    sampler = optuna.samplers.TPESampler(constraints_func=problem.constraints_func)
+    study = optuna.create_study(sampler=sampler, directions=problem.directions)
+    study.optimize(problem, n_trials=20)
+
+    assert problem.n_runs == 20
+    for t in study.trials:
+        constraints = study._storage.get_trial_system_attrs(t._trial_id)[_CONSTRAINTS_KEY]
+        assert list(constraints) == [t.params["x"]]
+
+
+def test_constrained_mixin_batch() -> None:
+    class ConstrainedTestProblem(optunahub.benchmarks.ConstrainedMixin, TestProblem):
+        def evaluate_constraints(self, params: dict[str, float]) -> list[float]:
+            return [params["x"], -params["x"] - 0.5]
+
+    class VectorizedConstrainedTestProblem(ConstrainedTestProblem):
+        def evaluate_constraints_batch(
+            self, params: np.ndarray | Sequence[dict[str, Any]]
+        ) -> np.ndarray:
+            X = self.params_to_array(params)
+            return np.stack([X[:, 0], -X[:, 0] - 0.5], axis=1)
+
+    X = np.linspace(-1, 1, 9)[:, None]
+    expected_constraints = np.stack([X[:, 0], -X[:, 0] - 0.5], axis=1)
+    expected_mask = (X[:, 0] <= 0) & (X[:, 0] >= -0.5)
+    for problem in [ConstrainedTestProblem(), VectorizedConstrainedTestProblem()]:
+        params_list = [{"x": x} for x in X[:, 0]]
+        np.testing.assert_allclose(problem.evaluate_constraints_batch(X), expected_constraints)
+        np.testing.assert_allclose(
+            problem.evaluate_constraints_batch(params_list), expected_constraints
+        )
+        np.testing.assert_array_equal(problem.feasibility_mask(X), expected_mask)
+        np.testing.assert_array_equal(problem.feasibility_mask(params_list), expected_mask)
+        assert problem.evaluate_constraints_batch(np.empty((0, 1))).shape[0] == 0
+
+
+@pytest.mark.parametrize(
+    "problem",
+    [
+        optunahub.benchmarks.Sphere(5),
+        optunahub.benchmarks.Rosenbrock(5),
+        optunahub.benchmarks.Rastrigin(5),
+        optunahub.benchmarks.Ackley(5),
+    ],
+)
+def test_single_objective_problems(problem: Any) -> None:
+    assert len(problem.search_space) == 5
+    assert problem.evaluate(problem.optimal_params) == pytest.approx(problem.optimal_value)
+
+    X = np.random.default_rng(0).uniform(-1, 1, size=(10, 5))
+    values = problem.evaluate_batch(X)
+    assert values.shape == (10,)
+    assert np.all(values >= problem.optimal_value)
+    names = list(problem.search_space)
+    for x, v in zip(X, values):
+        assert problem.evaluate(dict(zip(names, x))) == pytest.approx(v)
+
+    study = optuna.create_study(directions=problem.directions)
+    study.optimize(problem, n_trials=10)  # verify no error occurs
+
+
+@pytest.mark.parametrize(
+    "problem",
+    [
+        optunahub.benchmarks.ZDT1(4),
+        optunahub.benchmarks.DTLZ2(4, n_objectives=2),
+        optunahub.benchmarks.DTLZ2(5, n_objectives=3),
+        optunahub.benchmarks.C2DTLZ2(5, n_objectives=3),
+    ],
+)
+def test_multi_objective_problems(problem: Any) -> None:
+    m = problem.n_objectives
+    assert len(problem.directions) == m
+    X = np.random.default_rng(0).uniform(0, 1, size=(10, problem.dim))
+    F = problem.evaluate_batch(X)
+    assert F.shape == (10, m)
+
+    # The points with the optimal distance variables lie on the Pareto front.
+    X[:, m - 1 :] = 0.0 if isinstance(problem, optunahub.benchmarks.ZDT1) else 0.5
+    F = problem.evaluate_batch(X)
+    if isinstance(problem, optunahub.benchmarks.ZDT1):
+        np.testing.assert_allclose(F[:, 1], 1 - np.sqrt(F[:, 0]))
+        np.testing.assert_allclose(
+            problem.pareto_front(5)[:, 1], 1 - np.sqrt(np.linspace(0, 1, 5))
+        )
+    else:
+        np.testing.assert_allclose(np.linalg.norm(F, axis=1), 1.0)
+        np.testing.assert_allclose(np.linalg.norm(problem.pareto_front(5), axis=1), 1.0)
+
+    study = optuna.create_study(directions=problem.directions)
+    study.optimize(problem, n_trials=10)  # verify no error occurs
+
+
+def test_c2dtlz2_constraints() -> None:
+    problem = optunahub.benchmarks.C2DTLZ2(4, n_objectives=3)
+    X = np.full((2, 4), 0.5)
+    # A corner of the Pareto front is feasible and a point between the corners and the center
+    # is infeasible.
+    X[0, :2] = 0.0
+    X[1, :2] = [0.5, 0.0]
+    np.testing.assert_array_equal(problem.feasibility_mask(X), [True, False])
+    names = list(problem.search_space)
+    constraints = problem.evaluate_constraints_batch(X)
+    assert constraints.shape == (2, 1)
+    for x, c in zip(X, constraints):
+        assert problem.evaluate_constraints(dict(zip(names, x))) == pytest.approx(c)
+
+    with pytest.raises(ValueError):
+        optunahub.benchmarks.Rosenbrock(1)
+    with pytest.raises(ValueError):
+        optunahub.benchmarks.DTLZ2(2, n_objectives=3)
@@ -1,14 +1,32 @@
 from __future__ import annotations
 
+from concurrent.futures import ProcessPoolExecutor
+import importlib
+import json
+import multiprocessing
 import os
+import pathlib
+import pickle
 import shutil
+import subprocess
+import sys
+import threading
+from typing import Any
 
 import optuna
 import pytest
 from pytest import MonkeyPatch
 
 import optunahub
+from optunahub import _cache
+from optunahub import _git
+from optunahub import _requirements
+import optunahub.__main__
+from optunahub.hub import _DEFAULT_EXCLUDE
 from optunahub.hub import _extract_hostname
+from optunahub.hub import _is_selected
+from optunahub.testing import LocalRegistry
+from optunahub.testing import synthetic_package_files
 
 
 @pytest.mark.parametrize(
@@ -34,6 +52,636 @@ def test_load_module(monkeypatch: MonkeyPatch, git_command: str | None) -> None:
     study.optimize(objective, n_trials=10)
 
 
+def test_load_module_from_local_registry(
+    local_registry: LocalRegistry, cache_home: pathlib.Path
+) -> None:
+    m = local_registry.load_module("samplers/synthetic")
+    assert m.__name__ == "optunahub_registry.package.samplers.synthetic"
+    assert (
+        cache_home
+        / "localhost"
+        / "optuna"
+        / "optunahub-registry"
+        / "main"
+        / "package"
+        / "samplers"
+        / "synthetic"
+        / "__init__.py"
+    ).is_file()
+
+    study = optuna.create_study(sampler=m.Sampler1())
+    study.optimize(lambda t: t.suggest_float("x", 0, 1), n_trials=3)
+
+
+def test_load_module_from_local_registry_uses_cache(local_registry: LocalRegistry) -> None:
+    local_registry.load_module("samplers/synthetic")
+
+    local_registry.add_package("samplers/synthetic", synthetic_package_files(n_modules=3))
+    local_registry.commit()
+    m = local_registry.load_module("samplers/synthetic")
+    assert not hasattr(m, "Sampler2")
+
+    m = local_registry.load_module("samplers/synthetic", force_reload=True)
+    assert hasattr(m, "Sampler2")
+
+
+def test_load_module_from_local_registry_with_ref(local_registry: LocalRegistry) -> None:
+    sha = local_registry.head
+    local_registry.add_package("samplers/synthetic", synthetic_package_files(n_modules=3))
+    local_registry.commit(tag="v1")
+
+    assert not hasattr(local_registry.load_module("samplers/synthetic", ref=sha), "Sampler2")
+    assert hasattr(local_registry.load_module("samplers/synthetic", ref="v1"), "Sampler2")
+
+
+@pytest.mark.parametrize("allow_filter", [True, False])
+def test_load_module_fetches_only_package_blobs(
+    tmp_path: pathlib.Path, cache_home: pathlib.Path, monkeypatch: MonkeyPatch, allow_filter: bool
+) -> None:
+    if shutil.which("git") is None:
+        pytest.skip("git is not available.")
+    registry = LocalRegistry(tmp_path / "registry", allow_filter=allow_filter)
+    registry.add_package("samplers/synthetic", synthetic_package_files(n_modules=2))
+    registry.add_package("samplers/heavy", {"__init__.py": "", "data.bin": os.urandom(2**21)})
+    registry.commit()
+
+    # Measure the size of the Git objects right before the checkout directory is discarded.
+    git_sizes = []
+    move = shutil.move
+
+    def measure_and_move(src: str, dst: str) -> Any:
+        git_dir = os.path.join(src.rsplit(f"{os.sep}package{os.sep}", 1)[0], ".git")
+        git_sizes.append(
+            sum(
+                os.path.getsize(os.path.join(root, f))
+                for root, _, files in os.walk(git_dir)
+                for f in files
+            )
+        )
+        return move(src, dst)
+
+    monkeypatch.setattr("optunahub.hub.shutil.move", measure_and_move)
+    m = registry.load_module("samplers/synthetic")
+    assert hasattr(m, "Sampler1")
+    if allow_filter:
+        assert git_sizes[0] < 2**20
+    else:
+        # The server without partial clone support sends all the blobs of the commit.
+        assert git_sizes[0] > 2**21
+
+
+def test_load_module_falls_back_to_full_fetch(
+    local_registry: LocalRegistry, monkeypatch: MonkeyPatch
+) -> None:
+    sparse_checkout = _git.sparse_checkout
+    blob_filters = []
+
+    def sparse_checkout_without_partial_clone(*args: Any, **kwargs: Any) -> str:
+        blob_filters.append(kwargs["blob_filter"])
+        if kwargs["blob_filter"] is not None:
+            raise _git.GitError(
+                ["fetch", "--filter=blob:none"], 128, "fatal: unknown option `filter=blob:none'"
+            )
+        return sparse_checkout(*args, **kwargs)
+
+    monkeypatch.setattr("optunahub._git.sparse_checkout", sparse_checkout_without_partial_clone)
+    m = local_registry.load_module("samplers/synthetic")
+    assert hasattr(m, "Sampler1")
+    assert blob_filters == ["blob:none", None]
+    assert _cache.read_commit(m.__path__[0]) == local_registry.head
+
+
+def test_load_module_does_not_retry_other_git_errors(
+    local_registry: LocalRegistry, monkeypatch: MonkeyPatch
+) -> None:
+    blob_filters = []
+
+    def sparse_checkout_with_missing_ref(*args: Any, **kwargs: Any) -> str:
+        blob_filters.append(kwargs["blob_filter"])
+        raise _git.GitError(["fetch", "origin", "v9"], 128, "fatal: couldn't find remote ref v9")
+
+    monkeypatch.setattr("optunahub._git.sparse_checkout", sparse_checkout_with_missing_ref)
+    with pytest.raises(_git.GitError):
+        local_registry.load_module("samplers/synthetic")
+    assert blob_filters == ["blob:none"]
+
+
+@pytest.mark.parametrize(
+    "command, stderr, expected",
+    [
+        (["fetch"], "error: unknown option `filter=blob:none'", True),
+        (["fetch"], "fatal: --filter can only be used with the remote configured in ...", True),
+        (["checkout"], "fatal: could not fetch 45b983be from promisor remote", True),
+        (["checkout"], "error: Your local changes would be overwritten by checkout", False),
+        (["fetch"], "fatal: couldn't find remote ref filter", False),
+        (
+            ["fetch"],
+            "fatal: unable to access 'https://example.com/': Could not resolve host",
+            False,
+        ),
+    ],
+)
+def test_is_partial_clone_error(command: list[str], stderr: str, expected: bool) -> None:
+    assert _git.is_partial_clone_error(_git.GitError(command, 128, stderr)) == expected
+
+
+def test_load_module_keeps_imported_version(
+    local_registry: LocalRegistry, cache_home: pathlib.Path
+) -> None:
+    m = local_registry.load_module("samplers/synthetic")
+    imported_dir = m.__path__[0]
+    imported_files = sorted(os.listdir(imported_dir))
+    local_registry.add_package("samplers/synthetic", synthetic_package_files(n_modules=3))
+    local_registry.commit()
+
+    # The new commit is installed next to the imported one, which is left unchanged.
+    m = local_registry.load_module("samplers/synthetic", force_reload=True)
+    assert hasattr(m, "Sampler2")
+    assert m.__path__[0] != imported_dir
+    assert sorted(os.listdir(imported_dir)) == imported_files
+    package_cache_dir = _package_cache_dir(cache_home, "samplers/synthetic")
+    assert os.path.realpath(package_cache_dir) == m.__path__[0]
+    assert _cache.read_commit(package_cache_dir) == local_registry.head
+
+
+def _wait_for_refresh() -> None:
+    for thread in list(optunahub.hub._refresh_threads.values()):
+        thread.join()
+
+
+def _package_cache_dir(cache_home: pathlib.Path, package: str, ref: str = "main") -> str:
+    relative_path = os.path.join("localhost", "optuna", "optunahub-registry", ref, "package")
+    return os.path.join(cache_home, relative_path, package)
+
+
+def test_load_module_refresh_in_background(
+    local_registry: LocalRegistry, cache_home: pathlib.Path, monkeypatch: MonkeyPatch
+) -> None:
+    m = local_registry.load_module("samplers/synthetic", refresh="background")
+    _wait_for_refresh()
+    package_cache_dir = _package_cache_dir(cache_home, "samplers/synthetic")
+    assert _cache.read_commit(m.__path__[0]) == local_registry.head
+    assert _cache.read_commit(package_cache_dir) == local_registry.head
+
+    local_registry.add_package("samplers/synthetic", synthetic_package_files(n_modules=3))
+    local_registry.commit(tag="v1")
+
+    # The cached package is returned immediately and updated for the next load.
+    m = local_registry.load_module("samplers/synthetic", refresh="background")
+    assert not hasattr(m, "Sampler2")
+    _wait_for_refresh()
+    assert _cache.read_commit(package_cache_dir) == local_registry.head
+    assert hasattr(local_registry.load_module("samplers/synthetic"), "Sampler2")
+
+    # The tag resolves to the cached commit and the commit SHA is never refreshed.
+    local_registry.load_module("samplers/synthetic", ref="v1")
+    local_registry.load_module("samplers/synthetic", ref=local_registry.head)
+    downloads: list[Any] = []
+    monkeypatch.setattr("optunahub.hub._download", lambda **kwargs: downloads.append(kwargs))
+    local_registry.load_module("samplers/synthetic", ref="v1", refresh="background")
+    local_registry.load_module("samplers/synthetic", ref=local_registry.head, refresh="background")
+    _wait_for_refresh()
+    assert downloads == []
+
+
+def test_load_module_prefetches_dependencies(
+    local_registry: LocalRegistry, monkeypatch: MonkeyPatch
+) -> None:
+    def add_package(package: str, dependencies: list[str]) -> None:
+        files = synthetic_package_files()
+        files["optunahub.json"] = json.dumps({"dependencies": dependencies})
+        local_registry.add_package(package, files)
+
+    add_package("samplers/a", ["samplers/b", "samplers/c"])
+    add_package("samplers/b", ["samplers/d"])
+    add_package("samplers/c", ["samplers/d"])
+    add_package("samplers/d", [])
+    local_registry.commit()
+
+    # The siblings are downloaded concurrently, or the barrier is broken.
+    barrier = threading.Barrier(2, timeout=10)
+    downloaded: list[str] = []
+    download = optunahub.hub._download
+
+    def download_concurrently(**kwargs: Any) -> None:
+        downloaded.append(kwargs["dir_path"])
+        if kwargs["dir_path"] in ("package/samplers/b", "package/samplers/c"):
+            barrier.wait()
+        download(**kwargs)
+
+    monkeypatch.setattr("optunahub.hub._download", download_concurrently)
+    local_registry.load_module("samplers/a")
+    assert sorted(downloaded) == [f"package/samplers/{p}" for p in "abcd"]
+
+    downloaded.clear()
+    local_registry.load_module("samplers/b")
+    assert downloaded == []
+
+
+def test_load_module_installs_requirements(
+    local_registry: LocalRegistry, tmp_path: pathlib.Path, monkeypatch: MonkeyPatch
+) -> None:
+    installs: list[str] = []
+
+    def pip_resolve(requirements_path: str, report_path: str) -> None:
+        # Only the resolved packages the host has are pinned.
+        items = [
+            {"metadata": {"name": name, "version": version}}
+            for name, version in [("optunahub-fake-dependency", "1.0"), ("Optuna", "0.0")]
+        ]
+        with open(report_path, "w") as f:
+            json.dump({"install": items}, f)
+
+    def pip_install(requirements_path: str, constraints_path: str, target_dir: str) -> None:
+        installs.append(requirements_path)
+        with open(constraints_path) as f:
+            constraints = f.read().splitlines()
+        # The installed dependencies are pinned, while the missing requirement is not.
+        assert f"optuna=={optuna.__version__}" in constraints
+        assert not any(c.startswith("optunahub-fake-dependency==") for c in constraints)
+        assert not any(c.startswith("pytest==") for c in constraints)
+
+        # `pip --target` also installs the dependencies the host has, which are removed.
+        dist_info = os.path.join(target_dir, f"optuna-{optuna.__version__}.dist-info")
+        os.makedirs(dist_info)
+        os.makedirs(os.path.join(target_dir, "optuna"))
+        with open(os.path.join(dist_info, "METADATA"), "w") as f:
+            f.write(f"Metadata-Version: 2.1\nName: optuna\nVersion: {optuna.__version__}\n")
+        with open(os.path.join(dist_info, "RECORD"), "w") as f:
+            f.write("optuna/__init__.py,,\n")
+            f.write(f"optuna-{optuna.__version__}.dist-info/METADATA,,\n")
+            f.write(f"optuna-{optuna.__version__}.dist-info/RECORD,,\n")
+        with open(os.path.join(target_dir, "optuna", "__init__.py"), "w") as f:
+            f.write("")
+        with open(os.path.join(target_dir, "optunahub_fake_dependency.py"), "w") as f:
+            f.write("VERSION = '1.0'\n")
+
+    monkeypatch.setattr("optunahub._requirements._pip_resolve", pip_resolve)
+    monkeypatch.setattr("optunahub._requirements._pip_install", pip_install)
+    monkeypatch.setattr("sys.path", list(sys.path))
+    files = synthetic_package_files()
+    files["requirements.txt"] = "optunahub-fake-dependency==1.0  # comment\n\noptuna\n"
+    local_registry.add_package("samplers/synthetic", files)
+    local_registry.add_package("samplers/other", files)
+    local_registry.commit()
+
+    local_registry.load_module("samplers/synthetic", install_requirements=True)
+    assert len(installs) == 1
+    import optunahub_fake_dependency  # type: ignore[import-not-found]
+
+    assert optunahub_fake_dependency.VERSION == "1.0"
+    env_dir = os.path.dirname(optunahub_fake_dependency.__file__)
+    assert set(os.listdir(env_dir)) - {"__pycache__"} == {"optunahub_fake_dependency.py"}
+
+    # The environment is reused for the same requirements without inspecting the host, and the
+    # satisfied ones are not installed.
+    monkeypatch.setenv("OPTUNAHUB_INSTALL_REQUIREMENTS", "1")
+    with monkeypatch.context() as m:
+        m.setattr("optunahub._requirements._host_distributions", None)
+        m.setattr("optunahub._requirements._unsatisfied_names", None)
+        local_registry.load_module("samplers/other")
+    assert len(installs) == 1
+    local_registry.add_package("samplers/other", {**files, "requirements.txt": "optuna\n"})
+    local_registry.commit()
+    local_registry.load_module("samplers/other", force_reload=True)
+    assert len(installs) == 1
+
+
+def test_requirements_conflicting_with_host_are_installed(
+    tmp_path: pathlib.Path, cache_home: pathlib.Path, monkeypatch: MonkeyPatch
+) -> None:
+    constraints_list: list[list[str]] = []
+
+    def pip_resolve(requirements_path: str, report_path: str) -> None:
+        with open(report_path, "w") as f:
+            json.dump({"install": [{"metadata": {"name": "optuna", "version": "99.0"}}]}, f)
+
+    def pip_install(requirements_path: str, constraints_path: str, target_dir: str) -> None:
+        with open(constraints_path) as f:
+            constraints_list.append(f.read().splitlines())
+        if len(constraints_list[-1]) > 0:
+            raise subprocess.CalledProcessError(1, "pip")
+        os.makedirs(target_dir)
+
+    monkeypatch.setattr("optunahub._requirements._pip_resolve", pip_resolve)
+    monkeypatch.setattr("optunahub._requirements._pip_install", pip_install)
+    monkeypatch.setattr("sys.path", list(sys.path))
+    (tmp_path / "requirements.txt").write_text("optunahub-fake-dependency\n")
+
+    # The host version of a resolved dependency is pinned first, and the requirements are
+    # installed without the pins if pip cannot resolve them.
+    assert _requirements.activate(str(tmp_path)) is not None
+    assert constraints_list == [[f"optuna=={optuna.__version__}"], []]
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [{"refresh": "always"}, {"isolate": 1}, {"include": "*.py"}, {"exclude": ["*.png", None]}],
+)
+def test_load_module_with_invalid_arguments(
+    local_registry: LocalRegistry,
+    tmp_path: pathlib.Path,
+    monkeypatch: MonkeyPatch,
+    kwargs: dict[str, Any],
+) -> None:
+    with pytest.raises(ValueError):
+        local_registry.load_module("samplers/synthetic", **kwargs)
+
+    # The arguments are validated even if the lockfile pins the package.
+    lockfile = str(tmp_path / "optunahub-lock.json")
+    spec = {"package": "samplers/synthetic", "base_url": local_registry.base_url}
+    optunahub.create_lockfile([spec], lockfile)
+    optunahub.install_lockfile(lockfile)
+    monkeypatch.setenv("OPTUNAHUB_LOCKFILE", lockfile)
+    with pytest.raises(ValueError):
+        local_registry.load_module("samplers/synthetic", **kwargs)
+
+
+def test_load_module_with_multiple_cache_tiers(
+    local_registry: LocalRegistry, tmp_path: pathlib.Path, monkeypatch: MonkeyPatch
+) -> None:
+    local_registry.add_package("samplers/other", synthetic_package_files())
+    local_registry.commit()
+    shared = str(tmp_path / "shared")
+    local = str(tmp_path / "local")
+    monkeypatch.setenv("OPTUNAHUB_CACHE_PATH", shared)
+    local_registry.load_module("samplers/synthetic")
+
+    # The shared cache is read-only and follows the local writable one.
+    monkeypatch.setenv("OPTUNAHUB_CACHE_PATH", os.pathsep.join([local, shared]))
+    access = os.access
+    monkeypatch.setattr(
+        "optunahub._cache.os.access",
+        lambda path, mode: not str(path).startswith(shared) and access(path, mode),
+    )
+    m = local_registry.load_module("samplers/synthetic")
+    assert m.__path__[0].startswith(shared)
+    m = local_registry.load_module("samplers/other")
+    assert m.__path__[0].startswith(local)
+
+    monkeypatch.setenv("OPTUNAHUB_CACHE_PROMOTE", "1")
+    m = local_registry.load_module("samplers/synthetic")
+    assert m.__path__[0].startswith(local)
+    assert _cache.read_commit(m.__path__[0]) == local_registry.head
+
+
+def test_load_module_without_writable_cache(
+    local_registry: LocalRegistry, monkeypatch: MonkeyPatch
+) -> None:
+    monkeypatch.setattr("optunahub._cache.os.access", lambda path, mode: False)
+    with pytest.raises(PermissionError):
+        local_registry.load_module("samplers/synthetic")
+
+
+def test_lockfile(
+    local_registry: LocalRegistry, tmp_path: pathlib.Path, monkeypatch: MonkeyPatch
+) -> None:
+    local_registry.add_package("samplers/other", synthetic_package_files())
+    sha = local_registry.commit()
+    lockfile = str(tmp_path / "optunahub-lock.json")
+    optunahub.__main__.main(
+        [
+            "lock",
+            "samplers/synthetic",
+            f"samplers/other@{sha}",
+            "--base-url",
+            local_registry.base_url,
+            "-o",
+            lockfile,
+        ]
+    )
+    with open(lockfile) as f:
+        entries = json.load(f)["packages"]
+    assert [(e["package"], e["ref"], e["commit"]) for e in entries] == [
+        ("samplers/synthetic", "main", sha),
+        ("samplers/other", sha, sha),
+    ]
+    assert set(entries[0]["files"]) == {"__init__.py", "sampler0.py", "sampler1.py"}
+
+    # Install the lockfile into a fresh cache in parallel.
+    monkeypatch.setenv("OPTUNAHUB_CACHE_HOME", str(tmp_path / "node"))
+    optunahub.install_lockfile(lockfile, max_workers=2)
+
+    local_registry.add_package("samplers/synthetic", synthetic_package_files(n_modules=3))
+    local_registry.commit(tag="v2")
+    monkeypatch.setenv("OPTUNAHUB_LOCKFILE", lockfile)
+    download = optunahub.hub._download
+    monkeypatch.setattr("optunahub.hub._download", None)
+    m = local_registry.load_module("samplers/synthetic", force_reload=True)
+    assert not hasattr(m, "Sampler2")
+    assert m.__path__[0].startswith(str(tmp_path / "node"))
+
+    # The refs not in the lockfile are loaded as usual.
+    monkeypatch.setattr("optunahub.hub._download", download)
+    assert hasattr(local_registry.load_module("samplers/synthetic", ref="v2"), "Sampler2")
+
+
+def test_lockfile_not_installed(
+    local_registry: LocalRegistry, tmp_path: pathlib.Path, monkeypatch: MonkeyPatch
+) -> None:
+    lockfile = str(tmp_path / "optunahub-lock.json")
+    spec = {"package": "samplers/synthetic", "base_url": local_registry.base_url}
+    optunahub.create_lockfile([spec], lockfile)
+    monkeypatch.setenv("OPTUNAHUB_CACHE_HOME", str(tmp_path / "node"))
+    monkeypatch.setenv("OPTUNAHUB_LOCKFILE", lockfile)
+    with pytest.raises(FileNotFoundError):
+        local_registry.load_module("samplers/synthetic")
+
+
+def test_lockfile_with_mismatched_hash(
+    local_registry: LocalRegistry, tmp_path: pathlib.Path, monkeypatch: MonkeyPatch
+) -> None:
+    lockfile = str(tmp_path / "optunahub-lock.json")
+    spec = {"package": "samplers/synthetic", "base_url": local_registry.base_url}
+    optunahub.create_lockfile([spec], lockfile)
+    with open(lockfile) as f:
+        content = json.load(f)
+    content["packages"][0]["files"]["__init__.py"] = "sha256:0"
+    with open(lockfile, "w") as f:
+        json.dump(content, f)
+
+    monkeypatch.setenv("OPTUNAHUB_CACHE_HOME", str(tmp_path / "node"))
+    with pytest.raises(ValueError):
+        optunahub.install_lockfile(lockfile)
+    with pytest.raises(ValueError):
+        optunahub.create_lockfile([{"package": "samplers/synthetic", "tag": "v1"}], lockfile)
+
+
+_ASSET_FILES = {
+    "__init__.py": "from .sampler import Sampler0\n",
+    "sampler.py": synthetic_package_files()["sampler0.py"],
+    "README.md": "# Sampler\n",
+    "data/table.json": "{}\n",
+    "images/plot.png": "png",
+    "examples/example.ipynb": "{}\n",
+    "examples/example.py": "\n",
+}
+
+
+@pytest.mark.parametrize(
+    "include, exclude, expected",
+    [
+        (
+            None,
+            None,
+            {"__init__.py", "sampler.py", "README.md", "data/table.json", "examples/example.py"},
+        ),
+        (None, [], set(_ASSET_FILES)),
+        (["*.py"], [], {"__init__.py", "sampler.py", "examples/example.py"}),
+        (
+            None,
+            ["examples/", "*.md"],
+            {"__init__.py", "sampler.py", "data/table.json", "images/plot.png"},
+        ),
+        (["*.py", "data/*.json"], ["examples"], {"__init__.py", "sampler.py", "data/table.json"}),
+    ],
+)
+def test_load_module_with_asset_filters(
+    local_registry: LocalRegistry,
+    cache_home: pathlib.Path,
+    include: list[str] | None,
+    exclude: list[str] | None,
+    expected: set[str],
+) -> None:
+    local_registry.add_package("samplers/assets", _ASSET_FILES)
+    local_registry.commit()
+    m = local_registry.load_module("samplers/assets", include=include, exclude=exclude)
+    assert hasattr(m, "Sampler0")
+
+    package_dir = pathlib.Path(m.__path__[0])
+    files = {
+        p.relative_to(package_dir).as_posix()
+        for p in package_dir.rglob("*")
+        if p.is_file() and "__pycache__" not in p.parts
+    }
+    assert files == expected
+
+    # The GitHub API download selects the same files.
+    effective_exclude = _DEFAULT_EXCLUDE if exclude is None else exclude
+    assert {p for p in _ASSET_FILES if _is_selected(p, include, effective_exclude)} == expected
+
+
+def test_load_module_with_other_filters_downloads_again(
+    local_registry: LocalRegistry, cache_home: pathlib.Path
+) -> None:
+    local_registry.add_package("samplers/assets", _ASSET_FILES)
+    local_registry.commit()
+    local_registry.load_module("samplers/assets", include=["*.py"])
+    package_dir = pathlib.Path(_package_cache_dir(cache_home, "samplers/assets"))
+    assert not (package_dir / "README.md").exists()
+
+    local_registry.load_module("samplers/assets")
+    assert (package_dir / "README.md").exists()
+    assert not (package_dir / "images" / "plot.png").exists()
+    assert _cache.read_filters(str(package_dir)) == {
+        "include": None,
+        "exclude": list(_DEFAULT_EXCLUDE),
+    }
+
+
+def test_load_module_with_isolated_refs(local_registry: LocalRegistry) -> None:
+    local_registry.add_package(
+        "samplers/versioned",
+        {"__init__.py": "from .version import VERSION\n", "version.py": "VERSION = 1\n"},
+    )
+    sha = local_registry.commit()
+    local_registry.add_package(
+        "samplers/versioned",
+        {"__init__.py": "from .version import VERSION\n", "version.py": "VERSION = 2\n"},
+    )
+    local_registry.commit()
+
+    m1 = local_registry.load_module("samplers/versioned", ref=sha, isolate=True)
+    m2 = local_registry.load_module("samplers/versioned", isolate=True)
+    assert m1.__name__ != m2.__name__
+    assert m1.__name__.endswith(".package.samplers.versioned")
+    assert (m1.VERSION, m2.VERSION) == (1, 2)
+    assert sys.modules[f"{m1.__name__}.version"].VERSION == 1
+    assert sys.modules[f"{m2.__name__}.version"].VERSION == 2
+
+    # Without isolation, the latest load replaces the package including its submodules.
+    assert local_registry.load_module("samplers/versioned", ref=sha).VERSION == 1
+    assert local_registry.load_module("samplers/versioned").VERSION == 2
+
+
+def test_load_module_submodules_are_registered(local_registry: LocalRegistry) -> None:
+    m = local_registry.load_module("samplers/synthetic")
+    assert sys.modules["optunahub_registry.package.samplers"].synthetic is m
+    assert m.Sampler0.__module__ == "optunahub_registry.package.samplers.synthetic.sampler0"
+    assert sys.modules[m.Sampler0.__module__].Sampler0 is m.Sampler0
+    assert type(pickle.loads(pickle.dumps(m.Sampler0()))) is m.Sampler0
+
+
+def test_registry_sampler_is_unpicklable_in_worker_process(cache_home: pathlib.Path) -> None:
+    package_dir = (
+        (cache_home / "github.com" / "optuna" / "optunahub-registry" / "main" / "package")
+        / "samplers"
+        / "synthetic"
+    )
+    package_dir.mkdir(parents=True)
+    for path, content in synthetic_package_files(n_modules=2).items():
+        (package_dir / path).write_text(content)
+    m = optunahub.load_module("samplers/synthetic")
+
+    # The worker process imports the package from the cache when unpickling the sampler.
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(
+        max_workers=1,
+        mp_context=context,
+        initializer=importlib.import_module,
+        initargs=("optunahub",),
+    ) as executor:
+        r = executor.submit(repr, m.Sampler1()).result()
+    assert r.startswith("<optunahub_registry.package.samplers.synthetic.sampler1.Sampler1 ")
+
+
+def test_local_registry_sampler_is_not_imported_from_cache(
+    tmp_path: pathlib.Path, cache_home: pathlib.Path
+) -> None:
+    package_dir = tmp_path / "samplers" / "synthetic"
+    package_dir.mkdir(parents=True)
+    for path, content in synthetic_package_files(n_modules=2).items():
+        (package_dir / path).write_text(content)
+    m = optunahub.load_local_module("samplers/synthetic", registry_root=str(tmp_path))
+
+    # Loading a local package leaves the cache untouched, and other processes do not know it.
+    assert not cache_home.exists()
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import optunahub, pickle, sys; pickle.load(sys.stdin.buffer)",
+        ],
+        input=pickle.dumps(m.Sampler1()),
+        capture_output=True,
+    )
+    assert result.returncode != 0
+    assert b"worker_initializer" in result.stderr
+
+
+def test_worker_initializer(local_registry: LocalRegistry) -> None:
+    m = local_registry.load_module("samplers/synthetic", isolate=True)
+    initializer = optunahub.worker_initializer([m])
+
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(2, mp_context=context, initializer=initializer) as executor:
+        results = list(executor.map(repr, [m.Sampler0(), m.Sampler1()]))
+    assert results[0].startswith(f"<{m.__name__}.sampler0.Sampler0 ")
+    assert results[1].startswith(f"<{m.__name__}.sampler1.Sampler1 ")
+
+
+def test_worker_initializer_with_invalid_module() -> None:
+    with pytest.raises(ValueError):
+        optunahub.worker_initializer([os])
+
+
+def test_load_local_module_with_invalid_namespace() -> None:
+    with pytest.raises(ValueError):
+        optunahub.load_local_module(
+            "package_for_test_hub", registry_root=os.path.dirname(__file__), namespace="a.b"
+        )
+
+
 def test_load_local_module() -> None:
     def objective(trial: optuna.Trial) -> float:
         x = trial.suggest_float("x", 0, 1)
@@ -59,6 +707,7 @@ def test_load_local_module() -> None:
         ("git@gitlab.example.com", "gitlab.example.com"),
         ("https://api.github.com", "api.github.com"),
         ("https://gitlab.example.com/api/v4/", "gitlab.example.com"),
+        ("file:///path/to/registry", "localhost"),
     ],
 )
 def test_extract_hostname(uri: str, expected_hostname: str) -> None:
@@ -66,7 +715,9 @@ def test_extract_hostname(uri: str, expected_hostname: str) -> None:
 
 
 @pytest.mark.parametrize("git_command", ["/usr/bin/git", None])
-def test_if_report_stats_is_called(monkeypatch: MonkeyPatch, git_command: str | None) -> None:
+def test_if_report_stats_is_called(
+    monkeypatch: MonkeyPatch, cache_home: pathlib.Path, git_command: str | None
+) -> None:
     def mock_do_nothing(*args, **kwargs) -> None:  # type: ignore[no-untyped-def]
         return
 
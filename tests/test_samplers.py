@@ -0,0 +1,638 @@
+from __future__ import annotations
+
+import inspect
+import math
+from multiprocessing.connection import Client
+import pathlib
+import pickle
+import threading
+import time
+from typing import Any
+
+import numpy as np
+import optuna
+from optuna import Study
+from optuna.distributions import BaseDistribution
+from optuna.trial import FrozenTrial
+import pytest
+from pytest import MonkeyPatch
+
+import optunahub
+from optunahub.samplers._profiler import _PROFILE_ATTR_KEY
+from optunahub.samplers._search_space import _IncrementalIntersectionSearchSpace
+from optunahub.samplers._search_space import _NewTrialTracker
+
+
+class UniformSampler(optunahub.samplers.SimpleBaseSampler):
+    def __init__(
+        self, search_space: dict[str, BaseDistribution] | None = None, seed: int | None = None
+    ) -> None:
+        super().__init__(search_space, seed)
+        self._rng = np.random.RandomState(seed)
+
+    def sample_relative(
+        self,
+        study: Study,
+        trial: FrozenTrial,
+        search_space: dict[str, BaseDistribution],
+    ) -> dict[str, Any]:
+        params = {}
+        for n, d in search_space.items():
+            assert isinstance(d, optuna.distributions.FloatDistribution)
+            params[n] = self._rng.uniform(d.low, d.high)
+        return params
+
+
+def objective(trial: optuna.Trial) -> float:
+    x = trial.suggest_float("x", -1, 1)
+    y = trial.suggest_float("y", -1, 1)
+    return x**2 + y**2
+
+
+def test_sampler_profiler() -> None:
+    sampler = optunahub.samplers.SamplerProfiler(UniformSampler(), store_in_trial=True)
+    study = optuna.create_study(sampler=sampler)
+    study.optimize(objective, n_trials=20)
+
+    stats = sampler.get_stats()
+    assert stats["infer_relative_search_space"].n_calls == 20
+    assert stats["sample_relative"].n_calls == 20
+    assert stats["sample_independent"].n_calls == 2
+    for s in stats.values():
+        assert 0.0 <= s.p50 <= s.p95 <= s.max <= s.total
+    assert not math.isnan(stats["infer_relative_search_space"].growth)
+
+    for t in study.trials:
+        profile = t.system_attrs[_PROFILE_ATTR_KEY]
+        assert "infer_relative_search_space" in profile
+
+    summary = sampler.summary()
+    assert "sample_relative" in summary
+
+    sampler.reset()
+    assert sampler.get_stats() == {}
+
+
+def test_incremental_intersection_search_space() -> None:
+    def dynamic_objective(trial: optuna.Trial) -> float:
+        x = trial.suggest_float("x", -1, 1)
+        trial.suggest_int("fixed", 0, 0)
+        if trial.number % 3 == 0:
+            trial.suggest_float("y", -1, 1)
+        if trial.number % 5 == 4:
+            raise optuna.TrialPruned()
+        return x
+
+    study = optuna.create_study()
+    search_space = _IncrementalIntersectionSearchSpace()
+    expected_search_space = optuna.search_space.IntersectionSearchSpace()
+    for _ in range(10):
+        study.optimize(dynamic_objective, n_trials=3)
+        assert search_space.calculate(study) == expected_search_space.calculate(study)
+    assert search_space.relative_search_space(study) == {
+        "x": optuna.distributions.FloatDistribution(-1, 1)
+    }
+
+
+def test_incremental_intersection_search_space_reads_trials_in_bulk(
+    monkeypatch: MonkeyPatch,
+) -> None:
+    study = optuna.create_study()
+    study.optimize(objective, n_trials=50)
+    running = [study.ask() for _ in range(16)]
+
+    calls: list[str] = []
+    get_trial = study._storage.get_trial
+    get_all_trials = study._storage.get_all_trials
+
+    def get_trial_with_count(trial_id: int) -> FrozenTrial:
+        calls.append("get_trial")
+        return get_trial(trial_id)
+
+    def get_all_trials_with_count(*args: Any, **kwargs: Any) -> list[FrozenTrial]:
+        calls.append("get_all_trials")
+        return get_all_trials(*args, **kwargs)
+
+    monkeypatch.setattr(study._storage, "get_trial", get_trial_with_count)
+    monkeypatch.setattr(study._storage, "get_all_trials", get_all_trials_with_count)
+
+    # Each call reads the trials once in bulk, and the running trials are not read one by one.
+    search_space = _IncrementalIntersectionSearchSpace()
+    for _ in range(3):
+        calls.clear()
+        search_space.calculate(study)
+        assert calls == ["get_all_trials"]
+    expected_search_space = optuna.search_space.IntersectionSearchSpace()
+    assert search_space.calculate(study) == expected_search_space.calculate(study)
+
+    # The trials finished out of order are returned once.
+    tracker = _NewTrialTracker()
+    assert len(tracker.fetch(study)) == 50
+    for trial in running[::-2]:
+        study.tell(trial, 0.0)
+    assert [t.number for t in tracker.fetch(study)] == sorted(t.number for t in running[::-2])
+    assert tracker.fetch(study) == []
+    for trial in running[-2::-2]:
+        study.tell(trial, 0.0)
+    assert len(tracker.fetch(study)) == 8
+    assert tracker.fetch(study) == []
+
+
+class BatchSampler(optunahub.samplers.SimpleBaseSampler):
+    def sample_relative(
+        self,
+        study: Study,
+        trial: FrozenTrial,
+        search_space: dict[str, BaseDistribution],
+    ) -> dict[str, Any]:
+        return self.sample_relative_from_batch(study, trial, search_space)
+
+
+class BatchUniformSampler(BatchSampler):
+    def __init__(self, batch_size: int) -> None:
+        super().__init__(batch_size=batch_size)
+        self._rng = np.random.RandomState()
+        self.n_calls = 0
+
+    def sample_relative_batch(
+        self,
+        study: Study,
+        trials: list[FrozenTrial],
+        search_space: dict[str, BaseDistribution],
+        n: int,
+    ) -> list[dict[str, Any]]:
+        self.n_calls += 1
+        assert all(t.state == optuna.trial.TrialState.COMPLETE for t in trials)
+        batch = []
+        for _ in range(n):
+            params = {}
+            for name, d in search_space.items():
+                assert isinstance(d, optuna.distributions.FloatDistribution)
+                params[name] = self._rng.uniform(d.low, d.high)
+            batch.append(params)
+        return batch
+
+
+@pytest.mark.parametrize("n_jobs", [1, 4])
+def test_sample_relative_batch(n_jobs: int) -> None:
+    sampler = BatchUniformSampler(batch_size=4)
+    study = optuna.create_study(sampler=sampler)
+    study.optimize(objective, n_trials=21, n_jobs=n_jobs)
+
+    # The first trial has no relative search space, and the remaining 20 trials are served by
+    # five batches unless the search space changes in between.
+    assert sampler.n_calls == 5
+    assert len({t.params["x"] for t in study.trials}) == 21
+
+
+def test_sample_relative_not_implemented() -> None:
+    class NoSampler(optunahub.samplers.SimpleBaseSampler):
+        pass
+
+    class BatchOnlySampler(optunahub.samplers.SimpleBaseSampler):
+        def sample_relative_batch(
+            self,
+            study: Study,
+            trials: list[FrozenTrial],
+            search_space: dict[str, BaseDistribution],
+            n: int,
+        ) -> list[dict[str, Any]]:
+            return [{} for _ in range(n)]
+
+    # `sample_relative` is abstract even if `sample_relative_batch` is implemented.
+    assert inspect.isabstract(NoSampler)
+    assert inspect.isabstract(BatchOnlySampler)
+    assert not inspect.isabstract(BatchSampler)
+    with pytest.raises(TypeError):
+        NoSampler()  # type: ignore[abstract]
+    with pytest.raises(TypeError):
+        BatchOnlySampler()  # type: ignore[abstract]
+
+
+def test_invalid_batch_size() -> None:
+    with pytest.raises(ValueError):
+        BatchUniformSampler(batch_size=0)
+
+
+class SpeculativeSampler(BatchSampler):
+    def __init__(self) -> None:
+        super().__init__(speculative=True)
+        self.calls: list[tuple[bool, int]] = []
+
+    def sample_relative_batch(
+        self,
+        study: Study,
+        trials: list[FrozenTrial],
+        search_space: dict[str, BaseDistribution],
+        n: int,
+    ) -> list[dict[str, Any]]:
+        is_main_thread = threading.current_thread() is threading.main_thread()
+        self.calls.append((is_main_thread, len(trials)))
+        assert all(t.state == optuna.trial.TrialState.COMPLETE for t in trials)
+        assert [t.number for t in trials] == list(range(len(trials)))
+        params = {}
+        for name, distribution in search_space.items():
+            assert isinstance(distribution, optuna.distributions.FloatDistribution)
+            params[name] = distribution.low
+        return [params for _ in range(n)]
+
+
+def test_speculative_sample_relative_batch() -> None:
+    sampler = SpeculativeSampler()
+    study = optuna.create_study(sampler=sampler)
+    study.optimize(objective, n_trials=10)
+
+    # The second trial is sampled in the main thread, and each following trial uses the
+    # proposal computed in the background right after the previous trial was told.
+    assert sampler.calls[:9] == [(True, 1)] + [(False, n) for n in range(2, 10)]
+    assert all(t.params == {"x": -1.0, "y": -1.0} for t in study.trials[1:])
+
+    # The speculation is discarded if another trial has completed in the meantime.
+    study.add_trial(
+        optuna.create_trial(
+            params={"x": 0.0, "y": 0.0},
+            distributions=study.trials[0].distributions,
+            value=0.0,
+        )
+    )
+    sampler.calls.clear()
+    study.optimize(objective, n_trials=1)
+    assert sampler.calls[0] == (True, 11)
+
+
+def test_speculative_without_sample_relative_batch() -> None:
+    class SpeculativeUniformSampler(UniformSampler):
+        def __init__(self) -> None:
+            optunahub.samplers.SimpleBaseSampler.__init__(self, speculative=True)
+
+    with pytest.raises(ValueError):
+        SpeculativeUniformSampler()
+
+
+class BatchSizeSampler(BatchSampler):
+    # Propose the number of the proposals requested at once to observe the batching.
+    def sample_relative_batch(
+        self,
+        study: Study,
+        trials: list[FrozenTrial],
+        search_space: dict[str, BaseDistribution],
+        n: int,
+    ) -> list[dict[str, Any]]:
+        time.sleep(0.05)
+        return [{name: n / 10 for name in search_space} for _ in range(n)]
+
+
+def test_sampler_server(tmp_path: pathlib.Path) -> None:
+    storage = f"sqlite:///{tmp_path / 'study.db'}"
+    with optunahub.samplers.SamplerServer(BatchSizeSampler(), storage) as server:
+        sampler = server.client()
+        study = optuna.create_study(storage=storage, sampler=sampler)
+        study.optimize(objective, n_trials=2)
+        study.optimize(objective, n_trials=20, n_jobs=4)
+
+        restored = pickle.loads(pickle.dumps(sampler))
+        assert isinstance(restored, optunahub.samplers.RemoteSampler)
+        other = optuna.create_study(storage=storage, sampler=restored)
+        other.optimize(objective, n_trials=2)
+
+        # The connections of all the threads are closed, and opened again when needed.
+        connections = list(sampler._connections)
+        assert len(connections) > 1
+        sampler.close()
+        assert all(conn.closed for conn in connections)
+        study.optimize(objective, n_trials=1)
+        assert len(sampler._connections) == 1
+        sampler.close()
+
+    # The first trial of each study is sampled independently in the worker.
+    sizes = [round(t.params["x"] * 10) for t in study.trials[1:]]
+    assert all(t.params["x"] == t.params["y"] for t in study.trials[1:])
+    assert sizes[0] == 1
+    assert max(sizes) > 1
+    assert other.trials[1].params == {"x": 0.1, "y": 0.1}
+
+
+def test_sampler_server_reports_errors(tmp_path: pathlib.Path) -> None:
+    storage = f"sqlite:///{tmp_path / 'study.db'}"
+    with optunahub.samplers.SamplerServer(BatchSizeSampler(), storage) as server:
+        # The server cannot read the studies in the other storages.
+        study = optuna.create_study(sampler=server.client())
+        with pytest.raises(KeyError) as excinfo:
+            study.optimize(objective, n_trials=2)
+    # The traceback in the server is attached as the cause.
+    assert "Traceback" in str(excinfo.value.__cause__)
+    assert "get_study_id_from_name" in str(excinfo.value.__cause__)
+
+
+def test_sampler_server_answers_requests_with_shutdown(tmp_path: pathlib.Path) -> None:
+    storage = f"sqlite:///{tmp_path / 'study.db'}"
+    study = optuna.create_study(storage=storage)
+    study.optimize(objective, n_trials=2)
+    search_space = study.trials[0].distributions
+    server = optunahub.samplers.SamplerServer(BatchSizeSampler(), storage)
+    server.start()
+    busy, pending, shutdown = [Client(server.address, authkey=server._authkey) for _ in range(3)]
+    try:
+        # The request and the shutdown arrive while the server is fitting the sampler.
+        busy.send(("sample", study.study_name, 1, search_space))
+        time.sleep(0.01)
+        pending.send(("infer", study.study_name, 1))
+        time.sleep(0.01)
+        shutdown.send(("shutdown",))
+        assert busy.recv()[0]
+        assert pending.recv() == (True, search_space)
+    finally:
+        for conn in (busy, pending, shutdown):
+            conn.close()
+        server.shutdown()
+
+
+class UnpicklableError(Exception):
+    def __init__(self) -> None:
+        super().__init__("unpicklable")
+        self.lock = threading.Lock()
+
+
+class UnpicklableErrorSampler(UniformSampler):
+    def sample_relative(
+        self,
+        study: Study,
+        trial: FrozenTrial,
+        search_space: dict[str, BaseDistribution],
+    ) -> dict[str, Any]:
+        if trial.number == 1:
+            raise UnpicklableError
+        return super().sample_relative(study, trial, search_space)
+
+
+def test_sampler_server_reports_unpicklable_errors(tmp_path: pathlib.Path) -> None:
+    storage = f"sqlite:///{tmp_path / 'study.db'}"
+    with optunahub.samplers.SamplerServer(UnpicklableErrorSampler(), storage) as server:
+        study = optuna.create_study(storage=storage, sampler=server.client())
+        study.optimize(objective, n_trials=1)
+        with pytest.raises(RuntimeError, match="unpicklable"):
+            study.optimize(objective, n_trials=1)
+
+        # The server keeps serving after the error.
+        study.optimize(objective, n_trials=1)
+        assert study.trials[-1].state == optuna.trial.TrialState.COMPLETE
+
+
+def test_search_space_encoder() -> None:
+    search_space: dict[str, BaseDistribution] = {
+        "x": optuna.distributions.FloatDistribution(1e-3, 1.0, log=True),
+        "y": optuna.distributions.FloatDistribution(-1.0, 1.0, step=0.5),
+        "z": optuna.distributions.IntDistribution(0, 10, step=2),
+        "c": optuna.distributions.CategoricalDistribution([None, "a", 1.5]),
+    }
+    encoder = optunahub.samplers.SearchSpaceEncoder(search_space)
+    assert encoder.bounds.shape == (6, 2)
+    assert encoder.columns["c"] == slice(3, 6)
+
+    params = {"x": 0.1, "y": 0.5, "z": 4, "c": "a"}
+    x = encoder.encode(params)
+    np.testing.assert_allclose(x, [np.log(0.1), 0.5, 4.0, 0.0, 1.0, 0.0])
+    assert encoder.decode(x) == pytest.approx(params)
+    assert encoder.decode(encoder.encode({**params, "c": None}))["c"] is None
+
+    # Out-of-bounds and off-grid values are mapped to valid parameters.
+    decoded = encoder.decode(np.asarray([1.0, 0.3, 11.0, 0.1, 0.2, 0.9]))
+    assert decoded == {"x": pytest.approx(1.0), "y": 0.5, "z": 10, "c": 1.5}
+    assert isinstance(decoded["z"], int)
+    for name, value in decoded.items():
+        assert search_space[name]._contains(search_space[name].to_internal_repr(value))
+
+    assert len(encoder.decode_batch(np.zeros((3, 6)))) == 3
+
+
+def test_search_space_encoder_encode_trials() -> None:
+    def objective(trial: optuna.Trial) -> tuple[float, float]:
+        x = trial.suggest_float("x", -1, 1)
+        if trial.number % 2 == 0:
+            trial.suggest_categorical("c", ["a", "b"])
+        return x, -x
+
+    study = optuna.create_study(directions=["minimize", "maximize"])
+    study.optimize(objective, n_trials=10)
+    search_space: dict[str, BaseDistribution] = {
+        "x": optuna.distributions.FloatDistribution(-1, 1),
+        "c": optuna.distributions.CategoricalDistribution(["a", "b"]),
+    }
+    encoder = optunahub.samplers.SearchSpaceEncoder(search_space)
+
+    X, Y = encoder.encode_trials(study.trials, study.directions)
+    assert X.shape == (10, 3)
+    assert X.flags.c_contiguous
+    np.testing.assert_allclose(X[:, 0], [t.params["x"] for t in study.trials])
+    assert np.isnan(X[1::2, 1:]).all()
+    np.testing.assert_allclose(X[::2, 1:].sum(axis=1), 1.0)
+    np.testing.assert_allclose(Y[:, 0], Y[:, 1])
+
+    # The buffers are reused as long as they are large enough.
+    X2, _ = encoder.encode_trials(study.trials[:5], study.directions)
+    assert np.shares_memory(X, X2)
+
+
+def test_trial_history() -> None:
+    sampler = UniformSampler()
+    study = optuna.create_study(sampler=sampler)
+    study.optimize(objective, n_trials=5)
+    study.optimize(lambda t: 1 / 0, n_trials=1, catch=(ZeroDivisionError,))
+
+    history = sampler.get_trial_history(study)
+    assert len(history) == 5
+    assert [t.number for t in history.trials] == [0, 1, 2, 3, 4]
+    np.testing.assert_allclose(history.values[:, 0], [t.values[0] for t in study.trials[:5]])
+
+    search_space: dict[str, BaseDistribution] = {
+        "x": optuna.distributions.FloatDistribution(-1, 1)
+    }
+    params = history.params(search_space)
+    np.testing.assert_allclose(params[:, 0], [t.params["x"] for t in history.trials])
+
+    study.optimize(objective, n_trials=30)
+    history = sampler.get_trial_history(study)
+    assert len(history) == 35
+    assert history.params(search_space).shape == (35, 1)
+    np.testing.assert_allclose(
+        history.params(search_space)[:, 0], [t.params["x"] for t in history.trials]
+    )
+    np.testing.assert_allclose(history.values[:, 0], [t.values[0] for t in history.trials])
+
+    search_space["y"] = optuna.distributions.FloatDistribution(-1, 1)
+    np.testing.assert_allclose(
+        history.params(search_space)[:, 1], [t.params["y"] for t in history.trials]
+    )
+
+    # The snapshot is consistent while other threads update the history.
+    threads = [
+        threading.Thread(target=study.optimize, args=(objective,), kwargs={"n_trials": 50})
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    while any(thread.is_alive() for thread in threads):
+        trials, values, encoded = sampler.get_trial_history(study).snapshot(search_space)
+        assert encoded is not None
+        assert len(trials) == len(values) == len(encoded)
+    for thread in threads:
+        thread.join()
+    trials = sampler.get_trial_history(study).trials
+    study.optimize(objective, n_trials=1)
+    history.update(study)
+    assert len(trials) == len(history) - 1
+
+
+class RngUniformSampler(optunahub.samplers.SimpleBaseSampler):
+    def sample_relative(
+        self,
+        study: Study,
+        trial: FrozenTrial,
+        search_space: dict[str, BaseDistribution],
+    ) -> dict[str, Any]:
+        rng = self.get_trial_rng(trial)
+        params = {}
+        for n, d in search_space.items():
+            assert isinstance(d, optuna.distributions.FloatDistribution)
+            params[n] = rng.uniform(d.low, d.high)
+        return params
+
+
+def test_trial_rng_reproducible_in_parallel() -> None:
+    def dynamic_objective(trial: optuna.Trial) -> float:
+        x = trial.suggest_float("x", -1, 1)
+        y = trial.suggest_float(f"y{trial.number % 2}", -1, 1)
+        return x + y
+
+    def run(n_jobs: int, seed: int) -> dict[int, dict[str, Any]]:
+        # "x" is sampled by `sample_relative` and "y0" and "y1" by `sample_independent`.
+        search_space: dict[str, BaseDistribution] = {
+            "x": optuna.distributions.FloatDistribution(-1, 1)
+        }
+        study = optuna.create_study(sampler=RngUniformSampler(search_space, seed=seed))
+        study.optimize(dynamic_objective, n_trials=20, n_jobs=n_jobs)
+        return {t.number: t.params for t in study.trials}
+
+    single = run(1, 0)
+    assert run(4, 0) == single
+    assert run(1, 0) == single
+    assert run(1, 1) != single
+
+
+def test_trial_rng_streams() -> None:
+    sampler = RngUniformSampler(seed=0)
+    trial = optuna.create_study().ask()
+    frozen = trial.study._storage.get_trial(trial._trial_id)
+    assert sampler.get_trial_rng(frozen).random() == sampler.get_trial_rng(frozen).random()
+    assert sampler.get_trial_rng(frozen, "a").random() != sampler.get_trial_rng(frozen).random()
+    dist = optuna.distributions.IntDistribution(0, 100)
+    value = sampler.sample_independent(trial.study, frozen, "i", dist)
+    sampler.reseed_rng()
+    assert (
+        sampler.get_trial_rng(frozen).random()
+        == RngUniformSampler(seed=0).get_trial_rng(frozen).random()
+    )
+    assert sampler.sample_independent(trial.study, frozen, "i", dist) == value
+    assert dist._contains(dist.to_internal_repr(value))
+
+
+def test_deprecated_random_sampler() -> None:
+    sampler = RngUniformSampler(seed=0)
+    with pytest.warns(FutureWarning):
+        random_sampler = sampler._random_sampler
+    assert isinstance(random_sampler, optuna.samplers.RandomSampler)
+    sampler.reseed_rng()
+
+
+def test_simple_base_sampler_pickle() -> None:
+    sampler = RngUniformSampler(seed=0)
+    study = optuna.create_study(sampler=sampler)
+    study.optimize(objective, n_trials=5)
+
+    restored = pickle.loads(pickle.dumps(sampler))
+    assert isinstance(restored, RngUniformSampler)
+    study = optuna.create_study(sampler=restored)
+    study.optimize(objective, n_trials=5)
+    assert len(restored.get_trial_history(study)) == 5
+
+
+def test_simple_base_sampler_thread_safety() -> None:
+    n_threads = 8
+    n_trials = 200
+    search_space: dict[str, BaseDistribution] = {
+        "x": optuna.distributions.FloatDistribution(-1, 1),
+        "y": optuna.distributions.FloatDistribution(-1, 1),
+    }
+
+    class CheckedSampler(UniformSampler):
+        def __init__(self) -> None:
+            super().__init__()
+            self.n_calls = 0
+            self.errors: list[BaseException] = []
+
+        def infer_relative_search_space(
+            self, study: Study, trial: FrozenTrial
+        ) -> dict[str, BaseDistribution]:
+            states = (optuna.trial.TrialState.COMPLETE,)
+            has_completed = len(study.get_trials(deepcopy=False, states=states)) > 0
+            inferred = super().infer_relative_search_space(study, trial)
+            self.n_calls += 1
+            # The inferred search space must reflect all the trials completed before the call.
+            if inferred != search_space and (has_completed or inferred != {}):
+                self.errors.append(AssertionError(inferred))
+            return inferred
+
+    # The worker threads infer the search space while the other workers complete trials.
+    sampler = CheckedSampler()
+    study = optuna.create_study(sampler=sampler)
+    study.optimize(objective, n_trials=n_trials, n_jobs=n_threads)
+    assert sampler.errors == []
+    assert sampler.n_calls == n_trials
+    assert sampler.infer_relative_search_space(study, study.trials[-1]) == search_space
+    assert len(sampler.get_trial_history(study)) == n_trials
+
+
+def test_incremental_intersection_search_space_shares_updates(monkeypatch: MonkeyPatch) -> None:
+    study = optuna.create_study()
+    study.optimize(objective, n_trials=3)
+    search_space = _IncrementalIntersectionSearchSpace()
+
+    n_reads = 0
+    is_reading = threading.Event()
+    can_read = threading.Event()
+    get_all_trials = study._storage.get_all_trials
+
+    def blocking_get_all_trials(*args: Any, **kwargs: Any) -> list[FrozenTrial]:
+        nonlocal n_reads
+        trials = get_all_trials(*args, **kwargs)
+        if threading.current_thread() is not threading.main_thread():
+            # The reads by the search space are blocked until the main thread allows them.
+            n_reads += 1
+            is_reading.set()
+            can_read.wait()
+        return trials
+
+    monkeypatch.setattr(study._storage, "get_all_trials", blocking_get_all_trials)
+    results: list[dict[str, BaseDistribution]] = []
+    threads = [threading.Thread(target=lambda: results.append(search_space.calculate(study)))]
+    threads[0].start()
+    is_reading.wait()
+
+    # The calls made during the first update wait for it, and then share one more update, which
+    # reads the trials completed before them.
+    study.optimize(lambda t: t.suggest_float("x", -1, 1), n_trials=1)
+    threads += [
+        threading.Thread(target=lambda: results.append(search_space.calculate(study)))
+        for _ in range(3)
+    ]
+    for thread in threads[1:]:
+        thread.start()
+    while len(search_space._update_condition._waiters) < 3:  # type: ignore[attr-defined]
+        time.sleep(0.001)
+    can_read.set()
+    for thread in threads:
+        thread.join()
+
+    assert n_reads == 2
+    assert results[0] == dict(sorted(study.trials[0].distributions.items()))
+    assert results[1:] == [{"x": optuna.distributions.FloatDistribution(-1, 1)}] * 3